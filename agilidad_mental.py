@@ -1,12 +1,34 @@
 import customtkinter as ctk
-from tkinter import messagebox
-from datetime import datetime, timedelta
-import random
+from tkinter import Frame, Label, messagebox
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import json
 import os
 import sys
 import tempfile
 import subprocess
 import platform
+import time
+
+from cronometro import Cronometro, PantallaCronometro, formato_mm_ss
+from dominio import IndiceDominio, semilla_dominio
+from ejercicios import (
+    OPERACION_ADAPTATIVA,
+    OPERACION_MIXTA,
+    OPERACION_REPASO,
+    ConfigEjercicios,
+    obtener_pool,
+    obtener_tabla_maxima,
+    obtener_tabla_minima,
+    plan_completo,
+)
+from motor_sesion import OPERACIONES_POR_NIVEL, MarcadorEnVivo, SesionAgilidad
+from lista_virtual import ListaVirtual
+from persistencia import EscritorDiferido, archivo_sesion_terminada, directorio_datos
+from rejilla_ejercicios import RejillaEjercicios
+from render_progresivo import RenderProgresivo
+from repaso import ColaRepaso
+from tiempos_respuesta import FOCO, TECLA, BufferEventos
 
 try:
     from PIL import Image, ImageTk, ImageDraw, ImageFont
@@ -40,7 +62,7 @@ def resource_path(relative_path):
 
 
 # ==================== CONFIGURACIÓN Y CONSTANTES ====================
-class Config:
+class Config(ConfigEjercicios):
     """Configuración y constantes del programa - Diseño para niños"""
 
     # Dimensiones
@@ -73,6 +95,9 @@ class Config:
     COLOR_DIVISION = "#FFB6C1"  # Rosa suave (Light Pink)
     COLOR_POTENCIA = "#B0C4DE"  # Azul grisáceo suave (Light Steel Blue)
     COLOR_RAIZ = "#FF8355"  # Amarillo suave (Khaki)
+    COLOR_MIXTO = "#FFB74D"  # Naranja suave (examen mixto)
+    COLOR_ADAPTATIVO = "#4DB6AC"  # Verde azulado (práctica adaptativa)
+    COLOR_REPASO = "#7986CB"  # Índigo suave (repaso espaciado)
 
     COLOR_SUCCESS = "#4CAF50"
     COLOR_DANGER = "#F44336"
@@ -85,43 +110,46 @@ class Config:
     FONT_BUTTON = ("Comic Sans MS", 20, "bold")
     FONT_SMALL = ("Comic Sans MS", 14)
 
-    # Tiempos por nivel
-    NIVEL_1_TIEMPO_PRINCIPAL = 12 * 60
-    NIVEL_1_TIEMPO_MAXIMO = 15 * 60
-    NIVEL_2_TIEMPO_PRINCIPAL = 10 * 60
-    NIVEL_2_TIEMPO_MAXIMO = 12 * 60
-    NIVEL_3_TIEMPO_PRINCIPAL = 10 * 60
-    NIVEL_3_TIEMPO_MAXIMO = 12 * 60
-
-    # Tiempos especiales para potenciación y radicación
-    POTENCIA_RAIZ_TIEMPO_PRINCIPAL = 3 * 60
-    POTENCIA_RAIZ_TIEMPO_MAXIMO = 5 * 60
-
-    # Ejercicios y penalización
-    EJERCICIOS_POR_TABLA = 13
-    MAX_INTENTOS_GENERACION = 1000
-    PENALIZACION_POR_MINUTO = 1  # 1 punto por cada minuto extra
-    PENALIZACION_MAXIMA = 3  # Máximo 3 puntos (3 minutos extra)
-
-    # Operaciones
-    NOMBRES_OPERACIONES = {
-        "suma": "Suma",
-        "resta": "Resta",
-        "multiplicación": "Multiplicación",
-        "división": "División",
-        "potencia": "Potenciación",
-        "raiz": "Radicación"
-    }
-
     EMOJIS_OPERACIONES = {
         "suma": "➕",
         "resta": "➖",
         "multiplicación": "✖️",
         "división": "➗",
         "potencia": "🔼",
-        "raiz": "✔️"
+        "raiz": "✔️",
+        "mixto": "🎲",
+        "adaptativo": "🧠",
+        "repaso": "📚"
+    }
+
+    NOMBRES_EXAMENES_MIXTOS = {
+        "mixto": "Examen Mixto",
+        "adaptativo": "Práctica Adaptativa",
+        "repaso": "Repaso"
     }
 
+    # Máximo de ejercicios vencidos por sesión de repaso
+    REPASO_MAXIMO = 50
+
+    # Modo carrera: aciertos en vivo mientras se escribe (para proyectar en clase)
+    MODO_CARRERA = False
+
+    # Segundos entre puntos de control del test en curso (para reanudar tras un corte)
+    INTERVALO_PUNTO_CONTROL = 5
+    # Segundos que se espera al escritor de puntos de control al cerrar la ventana
+    ESPERA_CIERRE_ESCRITOR = 3
+
+    # Pantallas estáticas (inicio, datos, preparación) construidas una vez y reutilizadas
+    CACHE_PANTALLAS = True
+
+    # Ejercicios dibujados en un solo Canvas (más liviano en equipos lentos)
+    RENDER_CANVAS = False
+    # Pantallas pesadas construidas por partes: primero encabezado y acción principal
+    RENDER_PROGRESIVO = True
+    PRESUPUESTO_RENDER_MS = 12  # Máximo por tanda, para que la ventana siga respondiendo
+    # Con AGILIDAD_RMMATH_TIEMPOS=1 se imprime cuánto tarda cada navegación
+    MEDIR_NAVEGACION = bool(os.environ.get("AGILIDAD_RMMATH_TIEMPOS"))
+
     # Cursos
     CURSOS = [
         "Segundo", "Tercero", "Cuarto", "Quinto",
@@ -130,15 +158,46 @@ class Config:
     ]
 
 
+class FilaEjercicio:
+    """Widgets de una fila del panel de ejercicios, reutilizados de tabla en tabla"""
+
+    __slots__ = ("frame", "texto", "potencia", "base", "exponente", "igual", "entry")
+
+    def __init__(self, frame, texto, potencia, base, exponente, igual, entry):
+        self.frame = frame
+        self.texto = texto
+        self.potencia = potencia
+        self.base = base
+        self.exponente = exponente
+        self.igual = igual
+        self.entry = entry
+
+
 # ==================== APLICACIÓN PRINCIPAL ====================
 class AgilidadMentalApp:
   
 
     def __init__(self, root):
         self.root = root
+        self.indices_dominio = {}  # (nombre, curso) -> Future con el IndiceDominio del disco
+        self.colas_repaso = {}  # (nombre, curso) -> Future con la ColaRepaso del disco
+        self._cargador_repaso = None
+        self._ventana_oculta = False  # Minimizada: el cronómetro solo vigila el tiempo máximo
+        self._pantallas = {}  # clave -> (frame, widgets dinámicos) de las pantallas estáticas
+        self.tiempos_navegacion = {}  # clave -> ms de cada visita (con MEDIR_NAVEGACION)
+        self._posicion_entry = {}  # Ruta Tk del entry -> posición de su fila de ejercicio
+        self.escritor = EscritorDiferido()  # Puntos de control sin bloquear la interfaz
+        self.render = RenderProgresivo(root, Config.PRESUPUESTO_RENDER_MS)
+        try:
+            self._archivo_punto_control = os.path.join(directorio_datos("sesiones"), "sesion_en_curso.json")
+        except OSError:
+            self._archivo_punto_control = None  # Sin carpeta de datos: no se guardan puntos de control
         self._configurar_ventana()
+        # Un solo comando Tcl para validar todos los entries de ejercicios
+        self._vcmd_numero = (self.root.register(self.validar_numero), '%P', '%W')
         self._inicializar_variables()
         self.mostrar_pantalla_inicio()
+        self.root.after(300, self._ofrecer_reanudar)
 
     def _configurar_ventana(self):
         """Configura la ventana principal"""
@@ -169,43 +228,77 @@ class AgilidadMentalApp:
         self.root.resizable(True, True)
         self.root.attributes('-topmost', False)
 
+        self.root.bind("<Unmap>", self._al_ocultar_ventana, add="+")
+        self.root.bind("<Map>", self._al_mostrar_ventana, add="+")
+
+    def _al_ocultar_ventana(self, event):
+        """Ventana minimizada: en vez de un tic por segundo, un solo aviso al tiempo máximo"""
+        if event.widget is not self.root:
+            return  # Los hijos de la ventana también reciben <Unmap>
+        self._ventana_oculta = True
+        if self.corriendo:
+            self._programar_tic_cronometro()
+
+    def _al_mostrar_ventana(self, event):
+        """Ventana visible otra vez: se repinta y vuelve el tic por segundo"""
+        if event.widget is not self.root or not self._ventana_oculta:
+            return
+        self._ventana_oculta = False
+        if self.corriendo:
+            self.actualizar_cronometro()
+
     def _inicializar_variables(self):
         """Inicializa variables del programa"""
-        self.nivel = None
-        self.nombre = ""
-        self.curso = ""
-        self.fecha = datetime.now().strftime("%d/%m/%Y")
-        self.tabla_max = 10
-        self.tabla_actual = 1
-        self.limites_tablas = {}
-        self.tiempo_inicio = None
-        self.tiempo_operacion_actual = 0  # Tiempo de la operación actual
-        self.tiempo_principal_operacion = 0  # Tiempo principal por operación (12 o 10 min)
-        self.tiempo_maximo_operacion = 0  # Tiempo máximo por operación (15 o 12 min)
+        self.sesion = SesionAgilidad()
+        self.cronometro = Cronometro()
+        self._tic_cronometro = None  # id del after del próximo refresco
+        self._cronometro_pintado = PantallaCronometro()  # Texto y tiempo extra visibles
         self.corriendo = False
-        self.finalizado = False
         self.test_finalizado_automaticamente = False  # Nuevo: para saber si finalizó por tiempo
-        self.resultados_operacion = {}
-        self.operaciones_nivel = []
-        self.operacion_actual = ""
-        self.ejercicios = []
-        self.historial_ejercicios = []
         self.entries = {}
+        self.rejilla = None  # RejillaEjercicios de la tabla (con RENDER_CANVAS)
         self.boton_finalizar = None
         self.boton_iniciar = None
         self.label_tiempo = None
         self.cronometro_frame = None  # Nuevo: para cambiar el color del cronómetro
         self.en_tiempo_extra = False  # Nuevo: para saber si está en tiempo extra
+        self.eventos_respuesta = BufferEventos()  # Foco y teclas por ejercicio
+        self.marcador = None  # MarcadorEnVivo de la tabla (solo en modo carrera)
+        self.label_marcador = None
+        self._cambios_marcador = {}  # posición -> texto pendiente de corregir
+        self._marcador_programado = False
+        self._respuestas_escritas = {}  # posición -> texto, al día con cada tecla
+        self._ultimo_punto_control = 0.0  # Tiempo del cronómetro en el último punto de control
+        self._sesion_archivada = False  # El test terminado ya se guardó en sesiones/terminadas
+
+    def validar_numero(self, valor, widget=None):
+        """Valida entrada numérica (y anota la tecla para el tiempo de respuesta)"""
+        if valor != "" and valor != "-":
+            try:
+                int(valor)
+            except ValueError:
+                return False
+        posicion = self._posicion_entry.get(widget)
+        if posicion is not None:
+            self.eventos_respuesta.registrar(posicion, TECLA)
+            self._respuestas_escritas[posicion] = valor
+            if self.marcador is not None:
+                # Solo se anota el cambio; se corrige cuando Tk queda libre
+                self._cambios_marcador[posicion] = valor
+                if not self._marcador_programado:
+                    self._marcador_programado = True
+                    self.root.after_idle(self._actualizar_marcador)
+        return True
 
-    def validar_numero(self, valor):
-        """Valida entrada numérica"""
-        if valor == "" or valor == "-":
-            return True
-        try:
-            int(valor)
-            return True
-        except ValueError:
-            return False
+    def _actualizar_marcador(self):
+        """Corrige los entries que cambiaron desde el último refresco y muestra el total"""
+        self._marcador_programado = False
+        cambios, self._cambios_marcador = self._cambios_marcador, {}
+        if self.marcador is None or self.label_marcador is None:
+            return
+        for posicion, texto in cambios.items():
+            self.marcador.actualizar(posicion, texto)
+        self.label_marcador.configure(text=f"{self.marcador.correctas}/{len(self.marcador.ejercicios)}")
 
     def validar_nombre(self, valor):
         """Valida que el nombre no exceda 50 caracteres y no contenga números"""
@@ -241,12 +334,60 @@ class AgilidadMentalApp:
         return output
 
     def limpiar_pantalla(self):
-        """Limpia todos los widgets"""
+        """Quita la pantalla actual: las de la caché se ocultan, las demás se destruyen"""
+        self.render.cancelar()  # Lo que faltaba construir era de la pantalla que se va
+        cacheadas = {str(frame) for frame, _ in self._pantallas.values()}
         for widget in self.root.winfo_children():
-            widget.destroy()
+            if str(widget) in cacheadas:
+                widget.pack_forget()
+            else:
+                widget.destroy()
+
+    def _construir_por_partes(self, pasos):
+        """Construye el resto de la pantalla en tandas (o de una vez sin RENDER_PROGRESIVO)"""
+        if Config.RENDER_PROGRESIVO:
+            self.render.programar(pasos)
+        else:
+            for paso in pasos:
+                paso()
+
+    # ==================== CACHÉ DE PANTALLAS ====================
+    def _mostrar_pantalla(self, clave, construir, actualizar=None, **empaque):
+        """Muestra una pantalla estática construyéndola solo la primera vez
+
+        construir() crea el frame de la pantalla (hijo de root, sin empaquetar)
+        y retorna (frame, widgets); actualizar(widgets) repone en cada visita
+        lo que cambia (nombre, tabla, operación...). empaque: opciones extra
+        de pack del frame (p. ej. padx/pady), las mismas en cada visita.
+        """
+        inicio = time.perf_counter()
+        self.limpiar_pantalla()
+        pantalla = self._pantallas.get(clave)
+        construida = pantalla is None or not pantalla[0].winfo_exists()
+        if construida:
+            pantalla = construir()
+            if Config.CACHE_PANTALLAS:
+                self._pantallas[clave] = pantalla
+        frame, widgets = pantalla
+        if actualizar is not None:
+            actualizar(widgets)
+        frame.pack(fill="both", expand=True, **empaque)
+        frame.tkraise()
+        if Config.MEDIR_NAVEGACION:
+            self._medir_navegacion(clave, inicio, construida)
+        return widgets
+
+    def _medir_navegacion(self, clave, inicio, construida):
+        """Anota los ms de la navegación, incluida la geometría pendiente"""
+        self.root.update_idletasks()
+        ms = (time.perf_counter() - inicio) * 1000
+        self.tiempos_navegacion.setdefault(clave, []).append(ms)
+        print(f"Pantalla {clave}: {ms:.1f} ms ({'construida' if construida else 'desde la caché'})")
 
     def obtener_nombre_operacion(self, operacion):
         """Retorna nombre de operación"""
+        if operacion in Config.NOMBRES_EXAMENES_MIXTOS:
+            return Config.NOMBRES_EXAMENES_MIXTOS[operacion]
         return Config.NOMBRES_OPERACIONES.get(operacion, operacion.upper())
 
     def obtener_emoji_operacion(self, operacion):
@@ -255,7 +396,7 @@ class AgilidadMentalApp:
 
     def obtener_tabla_minima(self, operacion):
         """Retorna tabla mínima por operación"""
-        return 2 if operacion in ["multiplicación", "división", "potencia", "raiz"] else 1
+        return obtener_tabla_minima(operacion)
 
     def obtener_color_nivel(self, nivel):
         """Retorna color por nivel"""
@@ -270,18 +411,22 @@ class AgilidadMentalApp:
             "multiplicación": Config.COLOR_MULTIPLICACION,
             "división": Config.COLOR_DIVISION,
             "potencia": Config.COLOR_POTENCIA,
-            "raiz": Config.COLOR_RAIZ
+            "raiz": Config.COLOR_RAIZ,
+            "mixto": Config.COLOR_MIXTO,
+            "adaptativo": Config.COLOR_ADAPTATIVO,
+            "repaso": Config.COLOR_REPASO
         }
         return colores.get(operacion, Config.COLOR_AZUL_BRILLANTE)
 
     # ==================== PANTALLA DE INICIO ====================
     def mostrar_pantalla_inicio(self):
         """Pantalla inicial super colorida y divertida"""
-        self.limpiar_pantalla()
+        self._mostrar_pantalla("inicio", self._construir_pantalla_inicio)
 
+    def _construir_pantalla_inicio(self):
+        """Construye la pantalla inicial (no tiene partes que cambien)"""
         # Contenedor principal con gradiente
         main_container = ctk.CTkFrame(self.root, fg_color="#E3F2FD", corner_radius=0)
-        main_container.pack(fill="both", expand=True)
 
         # ENCABEZADO GRANDE Y COLORIDO
         header_frame = ctk.CTkFrame(main_container, fg_color="transparent")
@@ -377,6 +522,7 @@ class AgilidadMentalApp:
             text_color=Config.COLOR_CYAN_BRILLANTE
         )
         footer_label.pack()
+        return main_container, {}
 
     def _crear_boton_nivel_grande(self, parent, row, nivel, titulo, descripcion, detalle, color, emoji):
         """Crea un botón de nivel super grande y atractivo"""
@@ -597,10 +743,27 @@ class AgilidadMentalApp:
     # ==================== PANTALLA DE DATOS ====================
     def mostrar_pantalla_datos(self):
         """Formulario de datos super amigable"""
-        self.limpiar_pantalla()
+        # Una pantalla por nivel (cambian los colores); los campos se vacían en cada visita
+        self._mostrar_pantalla(f"datos_{self.sesion.nivel}", self._construir_pantalla_datos,
+                               self._actualizar_pantalla_datos)
+
+    def _actualizar_pantalla_datos(self, widgets):
+        """Apunta a los campos de la pantalla y los deja listos para un estudiante nuevo"""
+        # validar_datos, el calendario y el repaso leen los campos desde self
+        self.entry_nombre = widgets["nombre"]
+        self.combo_curso = widgets["curso"]
+        self.entry_fecha = widgets["fecha"]
+        self.btn_repaso = widgets["repaso"]
+
+        self.entry_nombre.delete(0, "end")
+        self.combo_curso.set("👉 Selecciona tu curso")
+        self.entry_fecha.delete(0, "end")
+        self.entry_fecha.insert(0, datetime.now().strftime("%d/%m/%Y"))
+        self.btn_repaso.configure(text="📚 Repaso")
 
+    def _construir_pantalla_datos(self):
+        """Construye el formulario de datos con los colores del nivel actual"""
         main_frame = ctk.CTkFrame(self.root, fg_color="#E3F2FD")
-        main_frame.pack(fill="both", expand=True)
 
         # Contenedor central sin scroll - tamaño fijo
         center_frame = ctk.CTkFrame(
@@ -608,7 +771,7 @@ class AgilidadMentalApp:
             fg_color="white",
             corner_radius=20,
             border_width=4,
-            border_color=self.obtener_color_nivel(self.nivel)
+            border_color=self.obtener_color_nivel(self.sesion.nivel)
         )
         center_frame.place(relx=0.5, rely=0.5, anchor="center")
 
@@ -616,12 +779,12 @@ class AgilidadMentalApp:
         content_frame.pack(padx=50, pady=35)
 
         # Título con emoji del nivel
-        color_nivel = self.obtener_color_nivel(self.nivel)
+        color_nivel = self.obtener_color_nivel(self.sesion.nivel)
         emojis_nivel = {1: "🟢", 2: "🟠", 3: "🔴"}
 
         titulo_label = ctk.CTkLabel(
             content_frame,
-            text=f"{emojis_nivel.get(self.nivel, '⭐')} NIVEL {self.nivel} {emojis_nivel.get(self.nivel, '⭐')}",
+            text=f"{emojis_nivel.get(self.sesion.nivel, '⭐')} NIVEL {self.sesion.nivel} {emojis_nivel.get(self.sesion.nivel, '⭐')}",
             font=("Comic Sans MS", 28, "bold"),
             text_color=color_nivel
         )
@@ -642,7 +805,8 @@ class AgilidadMentalApp:
             "Escribe tu nombre completo aquí",
             color_nivel
         )
-        self.entry_nombre = nombre_container
+        entry_nombre = nombre_container
+        entry_nombre.bind("<FocusOut>", lambda e: self._precargar_repaso())
 
         # Campo Curso
         curso_label = ctk.CTkLabel(
@@ -654,7 +818,7 @@ class AgilidadMentalApp:
         )
         curso_label.pack(fill="x", pady=(10, 6))
 
-        self.combo_curso = ctk.CTkComboBox(
+        combo_curso = ctk.CTkComboBox(
             content_frame,
             values=Config.CURSOS,
             font=("Comic Sans MS", 15),
@@ -667,10 +831,11 @@ class AgilidadMentalApp:
             dropdown_hover_color="#F0F0F0",
             border_color=color_nivel,
             border_width=2,
-            state="readonly"
+            state="readonly",
+            command=lambda _: self._precargar_repaso()
         )
-        self.combo_curso.set("👉 Selecciona tu curso")
-        self.combo_curso.pack(pady=(0, 10))
+        combo_curso.set("👉 Selecciona tu curso")
+        combo_curso.pack(pady=(0, 10))
 
         # Campo Fecha
         fecha_label = ctk.CTkLabel(
@@ -686,7 +851,7 @@ class AgilidadMentalApp:
         fecha_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
         fecha_frame.pack(pady=(0, 20))
 
-        self.entry_fecha = ctk.CTkEntry(
+        entry_fecha = ctk.CTkEntry(
             fecha_frame,
             font=("Comic Sans MS", 15),
             width=340,
@@ -695,8 +860,7 @@ class AgilidadMentalApp:
             border_color=color_nivel,
             border_width=2
         )
-        self.entry_fecha.insert(0, self.fecha)
-        self.entry_fecha.pack(side="left", padx=(0, 10))
+        entry_fecha.pack(side="left", padx=(0, 10))
 
         # Botón calendario
         btn_calendario = ctk.CTkButton(
@@ -727,6 +891,51 @@ class AgilidadMentalApp:
         )
         btn_comenzar.pack(pady=(5, 0))
 
+        # Examen mixto: ejercicios sorteados de todas las operaciones del nivel
+        btn_mixto = ctk.CTkButton(
+            content_frame,
+            text="🎲 Examen mixto",
+            font=("Comic Sans MS", 15, "bold"),
+            width=200,
+            height=40,
+            corner_radius=20,
+            fg_color=Config.COLOR_MORADO_BRILLANTE,
+            hover_color=self._aclarar_color(Config.COLOR_MORADO_BRILLANTE),
+            text_color="white",
+            command=lambda: self.validar_datos(examen_mixto=True)
+        )
+        btn_mixto.pack(pady=(10, 0))
+
+        # Práctica adaptativa: los hechos que más le cuestan al estudiante
+        btn_adaptativo = ctk.CTkButton(
+            content_frame,
+            text="🧠 Práctica adaptativa",
+            font=("Comic Sans MS", 15, "bold"),
+            width=200,
+            height=40,
+            corner_radius=20,
+            fg_color=Config.COLOR_ADAPTATIVO,
+            hover_color=self._aclarar_color(Config.COLOR_ADAPTATIVO),
+            text_color="white",
+            command=lambda: self.validar_datos(examen_mixto=True, adaptativo=True)
+        )
+        btn_adaptativo.pack(pady=(8, 0))
+
+        # Repaso espaciado: los ejercicios fallados que ya toca repasar
+        btn_repaso = ctk.CTkButton(
+            content_frame,
+            text="📚 Repaso",
+            font=("Comic Sans MS", 15, "bold"),
+            width=200,
+            height=40,
+            corner_radius=20,
+            fg_color=Config.COLOR_REPASO,
+            hover_color=self._aclarar_color(Config.COLOR_REPASO),
+            text_color="white",
+            command=lambda: self.validar_datos(repaso=True)
+        )
+        btn_repaso.pack(pady=(8, 0))
+
         # Botón volver decorativo - Se crea al final para que esté encima
         volver_btn = ctk.CTkButton(
             main_frame,
@@ -741,6 +950,8 @@ class AgilidadMentalApp:
             command=self.mostrar_pantalla_inicio
         )
         volver_btn.place(x=20, y=20)
+        return main_frame, {"nombre": entry_nombre, "curso": combo_curso, "fecha": entry_fecha,
+                            "repaso": btn_repaso}
 
     def _crear_campo_infantil(self, parent, label_text, placeholder, color):
         """Crea un campo de entrada con diseño infantil"""
@@ -774,18 +985,24 @@ class AgilidadMentalApp:
     # ==================== PANTALLA DE PREPARACIÓN ====================
     def mostrar_pantalla_preparacion(self):
         """Pantalla de preparación antes de mostrar ejercicios"""
-        self.limpiar_pantalla()
-
-        color_operacion = self.obtener_color_operacion(self.operacion_actual)
-        nombre_op = self.obtener_nombre_operacion(self.operacion_actual)
-        emoji_op = self.obtener_emoji_operacion(self.operacion_actual)
-
-        # Calcular número real de ejercicios
-        num_ejercicios = self._calcular_num_ejercicios(self.operacion_actual, self.tabla_actual)
+        # Una pantalla por operación (cambian colores y emoji); tabla y cantidad se reponen
+        self._mostrar_pantalla(f"preparacion_{self.sesion.operacion_actual}",
+                               self._construir_pantalla_preparacion,
+                               self._actualizar_pantalla_preparacion)
+
+    def _actualizar_pantalla_preparacion(self, widgets):
+        """Tabla actual y número real de ejercicios (ya generados para esta tabla)"""
+        nombre_op = self.obtener_nombre_operacion(self.sesion.operacion_actual)
+        widgets["tabla"].configure(text=f"{nombre_op} - {self._descripcion_tabla_actual()}")
+        widgets["cantidad"].configure(text=f"📝 {len(self.sesion.ejercicios)} ejercicios")
+
+    def _construir_pantalla_preparacion(self):
+        """Construye la pantalla de preparación con el color y emoji de la operación"""
+        color_operacion = self.obtener_color_operacion(self.sesion.operacion_actual)
+        emoji_op = self.obtener_emoji_operacion(self.sesion.operacion_actual)
 
         # Frame principal
         main_frame = ctk.CTkFrame(self.root, fg_color="#E3F2FD")
-        main_frame.pack(fill="both", expand=True)
 
         # Contenedor central - MÁS COMPACTO
         center_frame = ctk.CTkFrame(
@@ -816,12 +1033,13 @@ class AgilidadMentalApp:
         ).pack(pady=(0, 8))
 
         # Información más compacta
-        ctk.CTkLabel(
+        label_tabla = ctk.CTkLabel(
             content_frame,
-            text=f"{nombre_op} - Tabla del {self.tabla_actual}",
+            text="",
             font=("Comic Sans MS", 22, "bold"),
             text_color="#333333"
-        ).pack(pady=(0, 15))
+        )
+        label_tabla.pack(pady=(0, 15))
 
         # Instrucciones más compactas
         instrucciones_frame = ctk.CTkFrame(
@@ -831,12 +1049,13 @@ class AgilidadMentalApp:
         )
         instrucciones_frame.pack(fill="x", pady=(0, 18), padx=15)
 
-        ctk.CTkLabel(
+        label_cantidad = ctk.CTkLabel(
             instrucciones_frame,
-            text=f"📝 {num_ejercicios} ejercicios",
+            text="",
             font=("Comic Sans MS", 16),
             text_color="#333333"
-        ).pack(pady=6)
+        )
+        label_cantidad.pack(pady=6)
 
         ctk.CTkLabel(
             instrucciones_frame,
@@ -873,40 +1092,23 @@ class AgilidadMentalApp:
             text_color="white",
             command=self.iniciar_ejercicios_directo
         ).pack()
+        return main_frame, {"tabla": label_tabla, "cantidad": label_cantidad}
 
-    def _calcular_num_ejercicios(self, operacion, tabla):
-        """Calcula el número real de ejercicios según la operación y tabla"""
-        if operacion == "resta":
-            # En resta solo se generan ejercicios desde 0 hasta la tabla
-            return tabla + 1  # +1 porque incluye el 0
-        else:
-            # Para las demás operaciones son 13 ejercicios (0 a 12)
-            return 13
+    def _descripcion_tabla_actual(self):
+        """Texto de la tabla actual (o del rango de tablas en el examen mixto)"""
+        if self.sesion.operacion_actual == OPERACION_REPASO:
+            return f"{len(self.sesion.ejercicios)} por repasar"
+        if self.sesion.es_examen_mixto():
+            return f"Hasta la tabla {self.sesion.tabla_max}"
+        return f"Tabla del {self.sesion.tabla_actual}"
 
     def iniciar_ejercicios_directo(self):
         """Muestra ejercicios e inicia cronómetro automáticamente"""
         # Solo reiniciar variables de tiempo si es la primera tabla de la operación
-        tabla_minima = self.obtener_tabla_minima(self.operacion_actual)
-        if self.tabla_actual == tabla_minima:
-            # Primera tabla de esta operación, reiniciar tiempo
-            self.tiempo_operacion_actual = 0
+        if self.sesion.iniciar_tabla():
             self.en_tiempo_extra = False
-        # Si no es la primera tabla, mantener tiempo_operacion_actual sin cambios
 
         self.corriendo = False
-        self.finalizado = False
-
-        # Establecer tiempos según la operación
-        if self.operacion_actual in ["potencia", "raiz"]:
-            # Tiempos especiales para potenciación y radicación
-            self.tiempo_principal_operacion = Config.POTENCIA_RAIZ_TIEMPO_PRINCIPAL
-            self.tiempo_maximo_operacion = Config.POTENCIA_RAIZ_TIEMPO_MAXIMO
-        elif self.nivel == 1:
-            self.tiempo_principal_operacion = Config.NIVEL_1_TIEMPO_PRINCIPAL
-            self.tiempo_maximo_operacion = Config.NIVEL_1_TIEMPO_MAXIMO
-        else:  # Nivel 2 y 3
-            self.tiempo_principal_operacion = Config.NIVEL_2_TIEMPO_PRINCIPAL
-            self.tiempo_maximo_operacion = Config.NIVEL_2_TIEMPO_MAXIMO
 
         self._mostrar_ejercicios_y_cronometro()
         # Iniciar cronómetro automáticamente después de un breve delay
@@ -914,30 +1116,25 @@ class AgilidadMentalApp:
 
     def mostrar_pantalla_ejercicios(self):
         """Método legacy que ahora muestra la pantalla de preparación"""
-        # NO reiniciar corriendo ni finalizado aquí para preservar el cronómetro
-        self.finalizado = False
-
-        if self.tabla_actual > self.tabla_max:
-            idx = self.operaciones_nivel.index(self.operacion_actual) + 1
-            if idx >= len(self.operaciones_nivel):
-                self.mostrar_resultados_finales()
-                return
-            self.operacion_actual = self.operaciones_nivel[idx]
-            self.tabla_actual = self.obtener_tabla_minima(self.operacion_actual)
+        # NO reiniciar corriendo aquí para preservar el cronómetro
+        if not self.sesion.preparar_tabla():
+            self.mostrar_resultados_finales()
+            return
 
-        self.ejercicios = self.generar_ejercicios(self.operacion_actual)
         self.mostrar_pantalla_preparacion()
 
     # ==================== PANTALLA DE EJERCICIOS ====================
     def _mostrar_ejercicios_y_cronometro(self):
         """Pantalla de ejercicios colorida y divertida"""
-        self.limpiar_pantalla()
         self.corriendo = False
-        self.finalizado = False
+        self.sesion.finalizado = False
+        self._mostrar_pantalla("ejercicios", self._construir_pantalla_ejercicios,
+                               self._actualizar_pantalla_ejercicios, padx=15, pady=15)
 
+    def _construir_pantalla_ejercicios(self):
+        """Construye el marco de la pantalla de ejercicios; las filas se crean a medida que hacen falta"""
         # Frame principal
         main_frame = ctk.CTkFrame(self.root, fg_color="#E3F2FD")
-        main_frame.pack(fill="both", expand=True, padx=15, pady=15)
 
         # Distribución optimizada del espacio: panel de ejercicios flexible, panel de controles fijo
         main_frame.grid_columnconfigure(0, weight=1, minsize=650)  # Panel ejercicios se expande
@@ -945,89 +1142,146 @@ class AgilidadMentalApp:
         main_frame.grid_rowconfigure(0, weight=1)
 
         # Panel de ejercicios (izquierda)
-        self._crear_panel_ejercicios_colorido(main_frame)
-
-        # Panel de controles (derecha)
-        self._crear_panel_controles_divertido(main_frame)
-
-    def _crear_panel_ejercicios_colorido(self, parent):
-        """Panel de ejercicios con diseño basado en operación"""
-        # Color principal según operación
-        color_operacion = self.obtener_color_operacion(self.operacion_actual)
-        color_operacion_claro = self._aclarar_color(color_operacion)
-
         ejercicios_frame = ctk.CTkFrame(
-            parent,
+            main_frame,
             fg_color="white",
             corner_radius=25,
-            border_width=5,
-            border_color=color_operacion
+            border_width=5
         )
         ejercicios_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 10))
 
-        # Encabezado con color de la operación
-        nombre_op = self.obtener_nombre_operacion(self.operacion_actual)
-        emoji_op = self.obtener_emoji_operacion(self.operacion_actual)
-
         header = ctk.CTkFrame(
             ejercicios_frame,
-            fg_color=color_operacion,
             corner_radius=20,
             height=80
         )
         header.pack(fill="x", padx=15, pady=15)
 
-        ctk.CTkLabel(
+        titulo = ctk.CTkLabel(
             header,
-            text=f"{emoji_op} {nombre_op} - Tabla del {self.tabla_actual} {emoji_op}",
+            text="",
             font=("Comic Sans MS", 30, "bold"),
             text_color="white"
-        ).pack(pady=15)
-
-        # Scrollable frame para ejercicios
-        scroll_frame = ctk.CTkScrollableFrame(
-            ejercicios_frame,
-            fg_color="transparent"
         )
-        scroll_frame.pack(fill="both", expand=True, padx=15, pady=(0, 15))
+        titulo.pack(pady=15)
+
+        if Config.RENDER_CANVAS:
+            # Un Canvas para todas las filas y unos pocos entries reciclados
+            scroll_frame = None
+            rejilla = RejillaEjercicios(
+                ejercicios_frame, self._vcmd_numero, self._posicion_entry,
+                al_enfocar=self._registrar_foco,
+                al_tab=self._enfocar_siguiente
+            )
+            rejilla.pack(fill="both", expand=True, padx=15, pady=(0, 15))
+        else:
+            # Scrollable frame para ejercicios
+            rejilla = None
+            scroll_frame = ctk.CTkScrollableFrame(
+                ejercicios_frame,
+                fg_color="transparent"
+            )
+            scroll_frame.pack(fill="both", expand=True, padx=15, pady=(0, 15))
 
-        # Crear ejercicios con dos colores alternados de la operación
-        self.entries = {}
+        return main_frame, {"main": main_frame, "panel": ejercicios_frame, "encabezado": header,
+                            "titulo": titulo, "scroll": scroll_frame, "rejilla": rejilla,
+                            "filas": [], "controles": None}
+
+    def _actualizar_pantalla_ejercicios(self, widgets):
+        """Reconfigura las filas para la tabla actual y rehace el panel de controles"""
+        # Panel de ejercicios (izquierda)
+        self._preparar_panel_ejercicios(widgets)
+
+        # Panel de controles (derecha): pocos widgets que dependen de la tabla
+        if widgets["controles"] is not None:
+            widgets["controles"].destroy()
+        widgets["controles"] = self._crear_panel_controles_divertido(widgets["main"])
+
+    def _preparar_panel_ejercicios(self, widgets):
+        """Panel de ejercicios con diseño basado en operación"""
+        # Color principal según operación
+        color_operacion = self.obtener_color_operacion(self.sesion.operacion_actual)
+        color_operacion_claro = self._aclarar_color(color_operacion)
+
+        widgets["panel"].configure(border_color=color_operacion)
+
+        # Encabezado con color de la operación
+        nombre_op = self.obtener_nombre_operacion(self.sesion.operacion_actual)
+        emoji_op = self.obtener_emoji_operacion(self.sesion.operacion_actual)
+        widgets["encabezado"].configure(fg_color=color_operacion)
+        widgets["titulo"].configure(text=f"{emoji_op} {nombre_op} - {self._descripcion_tabla_actual()} {emoji_op}")
+
+        # Ejercicios con dos colores alternados de la operación, en las filas ya creadas
         colores_alternados = [color_operacion, color_operacion_claro]
 
-        for i, ej in enumerate(self.ejercicios):
-            color_ej = colores_alternados[i % 2]
-            self._crear_ejercicio_colorido(scroll_frame, ej, i, color_ej)
+        # Respuestas de muchas cifras (tablas grandes, potencias altas) necesitan más ancho
+        cifras = max((len(str(ej.respuesta)) for ej in self.sesion.ejercicios), default=0)
+        ancho_entry = max(150, 20 * cifras + 30)
 
-    def _crear_ejercicio_colorido(self, parent, ejercicio, index, color):
-        """Crea un ejercicio individual colorido"""
-        # Frame del ejercicio
+        self.entries = {}
+        self.rejilla = widgets["rejilla"]
+        if self.rejilla is not None:
+            self.rejilla.mostrar(self.sesion.ejercicios, colores_alternados, ancho_entry)
+        else:
+            # Se ocultan todas: cada una vuelve a empacarse, en orden, con su ejercicio nuevo
+            for fila in widgets["filas"]:
+                fila.frame.pack_forget()
+            widgets["scroll"]._parent_canvas.yview_moveto(0)
+
+        self.marcador = MarcadorEnVivo(self.sesion.ejercicios) if Config.MODO_CARRERA else None
+        self._reiniciar_respuestas()
+        if self.rejilla is None:
+            # Las filas aparecen por tandas; el encabezado y los controles ya están a la vista
+            pasos = [lambda i=i, ej=ej: self._mostrar_fila_ejercicio(widgets, i, ej, colores_alternados[i % 2],
+                                                                      ancho_entry)
+                     for i, ej in enumerate(self.sesion.ejercicios)]
+            # Vaciar los entries también pasa por validatecommand: se reinicia al terminar
+            pasos.append(self._reiniciar_respuestas)
+            self._construir_por_partes(pasos)
+
+    def _reiniciar_respuestas(self):
+        """Olvida lo escrito y los eventos de foco y tecla de la tabla"""
+        self.eventos_respuesta.reiniciar()
+        self._respuestas_escritas = {}
+        self._cambios_marcador = {}
+
+    def _mostrar_fila_ejercicio(self, widgets, index, ejercicio, color, ancho_entry):
+        """Configura (y si falta, crea) la fila `index` con su ejercicio"""
+        filas = widgets["filas"]
+        if index == len(filas):
+            filas.append(self._crear_fila_ejercicio(widgets["scroll"], index))
+        self._configurar_fila_ejercicio(filas[index], ejercicio, color, ancho_entry)
+        self.entries[index] = filas[index].entry
+
+    def _crear_fila_ejercicio(self, parent, index):
+        """Crea la fila `index` del panel (una sola vez; luego se reconfigura en cada tabla)"""
         ej_frame = ctk.CTkFrame(
             parent,
-            fg_color=color,
             corner_radius=15,
             height=65
         )
-        ej_frame.pack(fill="x", pady=6, padx=5)
 
         content_frame = ctk.CTkFrame(ej_frame, fg_color="transparent")
         content_frame.place(relx=0.5, rely=0.5, anchor="center")
 
-        # Ejercicio
-        if "^" in ejercicio["texto"]:
-            self._crear_ejercicio_potencia_colorido(content_frame, ejercicio)
-        else:
-            ctk.CTkLabel(
-                content_frame,
-                text=ejercicio["texto"],
-                font=("Comic Sans MS", 24, "bold"),
-                text_color="black",
-                width=250,
-                anchor="e"
-            ).pack(side="left", padx=(0, 20))
-
-        # Entry con diseño grande
-        vcmd = (self.root.register(self.validar_numero), '%P')
+        # Ejercicio: texto normal, o base y exponente para potencia
+        texto = ctk.CTkLabel(
+            content_frame,
+            text="",
+            font=("Comic Sans MS", 24, "bold"),
+            text_color="black",
+            width=250,
+            anchor="e"
+        )
+        potencia = Frame(content_frame)
+        base = Label(potencia, font=("Comic Sans MS", 24, "bold"), fg="black")
+        base.pack(side="left")
+        exponente = Label(potencia, font=("Comic Sans MS", 14, "bold"), fg="black")
+        exponente.pack(side="left", anchor="n")
+        igual = Label(potencia, text=" =", font=("Comic Sans MS", 24, "bold"), fg="black")
+        igual.pack(side="left")
+
+        # Entry con diseño grande; todas las filas comparten el mismo validatecommand
         entry = ctk.CTkEntry(
             content_frame,
             font=("Comic Sans MS", 24, "bold"),
@@ -1038,48 +1292,43 @@ class AgilidadMentalApp:
             state="disabled",
             border_color="white",
             border_width=3,
-            fg_color=color,
             text_color="black",
             validate="key",
-            validatecommand=vcmd
+            validatecommand=self._vcmd_numero
         )
         entry.pack(side="left")
-        self.entries[ejercicio["id"]] = entry
-
-    def _crear_ejercicio_potencia_colorido(self, parent, ejercicio):
-        """Crea ejercicio de potencia con diseño especial"""
-        from tkinter import Label, Frame
-
-        bg_color = parent.cget("fg_color")
-        if isinstance(bg_color, tuple):
-            bg_color = bg_color[1]
-
-        # Si bg_color es "transparent" o None, usar el color del padre
-        if bg_color in ("transparent", None, ""):
-            # Obtener el color del frame padre (ej_frame)
-            parent_of_parent = parent.master
-            bg_color = parent_of_parent.cget("fg_color")
-            if isinstance(bg_color, tuple):
-                bg_color = bg_color[1]
-
-        op_frame = Frame(parent, bg=bg_color)
-        op_frame.pack(side="left", padx=(0, 20))
-
-        parts = ejercicio["texto"].split("^")
-        base = parts[0].strip()
-        exp_part = parts[1].replace("=", "").strip()
-
-        Label(op_frame, text=base, font=("Comic Sans MS", 24, "bold"),
-              bg=bg_color, fg="black").pack(side="left")
-        Label(op_frame, text=exp_part, font=("Comic Sans MS", 14, "bold"),
-              bg=bg_color, fg="black").pack(side="left", anchor="n")
-        Label(op_frame, text=" =", font=("Comic Sans MS", 24, "bold"),
-              bg=bg_color, fg="black").pack(side="left")
+        # %W del validatecommand es el entry interno de Tk
+        self._posicion_entry[str(entry._entry)] = index
+        entry.bind("<FocusIn>", lambda e, i=index: self.eventos_respuesta.registrar(i, FOCO))
+        entry.bind("<Tab>", lambda e, i=index: self._enfocar_siguiente(i))
+        return FilaEjercicio(ej_frame, texto, potencia, base, exponente, igual, entry)
+
+    def _configurar_fila_ejercicio(self, fila, ejercicio, color, ancho_entry):
+        """Pone en la fila el ejercicio, sus colores y un entry vacío y deshabilitado"""
+        fila.frame.configure(fg_color=color)
+
+        if ejercicio.operacion == "potencia":
+            # Potencia con el exponente pequeño y arriba
+            fila.texto.pack_forget()
+            for widget in (fila.potencia, fila.base, fila.exponente, fila.igual):
+                widget.configure(bg=color)
+            fila.base.configure(text=str(ejercicio.num))
+            fila.exponente.configure(text=str(ejercicio.tabla))
+            fila.potencia.pack(side="left", padx=(0, 20), before=fila.entry)
+        else:
+            fila.potencia.pack_forget()
+            fila.texto.configure(text=ejercicio.texto)
+            fila.texto.pack(side="left", padx=(0, 20), before=fila.entry)
+
+        fila.entry.configure(state="normal")
+        fila.entry.delete(0, "end")
+        fila.entry.configure(state="disabled", width=ancho_entry, fg_color=color)
+        fila.frame.pack(fill="x", pady=6, padx=5)
 
     def _crear_panel_controles_divertido(self, parent):
         """Panel de controles con diseño basado en operación"""
         # Colores según operación
-        color_operacion = self.obtener_color_operacion(self.operacion_actual)
+        color_operacion = self.obtener_color_operacion(self.sesion.operacion_actual)
         color_operacion_oscuro = self._oscurecer_color(color_operacion)
 
         controles_frame = ctk.CTkFrame(parent, fg_color="transparent", width=280)
@@ -1104,16 +1353,39 @@ class AgilidadMentalApp:
         )
         self.label_tiempo_titulo.pack(pady=(12, 5))
 
-        mins = int(self.tiempo_operacion_actual // 60)
-        secs = int(self.tiempo_operacion_actual % 60)
+        texto_tiempo = formato_mm_ss(self.sesion.tiempo_operacion_actual)
 
         self.label_tiempo = ctk.CTkLabel(
             self.cronometro_frame,
-            text=f"{mins:02d}:{secs:02d}",
+            text=texto_tiempo,
             font=("Comic Sans MS", 48, "bold"),
             text_color="white"
         )
         self.label_tiempo.pack(pady=(0, 12))
+        self._cronometro_pintado = PantallaCronometro(texto_tiempo)
+
+        # Marcador de aciertos en vivo (modo carrera)
+        self.label_marcador = None
+        if self.marcador is not None:
+            marcador_frame = ctk.CTkFrame(
+                controles_frame,
+                fg_color=Config.COLOR_VERDE_BRILLANTE,
+                corner_radius=15
+            )
+            marcador_frame.pack(fill="x", pady=(0, 15))
+            ctk.CTkLabel(
+                marcador_frame,
+                text="🏁 ACIERTOS",
+                font=("Comic Sans MS", 16, "bold"),
+                text_color="white"
+            ).pack(pady=(10, 0))
+            self.label_marcador = ctk.CTkLabel(
+                marcador_frame,
+                text=f"{self.marcador.correctas}/{len(self.marcador.ejercicios)}",
+                font=("Comic Sans MS", 36, "bold"),
+                text_color="white"
+            )
+            self.label_marcador.pack(pady=(0, 10))
 
         # Info estudiante con color de la operación (aclarado)
         color_operacion_claro = self._aclarar_color(color_operacion)
@@ -1131,10 +1403,10 @@ class AgilidadMentalApp:
         ).pack(pady=(10, 5))
 
         # Nombre con ajuste automático de tamaño si es muy largo
-        nombre_font_size = 16 if len(self.nombre) > 25 else 18
+        nombre_font_size = 16 if len(self.sesion.nombre) > 25 else 18
         ctk.CTkLabel(
             info_frame,
-            text=self.nombre,
+            text=self.sesion.nombre,
             font=("Comic Sans MS", nombre_font_size, "bold"),
             text_color="white",
             wraplength=250  # Ajustar texto si es muy largo
@@ -1142,7 +1414,7 @@ class AgilidadMentalApp:
 
         ctk.CTkLabel(
             info_frame,
-            text=self.curso,
+            text=self.sesion.curso,
             font=("Comic Sans MS", 14),
             text_color="white"
         ).pack(pady=(0, 10))
@@ -1177,7 +1449,7 @@ class AgilidadMentalApp:
         ).pack(pady=(0, 12))
 
         if self._debe_mostrar_boton_siguiente():
-            texto = "➡️ SIGUIENTE" if self.tabla_actual < self.tabla_max else "➡️ SIG. OPERACIÓN"
+            texto = "➡️ SIGUIENTE" if self.sesion.tabla_actual < self.sesion.tabla_max else "➡️ SIG. OPERACIÓN"
             ctk.CTkButton(
                 controles_frame,
                 text=texto,
@@ -1193,24 +1465,21 @@ class AgilidadMentalApp:
 
         # Guardamos la referencia del botón iniciar como None ya que no existe
         self.boton_iniciar = None
+        return controles_frame
 
     def _debe_mostrar_boton_siguiente(self):
         """Verifica si mostrar botón siguiente"""
-        idx_actual = self.operaciones_nivel.index(self.operacion_actual)
-        es_ultima_operacion = (idx_actual == len(self.operaciones_nivel) - 1)
-        es_ultima_tabla = (self.tabla_actual == self.tabla_max)
-        return not (es_ultima_tabla and es_ultima_operacion)
+        return self.sesion.debe_mostrar_boton_siguiente()
 
     # ==================== SELECTOR DE TABLAS ====================
     def solicitar_limite_tabla_operacion(self):
         """Selector de tabla con diseño tipo juego"""
-        if not self.operacion_actual:
-            self.operacion_actual = self.operaciones_nivel[0]
+        self.sesion.operacion_pendiente()
 
-        nombre_op = self.obtener_nombre_operacion(self.operacion_actual)
-        emoji_op = self.obtener_emoji_operacion(self.operacion_actual)
-        tabla_minima = self.obtener_tabla_minima(self.operacion_actual)
-        color_operacion = self.obtener_color_operacion(self.operacion_actual)
+        nombre_op = self.obtener_nombre_operacion(self.sesion.operacion_actual)
+        emoji_op = self.obtener_emoji_operacion(self.sesion.operacion_actual)
+        tabla_minima = self.obtener_tabla_minima(self.sesion.operacion_actual)
+        color_operacion = self.obtener_color_operacion(self.sesion.operacion_actual)
 
         # Dialog moderno con tamaño fijo
         dialog = ctk.CTkToplevel(self.root)
@@ -1254,9 +1523,12 @@ class AgilidadMentalApp:
         ).pack()
 
         # Pregunta más compacta
+        # Limitar tablas según operación y nivel (rango extendido en cursos superiores)
+        tabla_maxima = obtener_tabla_maxima(self.sesion.operacion_actual, self.sesion.nivel)
+
         pregunta_text = "¿Hasta qué tabla quieres practicar? 🎯"
-        if self.operacion_actual in ["potencia", "raiz"]:
-            pregunta_text += "\n(Tablas disponibles: 2 y 3)"
+        if self.sesion.operacion_actual in ["potencia", "raiz"]:
+            pregunta_text += f"\n(Tablas disponibles: 2 a {tabla_maxima})"
         elif tabla_minima == 2:
             pregunta_text += "\n(Comienza desde la tabla 2)"
 
@@ -1289,12 +1561,6 @@ class AgilidadMentalApp:
         def actualizar_valor(value):
             valor_label.configure(text=f"TABLA {int(value)}")
 
-        # Limitar tablas para potenciación y radicación
-        if self.operacion_actual in ["potencia", "raiz"]:
-            tabla_maxima = 3
-        else:
-            tabla_maxima = 12
-
         slider = ctk.CTkSlider(
             main_frame,
             from_=tabla_minima,
@@ -1364,9 +1630,190 @@ class AgilidadMentalApp:
         self.root.wait_window(dialog)
 
         if resultado["confirmado"]:
-            self.limites_tablas[self.operacion_actual] = resultado["valor"]
-            self.tabla_max = resultado["valor"]
-            self.tabla_actual = tabla_minima
+            self.sesion.fijar_limite_tabla(resultado["valor"])
+            self.mostrar_pantalla_ejercicios()
+        else:
+            self.mostrar_pantalla_datos()
+
+    def solicitar_examen_mixto(self, adaptativo=False):
+        """Selector de cantidad de ejercicios y tabla máxima del examen mixto o adaptativo"""
+        operaciones = OPERACIONES_POR_NIVEL[self.sesion.nivel]
+        tabla_maxima = max(obtener_tabla_maxima(op, self.sesion.nivel) for op in operaciones)
+        operacion = OPERACION_ADAPTATIVA if adaptativo else OPERACION_MIXTA
+        nombre_op = self.obtener_nombre_operacion(operacion)
+        emoji_op = self.obtener_emoji_operacion(operacion)
+        color_operacion = self.obtener_color_operacion(operacion)
+
+        dialog = ctk.CTkToplevel(self.root)
+        dialog.title(f"{nombre_op}")
+        try:
+            dialog.iconbitmap(resource_path("logo.ico"))
+        except:
+            pass
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        dialog_width = 450
+        dialog_height = 560
+
+        main_frame = ctk.CTkFrame(
+            dialog,
+            fg_color="white",
+            corner_radius=25,
+            border_width=5,
+            border_color=color_operacion,
+            width=dialog_width,
+            height=dialog_height
+        )
+        main_frame.pack(padx=20, pady=20)
+
+        ctk.CTkLabel(
+            main_frame,
+            text=emoji_op,
+            font=("Segoe UI Emoji", 50)
+        ).pack(pady=(20, 5))
+
+        ctk.CTkLabel(
+            main_frame,
+            text=nombre_op.upper(),
+            font=("Comic Sans MS", 24, "bold"),
+            text_color=color_operacion
+        ).pack()
+
+        ctk.CTkLabel(
+            main_frame,
+            text=("Primero los ejercicios que más te cuestan 💪" if adaptativo
+                  else "Ejercicios de todas las operaciones, sin repetir 🎯"),
+            font=("Comic Sans MS", 14),
+            text_color="#666666",
+            justify="center"
+        ).pack(pady=(10, 10))
+
+        # Valores elegidos
+        valor_frame = ctk.CTkFrame(
+            main_frame,
+            fg_color=color_operacion,
+            corner_radius=20
+        )
+        valor_frame.pack(fill="x", padx=30, pady=10)
+
+        valor_label = ctk.CTkLabel(
+            valor_frame,
+            text="",
+            font=("Comic Sans MS", 24, "bold"),
+            text_color="white",
+            justify="center"
+        )
+        valor_label.pack(pady=15)
+
+        def actualizar_valor(_=None):
+            cantidad = int(slider_cantidad.get())
+            tabla = int(slider_tabla.get())
+            # El pool limita la cantidad: no se repiten ejercicios
+            disponibles = len(obtener_pool(plan_completo(operaciones, tabla, self.sesion.nivel)))
+            valor_label.configure(
+                text=f"{min(cantidad, disponibles)} EJERCICIOS\nHASTA LA TABLA {tabla}"
+            )
+
+        ctk.CTkLabel(
+            main_frame,
+            text="¿Cuántos ejercicios?",
+            font=("Comic Sans MS", 13, "bold"),
+            text_color="#666666"
+        ).pack(pady=(10, 0))
+
+        slider_cantidad = ctk.CTkSlider(
+            main_frame,
+            from_=Config.EXAMEN_MIXTO_MIN,
+            to=Config.EXAMEN_MIXTO_MAX,
+            number_of_steps=(Config.EXAMEN_MIXTO_MAX - Config.EXAMEN_MIXTO_MIN) // 10,
+            width=320,
+            height=25,
+            button_color=color_operacion,
+            button_hover_color=self._oscurecer_color(color_operacion),
+            progress_color=color_operacion,
+            command=actualizar_valor
+        )
+        slider_cantidad.set(Config.EXAMEN_MIXTO_POR_DEFECTO)
+        slider_cantidad.pack(pady=(5, 10), padx=30)
+
+        ctk.CTkLabel(
+            main_frame,
+            text="¿Hasta qué tabla?",
+            font=("Comic Sans MS", 13, "bold"),
+            text_color="#666666"
+        ).pack(pady=(5, 0))
+
+        slider_tabla = ctk.CTkSlider(
+            main_frame,
+            from_=2,
+            to=tabla_maxima,
+            number_of_steps=tabla_maxima - 2,
+            width=320,
+            height=25,
+            button_color=color_operacion,
+            button_hover_color=self._oscurecer_color(color_operacion),
+            progress_color=color_operacion,
+            command=actualizar_valor
+        )
+        slider_tabla.set(min(Config.TABLA_MAXIMA, tabla_maxima))
+        slider_tabla.pack(pady=(5, 15), padx=30)
+        actualizar_valor()
+
+        resultado = {"confirmado": False}
+
+        def confirmar():
+            resultado["confirmado"] = True
+            resultado["cantidad"] = int(slider_cantidad.get())
+            resultado["tabla"] = int(slider_tabla.get())
+            dialog.destroy()
+
+        def cancelar():
+            resultado["confirmado"] = False
+            dialog.destroy()
+
+        buttons_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        buttons_frame.pack(pady=(10, 20))
+
+        ctk.CTkButton(
+            buttons_frame,
+            text="✅ ¡LISTO!",
+            font=("Comic Sans MS", 16, "bold"),
+            width=140,
+            height=50,
+            corner_radius=15,
+            fg_color=Config.COLOR_VERDE_BRILLANTE,
+            hover_color=self._aclarar_color(Config.COLOR_VERDE_BRILLANTE),
+            text_color="white",
+            command=confirmar
+        ).pack(side="left", padx=10)
+
+        ctk.CTkButton(
+            buttons_frame,
+            text="❌ CANCELAR",
+            font=("Comic Sans MS", 16, "bold"),
+            width=140,
+            height=50,
+            corner_radius=15,
+            fg_color=Config.COLOR_ROJO_BRILLANTE,
+            hover_color=self._aclarar_color(Config.COLOR_ROJO_BRILLANTE),
+            text_color="white",
+            command=cancelar
+        ).pack(side="left", padx=10)
+
+        dialog.bind('<Return>', lambda e: confirmar())
+        dialog.bind('<Escape>', lambda e: cancelar())
+
+        dialog.update_idletasks()
+        x = (dialog.winfo_screenwidth() // 2) - (dialog_width // 2)
+        y = (dialog.winfo_screenheight() // 2) - (dialog_height // 2)
+        dialog.geometry(f"{dialog_width}x{dialog_height}+{x}+{y}")
+        dialog.resizable(False, False)
+
+        self.root.wait_window(dialog)
+
+        if resultado["confirmado"]:
+            self.sesion.iniciar_examen_mixto(resultado["cantidad"], resultado["tabla"], adaptativo)
             self.mostrar_pantalla_ejercicios()
         else:
             self.mostrar_pantalla_datos()
@@ -1375,6 +1822,8 @@ class AgilidadMentalApp:
     def mostrar_resultados_finales(self):
         """Pantalla de resultados estilo celebración"""
         self.limpiar_pantalla()
+        self._archivar_sesion()
+        self._borrar_punto_control()
 
         nota, tiempo, pen = self.calcular_nota_final()
 
@@ -1420,7 +1869,7 @@ class AgilidadMentalApp:
 
         ctk.CTkLabel(
             header_frame,
-            text=f"{self.nombre} • {self.curso} • {self.fecha}",
+            text=f"{self.sesion.nombre} • {self.sesion.curso} • {self.sesion.fecha}",
             font=("Comic Sans MS", 13),
             text_color="#666666"
         ).pack(pady=(2, 0))
@@ -1477,8 +1926,8 @@ class AgilidadMentalApp:
             text_color=Config.COLOR_MORADO_BRILLANTE
         ).pack(pady=(8, 5))
 
-        # Tabla simple de resultados
-        self._crear_tabla_resultados_simple(content_frame)
+        # Tabla simple de resultados: se llena fila por fila después de mostrar los botones
+        pasos_tabla = self._pasos_tabla_resultados_simple(content_frame)
 
         # Botones finales compactos
         buttons_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
@@ -1505,14 +1954,30 @@ class AgilidadMentalApp:
                 command=comando
             ).pack(side="left", padx=8)
 
-    def _crear_tabla_resultados_simple(self, parent):
-        """Tabla de resultados simplificada y colorida"""
-        resultados_por_operacion = self._agrupar_resultados_por_operacion()
+        self._construir_por_partes(pasos_tabla)
+
+    def _pasos_tabla_resultados_simple(self, parent):
+        """Tabla de resultados simplificada y colorida
+
+        Crea el contenedor vacío y retorna los pasos que lo llenan (encabezado,
+        una fila por operación y el total) para construirlos por partes.
+        """
+        resultados = self.sesion.resultados_operacion
 
         table_container = ctk.CTkFrame(parent, fg_color="transparent")
         table_container.pack(padx=30)
 
-        # Encabezado
+        pasos = [lambda: self._crear_encabezado_tabla_resultados(table_container)]
+        for operacion in self.sesion.operaciones_nivel:
+            totales_op = resultados.totales_operacion(operacion)
+            if totales_op is not None:
+                pasos.append(lambda op=operacion, t=totales_op:
+                             self._crear_fila_tabla_resultados(table_container, op, t))
+        pasos.append(lambda: self._crear_total_tabla_resultados(table_container, resultados))
+        return pasos
+
+    def _crear_encabezado_tabla_resultados(self, table_container):
+        """Encabezado de la tabla de resultados"""
         header_frame = ctk.CTkFrame(
             table_container,
             fg_color=Config.COLOR_MORADO_BRILLANTE,
@@ -1530,43 +1995,36 @@ class AgilidadMentalApp:
                 width=120
             ).pack(side="left", padx=8, pady=6, expand=True)
 
-        # Filas
-        total_correctas = 0
-        total_incorrectas = 0
+    def _crear_fila_tabla_resultados(self, table_container, operacion, totales_op):
+        """Fila de una operación en la tabla de resultados"""
+        nombre_op = self.obtener_nombre_operacion(operacion)
+        emoji_op = self.obtener_emoji_operacion(operacion)
 
-        for operacion in self.operaciones_nivel:
-            if operacion in resultados_por_operacion:
-                nombre_op = self.obtener_nombre_operacion(operacion)
-                emoji_op = self.obtener_emoji_operacion(operacion)
-                tablas = resultados_por_operacion[operacion]
+        correctas = totales_op.correctas
+        incorrectas = totales_op.incorrectas
+        tabla_max = totales_op.tabla_max
 
-                correctas = sum(t["correctas"] for t in tablas)
-                incorrectas = sum(t["incorrectas"] for t in tablas)
-                tabla_max = max(t["tabla"] for t in tablas)
+        color_fila = self.obtener_color_operacion(operacion)
 
-                total_correctas += correctas
-                total_incorrectas += incorrectas
+        row_frame = ctk.CTkFrame(
+            table_container,
+            fg_color=color_fila,
+            corner_radius=10
+        )
+        row_frame.pack(fill="x", pady=2)
 
-                color_fila = self.obtener_color_operacion(operacion)
+        datos = [f"{emoji_op} {nombre_op}", str(tabla_max), str(correctas), str(incorrectas)]
+        for dato in datos:
+            ctk.CTkLabel(
+                row_frame,
+                text=dato,
+                font=("Comic Sans MS", 12, "bold"),
+                text_color="white",
+                width=120
+            ).pack(side="left", padx=8, pady=6, expand=True)
 
-                row_frame = ctk.CTkFrame(
-                    table_container,
-                    fg_color=color_fila,
-                    corner_radius=10
-                )
-                row_frame.pack(fill="x", pady=2)
-
-                datos = [f"{emoji_op} {nombre_op}", str(tabla_max), str(correctas), str(incorrectas)]
-                for dato in datos:
-                    ctk.CTkLabel(
-                        row_frame,
-                        text=dato,
-                        font=("Comic Sans MS", 12, "bold"),
-                        text_color="white",
-                        width=120
-                    ).pack(side="left", padx=8, pady=6, expand=True)
-
-        # Total
+    def _crear_total_tabla_resultados(self, table_container, resultados):
+        """Fila de totales de la tabla de resultados"""
         total_frame = ctk.CTkFrame(
             table_container,
             fg_color=Config.COLOR_AMARILLO_BRILLANTE,
@@ -1574,7 +2032,7 @@ class AgilidadMentalApp:
         )
         total_frame.pack(fill="x", pady=(8, 0))
 
-        totales = ["🏆 TOTAL", "", str(total_correctas), str(total_incorrectas)]
+        totales = ["🏆 TOTAL", "", str(resultados.correctas_total), str(resultados.incorrectas_total)]
         for total in totales:
             ctk.CTkLabel(
                 total_frame,
@@ -1587,7 +2045,7 @@ class AgilidadMentalApp:
     # ==================== VENTANA DE RESPUESTAS ====================
     def mostrar_ventana_respuestas(self):
         """Ventana con todas las respuestas"""
-        if not self.historial_ejercicios:
+        if not self.sesion.historial_ejercicios:
             messagebox.showinfo("📝", "No hay ejercicios realizados.")
             return
 
@@ -1626,55 +2084,39 @@ class AgilidadMentalApp:
 
         ctk.CTkLabel(
             main_frame,
-            text=f"{self.nombre} • {self.curso} • {self.fecha}",
+            text=f"{self.sesion.nombre} • {self.sesion.curso} • {self.sesion.fecha}",
             font=("Comic Sans MS", 14),
             text_color="#666666"
         ).pack(pady=(0, 15))
 
-        # Scroll con ejercicios
-        scroll_frame = ctk.CTkScrollableFrame(main_frame, fg_color="transparent")
-        scroll_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
-
-        # Agrupar por operación
-        ejercicios_por_operacion = {}
-        orden_operaciones = []
-
-        for ej in self.historial_ejercicios:
-            clave = f"{ej['operacion']}_tabla{ej['tabla']}"
-            if clave not in ejercicios_por_operacion:
-                ejercicios_por_operacion[clave] = {
-                    "operacion": ej["operacion"],
-                    "tabla": ej["tabla"],
-                    "ejercicios": []
-                }
-                orden_operaciones.append(clave)
-            ejercicios_por_operacion[clave]["ejercicios"].append(ej)
-
-        # Mostrar cada grupo
-        for clave in orden_operaciones:
-            grupo = ejercicios_por_operacion[clave]
-            nombre_op = self.obtener_nombre_operacion(grupo["operacion"])
-            emoji_op = self.obtener_emoji_operacion(grupo["operacion"])
-            color = self.obtener_color_operacion(grupo["operacion"])
-
-            # Header del grupo
-            header = ctk.CTkFrame(scroll_frame, fg_color=color, corner_radius=15)
-            header.pack(fill="x", pady=(15, 10))
+        # Lista virtual: los grupos vienen armados del motor y solo se crean las filas visibles
+        grupos = self.sesion.grupos_historial()
+        historial = self.sesion.historial_ejercicios
 
-            ctk.CTkLabel(
-                header,
-                text=f"{emoji_op} {nombre_op} - Tabla {grupo['tabla']}",
-                font=("Comic Sans MS", 24, "bold"),
-                text_color="white"
-            ).pack(pady=15)
+        def llenar_encabezado(refs, seccion):
+            operacion, tabla, _ = grupos[seccion]
+            refs["frame"].configure(fg_color=self.obtener_color_operacion(operacion))
+            refs["texto"].configure(
+                text=f"{self.obtener_emoji_operacion(operacion)} "
+                     f"{self.obtener_nombre_operacion(operacion)} - Tabla {tabla}"
+            )
 
-            # Ejercicios del grupo
-            for i, ejercicio in enumerate(grupo["ejercicios"], 1):
-                self._crear_fila_respuesta(scroll_frame, i, ejercicio, color)
+        def llenar_fila(refs, seccion, fila):
+            self._llenar_fila_respuesta(refs, fila + 1, historial[grupos[seccion][2][fila]])
 
-        # Botones
+        # Los botones se empacan antes que la lista para que no queden fuera al achicar
         buttons_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
-        buttons_frame.pack(pady=20)
+        buttons_frame.pack(side="bottom", pady=20)
+
+        lista = ListaVirtual(
+            main_frame, [len(indices) for _, _, indices in grupos],
+            alto_encabezado=90, alto_fila=58,
+            crear_encabezado=self._crear_encabezado_respuestas,
+            llenar_encabezado=llenar_encabezado,
+            crear_fila=self._crear_fila_respuesta,
+            llenar_fila=llenar_fila
+        )
+        lista.pack(fill="both", expand=True, padx=20, pady=(0, 20))
 
         ctk.CTkButton(
             buttons_frame,
@@ -1702,76 +2144,157 @@ class AgilidadMentalApp:
             command=ventana.destroy
         ).pack(side="left", padx=15)
 
-    def _crear_fila_respuesta(self, parent, numero, ejercicio, color_base):
-        """Crea una fila de respuesta individual"""
-        bg = "#F0F0F0" if numero % 2 == 0 else "white"
+    def _crear_encabezado_respuestas(self, parent):
+        """Crea un encabezado de grupo reutilizable (se llena con cada operación y tabla)"""
+        contenedor = Frame(parent, bg="white")
+        header = ctk.CTkFrame(contenedor, corner_radius=15)
+        header.pack(fill="both", expand=True, pady=(15, 10))
 
-        fila = ctk.CTkFrame(parent, fg_color=bg, corner_radius=10)
-        fila.pack(fill="x", pady=3, padx=20)
+        texto = ctk.CTkLabel(
+            header,
+            text="",
+            font=("Comic Sans MS", 24, "bold"),
+            text_color="white"
+        )
+        texto.pack(expand=True)
+        return contenedor, {"frame": header, "texto": texto}
+
+    def _crear_fila_respuesta(self, parent):
+        """Crea una fila de respuesta reutilizable (se llena con _llenar_fila_respuesta)"""
+        contenedor = Frame(parent, bg="white")
+        fila = ctk.CTkFrame(contenedor, corner_radius=10)
+        fila.pack(fill="both", expand=True, pady=3, padx=20)
 
         content = ctk.CTkFrame(fila, fg_color="transparent")
         content.pack(fill="x", padx=15, pady=10)
 
         # Ejercicio
-        ctk.CTkLabel(
+        ejercicio = ctk.CTkLabel(
             content,
-            text=ejercicio["ejercicio"],
+            text="",
             font=("Comic Sans MS", 16),
             text_color="#333333",
             width=150,
             anchor="w"
-        ).pack(side="left", padx=5)
+        )
+        ejercicio.pack(side="left", padx=5)
 
         # Tu respuesta
-        resp_usuario = ejercicio["respuesta_usuario"] if ejercicio["respuesta_usuario"] else "(vacío)"
-        ctk.CTkLabel(
+        respuesta = ctk.CTkLabel(
             content,
-            text=f"Tu respuesta: {resp_usuario}",
+            text="",
             font=("Comic Sans MS", 14),
             text_color="#666666",
             width=140
-        ).pack(side="left", padx=5)
+        )
+        respuesta.pack(side="left", padx=5)
 
         # Respuesta correcta
-        ctk.CTkLabel(
+        correcta = ctk.CTkLabel(
             content,
-            text=f"Correcta: {ejercicio['respuesta_correcta']}",
+            text="",
             font=("Comic Sans MS", 14),
             text_color="#666666",
             width=120
-        ).pack(side="left", padx=5)
+        )
+        correcta.pack(side="left", padx=5)
 
         # Estado - Ahora más compacto y mejor distribuido
-        if ejercicio["correcto"]:
-            estado_text = "✅ BIEN"
-            estado_color = Config.COLOR_VERDE_BRILLANTE
-        else:
-            estado_text = "❌ MAL"
-            estado_color = Config.COLOR_ROJO_BRILLANTE
-
-        estado_label = ctk.CTkLabel(
+        estado = ctk.CTkLabel(
             content,
-            text=estado_text,
+            text="",
             font=("Comic Sans MS", 14, "bold"),
-            text_color=estado_color,
             width=80
         )
-        estado_label.pack(side="left", padx=5)
+        estado.pack(side="left", padx=5)
+
+        return contenedor, {
+            "frame": fila, "ejercicio": ejercicio, "respuesta": respuesta,
+            "correcta": correcta, "estado": estado
+        }
+
+    def _llenar_fila_respuesta(self, refs, numero, ejercicio):
+        """Pone en una fila reciclada los datos de una respuesta"""
+        refs["frame"].configure(fg_color="#F0F0F0" if numero % 2 == 0 else "white")
+        refs["ejercicio"].configure(text=ejercicio.ejercicio)
+
+        resp_usuario = ejercicio.respuesta_usuario if ejercicio.respuesta_usuario else "(vacío)"
+        refs["respuesta"].configure(text=f"Tu respuesta: {resp_usuario}")
+        refs["correcta"].configure(text=f"Correcta: {ejercicio.respuesta_correcta}")
+
+        if ejercicio.correcto:
+            refs["estado"].configure(text="✅ BIEN", text_color=Config.COLOR_VERDE_BRILLANTE)
+        else:
+            refs["estado"].configure(text="❌ MAL", text_color=Config.COLOR_ROJO_BRILLANTE)
 
     # ==================== FUNCIONES DE LÓGICA ====================
 
     def seleccionar_nivel(self, nivel):
         """Selecciona nivel y configura operaciones"""
-        self.nivel = nivel
-        if nivel == 1:
-            self.operaciones_nivel = ["suma", "resta"]
-        elif nivel == 2:
-            self.operaciones_nivel = ["suma", "resta", "multiplicación", "división"]
-        else:
-            self.operaciones_nivel = ["suma", "resta", "multiplicación", "división", "potencia", "raiz"]
+        self.sesion.seleccionar_nivel(nivel)
         self.mostrar_pantalla_datos()
 
-    def validar_datos(self):
+    def _clave_estudiante(self):
+        """Retorna (nombre, curso) normalizados, o None si faltan datos"""
+        nombre = self.entry_nombre.get().strip()
+        curso = self.combo_curso.get()
+        if not nombre or curso == "👉 Selecciona tu curso":
+            return None
+        return nombre.casefold(), curso
+
+    def _precargar_repaso(self):
+        """Empieza a leer en segundo plano la cola de repaso y el índice de dominio del estudiante escrito"""
+        clave = self._clave_estudiante()
+        if clave is None:
+            return
+        self._cargar_estudiante(clave)
+        self._mostrar_repasos_pendientes(clave)
+
+    def _cargar_estudiante(self, clave):
+        """Pide al hilo de carga lo que falte leer del disco para el estudiante"""
+        if self._cargador_repaso is None:
+            self._cargador_repaso = ThreadPoolExecutor(max_workers=1)
+        if clave not in self.colas_repaso:
+            self.colas_repaso[clave] = self._cargador_repaso.submit(ColaRepaso.de_estudiante, *clave)
+        if clave not in self.indices_dominio:
+            self.indices_dominio[clave] = self._cargador_repaso.submit(self._cargar_indice_dominio, *clave)
+
+    @staticmethod
+    def _cargar_indice_dominio(nombre, curso):
+        """Índice guardado del estudiante; sin acceso a la carpeta de datos, uno solo en memoria"""
+        try:
+            return IndiceDominio.de_estudiante(nombre, curso)
+        except OSError:
+            return IndiceDominio(semilla_dominio(nombre, curso))
+
+    def _obtener_indice_dominio(self, clave):
+        """Retorna el índice de dominio del estudiante (espera la carga si aún no termina)"""
+        self._cargar_estudiante(clave)
+        return self.indices_dominio[clave].result()
+
+    def _mostrar_repasos_pendientes(self, clave):
+        """Muestra en el botón de repaso cuántos ejercicios vencen (cuando termine la carga)"""
+        futuro = self.colas_repaso[clave]
+        if not futuro.done():
+            self.root.after(50, lambda: self._mostrar_repasos_pendientes(clave))
+            return
+        try:
+            if not self.btn_repaso.winfo_exists() or self._clave_estudiante() != clave:
+                return
+            pendientes = futuro.result().cantidad_vencidos()
+        except Exception:
+            return
+        self.btn_repaso.configure(text=f"📚 Repaso ({pendientes})" if pendientes else "📚 Repaso")
+
+    def _obtener_cola_repaso(self, clave):
+        """Retorna la cola de repaso del estudiante (espera la carga si aún no termina)"""
+        self._cargar_estudiante(clave)
+        try:
+            return self.colas_repaso[clave].result()
+        except OSError:
+            return None  # Sin acceso a la carpeta de datos: se sigue sin repaso
+
+    def validar_datos(self, examen_mixto=False, adaptativo=False, repaso=False):
         """Valida datos del estudiante"""
         nombre = self.entry_nombre.get().strip()
         curso = self.combo_curso.get()
@@ -1780,59 +2303,21 @@ class AgilidadMentalApp:
             messagebox.showwarning("⚠️", "Por favor completa todos los datos")
             return
 
-        self.nombre = nombre
-        self.curso = curso
-        self.fecha = self.entry_fecha.get()
-
-        self.resultados_operacion = {}
-        self.operacion_actual = ""
-        self.tabla_actual = 1
-        self.limites_tablas = {}
-        self.solicitar_limite_tabla_operacion()
-
-    def generar_ejercicios(self, operacion):
-        """Genera ejercicios según operación"""
-        ejercicios = []
-        tabla = self.tabla_actual
-        numeros = list(range(0, 13))
-
-        if operacion == "resta":
-            numeros_validos = list(range(0, tabla + 1))
-            for num in numeros_validos:
-                ejercicios.append({"texto": f"{tabla} - {num} =", "respuesta": tabla - num})
-        elif operacion == "división":
-            for num in numeros:
-                dividendo = tabla * num
-                ejercicios.append({"texto": f"{dividendo} ÷ {tabla} =", "respuesta": num})
+        # El índice de dominio del estudiante sobrevive a reiniciar el aplicativo
+        clave = self._clave_estudiante()
+        indice = self._obtener_indice_dominio(clave)
+        self.sesion.iniciar_estudiante(nombre, curso, self.entry_fecha.get(), indice,
+                                       self._obtener_cola_repaso(clave))
+        if repaso:
+            if self.sesion.cola_repaso is None or not self.sesion.cola_repaso.vencidos(1):
+                messagebox.showinfo("📚", "¡No tienes ejercicios por repasar hoy! 🎉")
+                return
+            self.sesion.iniciar_repaso(Config.REPASO_MAXIMO)
+            self.mostrar_pantalla_ejercicios()
+        elif examen_mixto:
+            self.solicitar_examen_mixto(adaptativo)
         else:
-            for num in numeros:
-                ej = self._generar_ejercicio_por_tipo(operacion, tabla, num)
-                if ej:
-                    ejercicios.append(ej)
-
-        random.shuffle(ejercicios)
-        for idx, ej in enumerate(ejercicios):
-            ej["id"] = idx
-        return ejercicios
-
-    def _generar_ejercicio_por_tipo(self, operacion, tabla, num):
-        """Genera ejercicio individual"""
-        if operacion == "suma":
-            return {"texto": f"{tabla} + {num} =", "respuesta": tabla + num}
-        elif operacion == "multiplicación":
-            return {"texto": f"{tabla} × {num} =", "respuesta": tabla * num}
-        elif operacion == "potencia":
-            return {"texto": f"{num}^{tabla} =", "respuesta": num ** tabla}
-        elif operacion == "raiz":
-            radicando = num ** tabla
-            if tabla == 2:
-                texto = f"√{radicando} ="
-            elif tabla == 3:
-                texto = f"∛{radicando} ="
-            else:
-                texto = f"ⁿ√{radicando} =".replace("ⁿ", str(tabla))
-            return {"texto": texto, "respuesta": num}
-        return None
+            self.solicitar_limite_tabla_operacion()
 
     def _focus_next_entry(self, event, next_entry):
         """Mueve el foco al siguiente entry cuando se presiona Tab"""
@@ -1842,54 +2327,70 @@ class AgilidadMentalApp:
             next_entry.select_range(0, "end")
         return "break"  # Previene el comportamiento por defecto de Tab
 
+    def _registrar_foco(self, posicion):
+        """El entry de la rejilla en `posicion` recibió el foco"""
+        if posicion is not None:
+            self.eventos_respuesta.registrar(posicion, FOCO)
+
+    def _enfocar_siguiente(self, posicion):
+        """Tab: pasa al entry del siguiente ejercicio; en el último vuelve al primero"""
+        if posicion is None:
+            return "break"
+        if self.rejilla is not None:
+            self.rejilla.enfocar((posicion + 1) % max(len(self.sesion.ejercicios), 1))
+            return "break"
+        siguiente = self.entries.get(posicion + 1) or self.entries.get(0)
+        if siguiente is None:
+            return "break"
+        return self._focus_next_entry(None, siguiente)
+
+    def _habilitar_respuestas(self, habilitar):
+        """Habilita o deshabilita la escritura en los ejercicios de la tabla"""
+        self.render.completar()  # Todas las filas deben existir antes de habilitarlas
+        if self.rejilla is not None:
+            self.rejilla.habilitar(habilitar)
+            return
+        for entry in self.entries.values():
+            entry.configure(state="normal" if habilitar else "disabled")
+
     def iniciar_cronometro(self):
         """Inicia cronómetro"""
-        if self.finalizado:
+        if self.sesion.finalizado:
             messagebox.showinfo("⚠️", "Esta operación ya fue finalizada")
             return
 
         if not self.corriendo:
-            self.tiempo_inicio = datetime.now() - timedelta(seconds=self.tiempo_operacion_actual)
+            self.cronometro.iniciar(self.sesion.tiempo_operacion_actual)
             self.corriendo = True
 
-            # Habilitar entries para escribir y configurar navegación con Tab
-            entry_list = list(self.entries.values())
-            for i, entry in enumerate(entry_list):
-                entry.configure(state="normal")
-                # Configurar navegación con Tab
-                if i < len(entry_list) - 1:
-                    next_entry = entry_list[i + 1]
-                    entry.bind("<Tab>", lambda e, next_e=next_entry: self._focus_next_entry(e, next_e))
-                else:
-                    # En el último entry, Tab va al primero
-                    entry.bind("<Tab>", lambda e, next_e=entry_list[0]: self._focus_next_entry(e, next_e))
+            # Habilitar entries para escribir (Tab ya está enlazado en cada fila)
+            self._habilitar_respuestas(True)
 
             # El botón finalizar ya está habilitado desde el inicio
             # No necesitamos cambiar su estado
 
+            self._guardar_punto_control()  # Orden de la tabla recién sorteada
             self.actualizar_cronometro()
 
     def detener_cronometro(self):
         """Detiene cronómetro"""
         if self.corriendo:
-            self.tiempo_operacion_actual = (datetime.now() - self.tiempo_inicio).total_seconds()
+            self.sesion.tiempo_operacion_actual = self.cronometro.detener()
             self.corriendo = False
+        if self._tic_cronometro is not None:
+            self.root.after_cancel(self._tic_cronometro)
+            self._tic_cronometro = None
 
-    def actualizar_cronometro(self):
-        """Actualiza cronómetro cada segundo"""
-        if not self.corriendo:
-            return
-
-        elapsed = (datetime.now() - self.tiempo_inicio).total_seconds()
-        mins = int(elapsed // 60)
-        secs = int(elapsed % 60)
-
-        # Actualizar texto del cronómetro
-        self.label_tiempo.configure(text=f"{mins:02d}:{secs:02d}")
-
+    def _pintar_cronometro(self, elapsed):
+        """Repinta el cronómetro solo si cambió el texto o el estado de tiempo extra"""
         # REGLA: Si pasa del tiempo principal, cambiar a tiempo extra
-        if elapsed > self.tiempo_principal_operacion and not self.en_tiempo_extra:
+        if elapsed > self.sesion.tiempo_principal_operacion:
             self.en_tiempo_extra = True
+
+        texto, entra_en_extra = self._cronometro_pintado.cambios(elapsed, self.en_tiempo_extra)
+        if texto is not None:
+            self.label_tiempo.configure(text=texto)
+        if entra_en_extra:
             # Cambiar el color del cronómetro a rojo/naranja brillante
             if self.cronometro_frame:
                 self.cronometro_frame.configure(
@@ -1899,32 +2400,53 @@ class AgilidadMentalApp:
             if self.label_tiempo_titulo:
                 self.label_tiempo_titulo.configure(text="⚠️ TIEMPO EXTRA ⚠️")
 
+    def _programar_tic_cronometro(self):
+        """Agenda el próximo tic: el siguiente segundo entero, o el tiempo máximo si está oculta"""
+        if self._tic_cronometro is not None:
+            self.root.after_cancel(self._tic_cronometro)
+        # Los retrasos de un tic no se acumulan: se apunta al próximo segundo entero
+        espera = self.cronometro.ms_hasta_proximo_tic(
+            self.sesion.tiempo_maximo_operacion if self._ventana_oculta else None
+        )
+        self._tic_cronometro = self.root.after(espera, self.actualizar_cronometro)
+
+    def actualizar_cronometro(self):
+        """Actualiza cronómetro en cada segundo entero del tiempo transcurrido"""
+        self._tic_cronometro = None
+        if not self.corriendo:
+            return
+
+        elapsed = self.cronometro.transcurrido()
+        if not self._ventana_oculta:
+            self._pintar_cronometro(elapsed)
+        if elapsed - self._ultimo_punto_control >= Config.INTERVALO_PUNTO_CONTROL:
+            self._guardar_punto_control()
+
         # REGLA: Si llega al tiempo máximo, finalizar automáticamente esta operación
-        if elapsed >= self.tiempo_maximo_operacion:
+        if self.cronometro.restante(self.sesion.tiempo_maximo_operacion) == 0:
             self.detener_cronometro()
+            # Se registra el tiempo máximo exacto, no los milisegundos del último tic
+            self.sesion.tiempo_operacion_actual = min(self.sesion.tiempo_operacion_actual,
+                                                      self.sesion.tiempo_maximo_operacion)
             self.test_finalizado_automaticamente = True
 
-            # Determinar qué sigue después
-            idx_actual = self.operaciones_nivel.index(self.operacion_actual)
-            es_ultima_operacion = (idx_actual == len(self.operaciones_nivel) - 1)
-
             # Mensaje personalizado según lo que sigue
-            if es_ultima_operacion:
+            siguiente_op = self.sesion.operacion_siguiente()
+            if siguiente_op is None:
                 mensaje_siguiente = "Al presionar Aceptar verás el resumen final de tus resultados."
             else:
-                siguiente_op = self.operaciones_nivel[idx_actual + 1]
                 nombre_siguiente = self.obtener_nombre_operacion(siguiente_op)
                 mensaje_siguiente = f"Al presionar Aceptar continuarás con la siguiente operación: {nombre_siguiente}."
 
             messagebox.showwarning(
                 "⏰ Tiempo Agotado",
                 f"¡Se acabó el tiempo para esta operación!\n\n"
-                f"Has llegado al límite de {int(self.tiempo_maximo_operacion//60)} minutos.\n\n"
+                f"Has llegado al límite de {int(self.sesion.tiempo_maximo_operacion//60)} minutos.\n\n"
                 f"{mensaje_siguiente}"
             )
             self.finalizar_operacion_automatica()
         else:
-            self.root.after(1000, self.actualizar_cronometro)
+            self._programar_tic_cronometro()
 
     def finalizar_operacion_automatica(self):
         """Finaliza la operación actual automáticamente cuando se acaba el tiempo"""
@@ -1933,22 +2455,17 @@ class AgilidadMentalApp:
             self.detener_cronometro()
 
         # Evaluar y guardar la operación actual
-        if self.ejercicios and not self.finalizado:
-            correctas, incorrectas = self._evaluar_respuestas()
+        if self.sesion.ejercicios and not self.sesion.finalizado:
+            self.sesion.finalizar_tabla(self._leer_respuestas(), self._leer_latencias())
+            self._guardar_punto_control()
             # Deshabilitar entries
-            for entry in self.entries.values():
-                entry.configure(state="disabled")
+            self._habilitar_respuestas(False)
             # Deshabilitar botón finalizar
             if self.boton_finalizar:
                 self.boton_finalizar.configure(state="disabled", fg_color="#CCCCCC", text_color="#666666")
-            self.finalizado = True
-            self._guardar_resultado(correctas, incorrectas)
 
         # Verificar si hay más operaciones pendientes
-        idx_actual = self.operaciones_nivel.index(self.operacion_actual)
-        es_ultima_operacion = (idx_actual == len(self.operaciones_nivel) - 1)
-
-        if es_ultima_operacion:
+        if self.sesion.es_ultima_operacion():
             # Era la última operación, mostrar resultados finales
             self.mostrar_resultados_finales()
         else:
@@ -1957,106 +2474,173 @@ class AgilidadMentalApp:
 
     def finalizar_operacion(self):
         """Finaliza operación actual"""
-        if self.finalizado:
+        if self.sesion.finalizado:
             messagebox.showinfo("⚠️", "Ya finalizado")
             return
 
-        if self.tiempo_operacion_actual == 0 and not self.corriendo:
+        if self.sesion.tiempo_operacion_actual == 0 and not self.corriendo:
             messagebox.showwarning("⚠️", "El cronómetro aún no ha iniciado")
             return
 
         self.detener_cronometro()
-        correctas, incorrectas = self._evaluar_respuestas()
+        correctas, incorrectas = self.sesion.finalizar_tabla(self._leer_respuestas(), self._leer_latencias())
+        self._guardar_punto_control()
 
         # Deshabilitar entries
-        for entry in self.entries.values():
-            entry.configure(state="disabled")
+        self._habilitar_respuestas(False)
 
         # Deshabilitar botón finalizar
         if self.boton_finalizar:
             self.boton_finalizar.configure(state="disabled", fg_color="#CCCCCC", text_color="#666666")
 
-        self.finalizado = True
-        self._guardar_resultado(correctas, incorrectas)
-
-        nombre_op = self.obtener_nombre_operacion(self.operacion_actual)
-        total = len(self.ejercicios)
+        nombre_op = self.obtener_nombre_operacion(self.sesion.operacion_actual)
+        total = len(self.sesion.ejercicios)
         porcentaje = (correctas / total) * 100
         emoji = "🌟" if porcentaje >= 90 else "👍" if porcentaje >= 70 else "💪"
 
         messagebox.showinfo(
             f"{emoji} ¡Completado!",
-            f"{nombre_op} - Tabla {self.tabla_actual}\n\n"
+            f"{nombre_op} - Tabla {self.sesion.tabla_actual}\n\n"
             f"Aciertos: {correctas}/{total}\n"
-            f"Tiempo: {int(self.tiempo_operacion_actual//60):02d}:{int(self.tiempo_operacion_actual%60):02d}"
+            f"Tiempo: {int(self.sesion.tiempo_operacion_actual//60):02d}:{int(self.sesion.tiempo_operacion_actual%60):02d}"
         )
 
-        idx_actual = self.operaciones_nivel.index(self.operacion_actual)
-        es_ultima_operacion = (idx_actual == len(self.operaciones_nivel) - 1)
-        es_ultima_tabla = (self.tabla_actual == self.tabla_max)
+        es_ultima_operacion = self.sesion.es_ultima_operacion()
+        es_ultima_tabla = self.sesion.es_ultima_tabla()
 
         if es_ultima_tabla and es_ultima_operacion:
             self.mostrar_resultados_finales()
         elif es_ultima_tabla:
             self.mostrar_resumen_operacion_completa()
 
-    def _evaluar_respuestas(self):
-        """Evalúa respuestas"""
-        correctas = 0
-        incorrectas = 0
-        for ej in self.ejercicios:
-            val = self.entries[ej["id"]].get().strip()
-            try:
-                if int(val) == ej["respuesta"]:
-                    correctas += 1
-                else:
-                    incorrectas += 1
-            except ValueError:
-                incorrectas += 1
-        return correctas, incorrectas
-
-    def _guardar_resultado(self, correctas, incorrectas):
-        """Guarda resultado"""
-        clave = f"{self.operacion_actual}_tabla{self.tabla_actual}"
-        self.resultados_operacion[clave] = {
-            "operacion": self.operacion_actual,
-            "tabla": self.tabla_actual,
-            "correctas": correctas,
-            "incorrectas": incorrectas,
-            "total": len(self.ejercicios),
-            "tiempo": self.tiempo_operacion_actual
-        }
+    def _leer_respuestas(self):
+        """Toma en una sola pasada lo escrito en cada entry (posición -> texto)"""
+        self.render.completar()
+        if self.rejilla is not None:
+            return self.rejilla.respuestas()
+        return {id_ej: entry.get() for id_ej, entry in self.entries.items()}
+
+    # ==================== PUNTOS DE CONTROL ====================
+    def _guardar_punto_control(self):
+        """Pide guardar el estado del test; la escritura ocurre en otro hilo"""
+        if self._archivo_punto_control is None or not self.sesion.ejercicios:
+            return
+        tiempo = self.cronometro.transcurrido() if self.corriendo else None
+        # El historial completo se convierte en el hilo del escritor, no en el de Tk
+        armar = self.sesion.instantanea_diferida(self._respuestas_escritas, tiempo)
+        self._ultimo_punto_control = self.sesion.tiempo_operacion_actual if tiempo is None else tiempo
+        self.escritor.programar(self._archivo_punto_control,
+                                lambda: json.dumps(armar(), ensure_ascii=False, separators=(",", ":")))
+
+    def _archivar_sesion(self):
+        """Guarda el test terminado (una vez) para poder recalificarlo con otra política"""
+        if self._sesion_archivada or not len(self.sesion.resultados_operacion):
+            return
+        self._sesion_archivada = True
+        try:
+            ruta = archivo_sesion_terminada(self.sesion.nombre, self.sesion.curso)
+        except OSError:
+            return
+        armar = self.sesion.instantanea_diferida()
+        self.escritor.programar(ruta, lambda: json.dumps(armar(), ensure_ascii=False, separators=(",", ":")))
+
+    def _borrar_punto_control(self):
+        """El test terminó: ya no hay nada que reanudar"""
+        if self._archivo_punto_control is not None:
+            self.escritor.borrar(self._archivo_punto_control)
+
+    def cerrar(self):
+        """Cierra la ventana después de terminar las escrituras pendientes
+
+        Sin esto, borrar el punto de control de un test recién terminado podría
+        quedar sin hacer y la próxima vez se ofrecería reanudarlo.
+        """
+        self.render.cancelar()
+        self.escritor.esperar(Config.ESPERA_CIERRE_ESCRITOR)
+        self.root.destroy()
+
+    def _ofrecer_reanudar(self):
+        """Si quedó un test sin terminar (corte de luz, cierre), ofrece continuarlo"""
+        if self._archivo_punto_control is None:
+            return
+        try:
+            with open(self._archivo_punto_control, encoding="utf-8") as f:
+                datos = json.load(f)
+            nombre, curso = datos["nombre"], datos["curso"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+
+        if not messagebox.askyesno(
+            "💾 Test sin terminar",
+            f"{nombre} ({curso}) dejó un test sin terminar.\n\n¿Quieres continuarlo donde quedó?"
+        ):
+            self._borrar_punto_control()
+            return
 
-        for ej in self.ejercicios:
-            respuesta_usuario = self.entries[ej["id"]].get().strip()
-            self.historial_ejercicios.append({
-                "operacion": self.operacion_actual,
-                "tabla": self.tabla_actual,
-                "ejercicio": ej["texto"],
-                "respuesta_correcta": ej["respuesta"],
-                "respuesta_usuario": respuesta_usuario,
-                "correcto": respuesta_usuario == str(ej["respuesta"])
-            })
+        clave = (nombre.casefold(), curso)
+        try:
+            cola = ColaRepaso.de_estudiante(*clave)
+        except OSError:
+            cola = None
+        try:
+            respuestas = self.sesion.restaurar_instantanea(
+                datos, self._obtener_indice_dominio(clave), cola
+            )
+        except (ValueError, KeyError, IndexError, TypeError):
+            messagebox.showwarning("⚠️", "No se pudo recuperar el test guardado")
+            self._borrar_punto_control()
+            self._inicializar_variables()
+            return
+        self._reanudar_tabla(respuestas)
+
+    def _reanudar_tabla(self, respuestas):
+        """Muestra la tabla restaurada con sus respuestas y sigue desde el tiempo guardado"""
+        finalizado = self.sesion.finalizado
+        self.en_tiempo_extra = self.sesion.tiempo_operacion_actual > self.sesion.tiempo_principal_operacion
+        self.corriendo = False
+        self._mostrar_ejercicios_y_cronometro()
+        self.render.completar()  # Las respuestas guardadas van en filas ya creadas
+
+        for posicion, texto in respuestas.items():
+            if self.rejilla is not None:
+                if posicion < len(self.sesion.ejercicios):
+                    self.rejilla.escribir(posicion, texto)
+                    self._respuestas_escritas[posicion] = texto
+                continue
+            entry = self.entries.get(posicion)
+            if entry is not None:
+                entry.configure(state="normal")
+                entry.insert(0, texto)
+                entry.configure(state="disabled")
+        self.eventos_respuesta.reiniciar()  # Lo restaurado no cuenta como tiempo de respuesta
+        self._ultimo_punto_control = self.sesion.tiempo_operacion_actual
+
+        if finalizado:
+            self.sesion.finalizado = True
+            if self.boton_finalizar:
+                self.boton_finalizar.configure(state="disabled", fg_color="#CCCCCC", text_color="#666666")
+        else:
+            self.root.after(100, self.iniciar_cronometro)
+
+    def _leer_latencias(self):
+        """Milisegundos por ejercicio según los eventos de foco y tecla de la tabla"""
+        return self.eventos_respuesta.latencias(len(self.sesion.ejercicios))
 
     def siguiente_operacion(self):
         """Avanza a siguiente tabla/operación"""
-        clave_actual = f"{self.operacion_actual}_tabla{self.tabla_actual}"
-
-        if clave_actual not in self.resultados_operacion:
+        if not self.sesion.tabla_guardada():
             if not messagebox.askyesno("⚠️", "¿Pasar sin a la siguiente tabla?"):
                 return
             if self.corriendo:
                 self.detener_cronometro()
-            correctas, incorrectas = self._evaluar_respuestas()
-            self._guardar_resultado(correctas, incorrectas)
-            self.finalizado = True
+            self.sesion.finalizar_tabla(self._leer_respuestas(), self._leer_latencias())
+            self._guardar_punto_control()
 
         # Detener cronómetro sin reiniciar
         if self.corriendo:
             self.detener_cronometro()
 
-        if self.tabla_actual < self.tabla_max:
-            self.tabla_actual += 1
+        if self.sesion.avanzar_tabla():
             self.mostrar_pantalla_ejercicios()
         else:
             self.mostrar_resumen_operacion_completa()
@@ -2066,22 +2650,15 @@ class AgilidadMentalApp:
         self.limpiar_pantalla()
 
         # Calcular estadísticas de esta operación
-        correctas_total = 0
-        incorrectas_total = 0
-        total_preguntas = 0
-
-        for clave, r in self.resultados_operacion.items():
-            if r["operacion"] == self.operacion_actual:
-                correctas_total += r["correctas"]
-                incorrectas_total += r["incorrectas"]
-                total_preguntas += r["total"]
+        correctas_total, incorrectas_total, total_preguntas = \
+            self.sesion.resumen_operacion(self.sesion.operacion_actual)
 
         # Usar el tiempo acumulado del cronómetro (ya incluye todas las tablas)
-        tiempo_total_op = self.tiempo_operacion_actual
+        tiempo_total_op = self.sesion.tiempo_operacion_actual
 
-        nombre_op = self.obtener_nombre_operacion(self.operacion_actual)
-        emoji_op = self.obtener_emoji_operacion(self.operacion_actual)
-        color_operacion = self.obtener_color_operacion(self.operacion_actual)
+        nombre_op = self.obtener_nombre_operacion(self.sesion.operacion_actual)
+        emoji_op = self.obtener_emoji_operacion(self.sesion.operacion_actual)
+        color_operacion = self.obtener_color_operacion(self.sesion.operacion_actual)
 
         # Calcular nota parcial de esta operación
         nota_operacion = round((correctas_total / total_preguntas) * 100) if total_preguntas > 0 else 0
@@ -2137,9 +2714,53 @@ class AgilidadMentalApp:
             text_color=color_operacion
         ).pack(pady=(0, 20))
 
+        # Lugar de la tabla y el tiempo: se llenan después de mostrar el botón para seguir
+        detalle_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        detalle_frame.pack(fill="x")
+
+        # Determinar siguiente paso
+        siguiente_op = self.sesion.operacion_siguiente()
+
+        if siguiente_op is not None:
+            nombre_siguiente = self.obtener_nombre_operacion(siguiente_op)
+
+            ctk.CTkButton(
+                content_frame,
+                text=f"➡️ Continuar con {nombre_siguiente}",
+                font=("Comic Sans MS", 20, "bold"),
+                width=350,
+                height=65,
+                corner_radius=20,
+                fg_color=Config.COLOR_VERDE_BRILLANTE,
+                hover_color=self._aclarar_color(Config.COLOR_VERDE_BRILLANTE),
+                text_color="white",
+                command=lambda: self._continuar_siguiente_operacion(siguiente_op)
+            ).pack()
+        else:
+            ctk.CTkButton(
+                content_frame,
+                text="🎉 Ver Resultados Finales",
+                font=("Comic Sans MS", 20, "bold"),
+                width=350,
+                height=65,
+                corner_radius=20,
+                fg_color=Config.COLOR_VERDE_BRILLANTE,
+                hover_color=self._aclarar_color(Config.COLOR_VERDE_BRILLANTE),
+                text_color="white",
+                command=self.mostrar_resultados_finales
+            ).pack()
+
+        self._construir_por_partes([
+            lambda: self._crear_detalle_resumen_operacion(detalle_frame, correctas_total, incorrectas_total,
+                                                          tiempo_total_op, color_operacion)
+        ])
+
+    def _crear_detalle_resumen_operacion(self, parent, correctas_total, incorrectas_total, tiempo_total_op,
+                                         color_operacion):
+        """Aciertos, errores y tiempo del resumen de operación"""
         # Tabla de resultados
         tabla_frame = ctk.CTkFrame(
-            content_frame,
+            parent,
             fg_color=self._aclarar_color(color_operacion),
             corner_radius=15
         )
@@ -2187,65 +2808,30 @@ class AgilidadMentalApp:
 
         # Tiempo
         ctk.CTkLabel(
-            content_frame,
+            parent,
             text=f"⏱️ Tiempo: {int(tiempo_total_op//60):02d}:{int(tiempo_total_op%60):02d}",
             font=("Comic Sans MS", 18),
             text_color="#666666"
         ).pack(pady=(0, 25))
 
-        # Determinar siguiente paso
-        idx_actual = self.operaciones_nivel.index(self.operacion_actual)
-
-        if idx_actual + 1 < len(self.operaciones_nivel):
-            siguiente_op = self.operaciones_nivel[idx_actual + 1]
-            nombre_siguiente = self.obtener_nombre_operacion(siguiente_op)
-
-            ctk.CTkButton(
-                content_frame,
-                text=f"➡️ Continuar con {nombre_siguiente}",
-                font=("Comic Sans MS", 20, "bold"),
-                width=350,
-                height=65,
-                corner_radius=20,
-                fg_color=Config.COLOR_VERDE_BRILLANTE,
-                hover_color=self._aclarar_color(Config.COLOR_VERDE_BRILLANTE),
-                text_color="white",
-                command=lambda: self._continuar_siguiente_operacion(siguiente_op)
-            ).pack()
-        else:
-            ctk.CTkButton(
-                content_frame,
-                text="🎉 Ver Resultados Finales",
-                font=("Comic Sans MS", 20, "bold"),
-                width=350,
-                height=65,
-                corner_radius=20,
-                fg_color=Config.COLOR_VERDE_BRILLANTE,
-                hover_color=self._aclarar_color(Config.COLOR_VERDE_BRILLANTE),
-                text_color="white",
-                command=self.mostrar_resultados_finales
-            ).pack()
-
     def _continuar_siguiente_operacion(self, siguiente_op):
         """Continúa con la siguiente operación"""
-        self.operacion_actual = siguiente_op
-        self.tabla_actual = self.obtener_tabla_minima(siguiente_op)
-        # Reiniciar tiempo para la nueva operación
-        self.tiempo_operacion_actual = 0
+        # Reinicia también el tiempo para la nueva operación
+        self.sesion.continuar_siguiente_operacion(siguiente_op)
         self.en_tiempo_extra = False
         self.solicitar_limite_tabla_operacion()
 
     def mostrar_resultados_operacion(self):
         """Muestra resultados parciales"""
-        if not self.resultados_operacion:
+        if not self.sesion.resultados_operacion:
             messagebox.showinfo("📊", "Aún no has completado operaciones")
             return
 
         texto = "📊 RESULTADOS PARCIALES\n\n"
-        total_ac = sum(r["correctas"] for r in self.resultados_operacion.values())
-        total_pr = sum(r["total"] for r in self.resultados_operacion.values())
+        total_ac = self.sesion.resultados_operacion.correctas_total
+        total_pr = self.sesion.resultados_operacion.preguntas_total
 
-        for clave, r in sorted(self.resultados_operacion.items()):
+        for clave, r in sorted(self.sesion.resultados_operacion.items()):
             op = r["operacion"]
             emoji = self.obtener_emoji_operacion(op)
             tabla = r["tabla"]
@@ -2258,57 +2844,11 @@ class AgilidadMentalApp:
 
     def calcular_nota_final(self):
         """Calcula nota final con penalización por tiempo extra en cada operación"""
-        total_aciertos = sum(r["correctas"] for r in self.resultados_operacion.values())
-        total_preguntas = sum(r["total"] for r in self.resultados_operacion.values())
-        nota_base = (total_aciertos / total_preguntas) * 100 if total_preguntas > 0 else 0
-
-        # Calcular penalización por cada operación que haya excedido el tiempo principal
-        penalizacion_total = 0
-
-        # Calcular penalización por cada operación/tabla
-        for r in self.resultados_operacion.values():
-            tiempo_operacion = r["tiempo"]
-            operacion = r["operacion"]
-
-            # Determinar tiempo principal según la operación
-            if operacion in ["potencia", "raiz"]:
-                tiempo_principal = Config.POTENCIA_RAIZ_TIEMPO_PRINCIPAL
-                penalizacion_maxima = 2  # Máximo 2 puntos para potenciación/radicación (2 minutos extra)
-            elif self.nivel == 1:
-                tiempo_principal = Config.NIVEL_1_TIEMPO_PRINCIPAL
-                penalizacion_maxima = Config.PENALIZACION_MAXIMA
-            else:  # Nivel 2 y 3
-                tiempo_principal = Config.NIVEL_2_TIEMPO_PRINCIPAL
-                penalizacion_maxima = Config.PENALIZACION_MAXIMA
-
-            if tiempo_operacion > tiempo_principal:
-                # Tiempo extra en segundos
-                tiempo_extra = tiempo_operacion - tiempo_principal
-                # Convertir a minutos (redondeando hacia arriba)
-                minutos_extra = int(tiempo_extra / 60)
-                if tiempo_extra % 60 > 0:
-                    minutos_extra += 1
-
-                # Penalización: 1 punto por minuto extra, con máximo según la operación
-                penalizacion_operacion = min(minutos_extra * Config.PENALIZACION_POR_MINUTO, penalizacion_maxima)
-                penalizacion_total += penalizacion_operacion
-
-        tiempo_total = sum(r["tiempo"] for r in self.resultados_operacion.values())
-        nota_final = max(round(nota_base - penalizacion_total, 1), 0)
-        return nota_final, tiempo_total, round(penalizacion_total, 1)
-
-    def _agrupar_resultados_por_operacion(self):
-        """Agrupa resultados"""
-        resultados_agrupados = {}
-        for clave, r in self.resultados_operacion.items():
-            op = r["operacion"]
-            if op not in resultados_agrupados:
-                resultados_agrupados[op] = []
-            resultados_agrupados[op].append(r)
-        return resultados_agrupados
+        return self.sesion.calcular_nota_final()
 
     def reiniciar_aplicativo(self):
         """Reinicia aplicación"""
+        self._borrar_punto_control()
         self._inicializar_variables()
         self.mostrar_pantalla_inicio()
 
@@ -2316,7 +2856,7 @@ class AgilidadMentalApp:
 
     def imprimir_ejercicios(self):
         """Imprime ejercicios en HTML"""
-        if not self.historial_ejercicios:
+        if not self.sesion.historial_ejercicios:
             messagebox.showinfo("📝", "No hay ejercicios")
             return
         html = self._generar_html_ejercicios()
@@ -2335,16 +2875,8 @@ class AgilidadMentalApp:
         self._abrir_archivo_en_navegador(temp_file)
 
     def _generar_html_ejercicios(self):
-        """Genera HTML ejercicios"""
-        ejercicios_por_operacion = {}
-        orden_operaciones = []
-        for ej in self.historial_ejercicios:
-            clave = f"{ej['operacion']}_tabla{ej['tabla']}"
-            if clave not in ejercicios_por_operacion:
-                ejercicios_por_operacion[clave] = {
-                    "operacion": ej["operacion"], "tabla": ej["tabla"], "ejercicios": []}
-                orden_operaciones.append(clave)
-            ejercicios_por_operacion[clave]["ejercicios"].append(ej)
+        """Genera HTML ejercicios (mismos grupos que la ventana de respuestas)"""
+        historial = self.sesion.historial_ejercicios
 
         html = f"""<!DOCTYPE html><html><head><meta charset="UTF-8">
         <title>Ejercicios</title><style>
@@ -2357,21 +2889,22 @@ class AgilidadMentalApp:
         .incorrecto {{color: {Config.COLOR_ROJO_BRILLANTE}; font-weight: bold;}}
         </style></head><body>
         <h1>EJERCICIOS REALIZADOS</h1>
-        <p style="text-align:center;"><strong>Estudiante:</strong> {self.nombre} |
-        <strong>Curso:</strong> {self.curso} | <strong>Fecha:</strong> {self.fecha}</p><hr>"""
+        <p style="text-align:center;"><strong>Estudiante:</strong> {self.sesion.nombre} |
+        <strong>Curso:</strong> {self.sesion.curso} | <strong>Fecha:</strong> {self.sesion.fecha}</p><hr>"""
 
-        for clave in orden_operaciones:
-            grupo = ejercicios_por_operacion[clave]
-            nombre_op = self.obtener_nombre_operacion(grupo["operacion"])
-            html += f"""<h2>{nombre_op} - Tabla {grupo['tabla']}</h2>
+        for operacion, tabla, indices in self.sesion.grupos_historial():
+            nombre_op = self.obtener_nombre_operacion(operacion)
+            html += f"""<h2>{nombre_op} - Tabla {tabla}</h2>
             <table><thead><tr><th>Ejercicio</th><th>Tu respuesta</th>
-            <th>Correcta</th><th>Estado</th></tr></thead><tbody>"""
-            for ej in grupo["ejercicios"]:
-                clase = "correcto" if ej["correcto"] else "incorrecto"
-                estado = "Correcto" if ej["correcto"] else "Incorrecto"
-                resp = ej["respuesta_usuario"] if ej["respuesta_usuario"] else "(vacío)"
-                html += f"""<tr><td>{ej['ejercicio']}</td><td>{resp}</td>
-                <td>{ej['respuesta_correcta']}</td><td class="{clase}">{estado}</td></tr>"""
+            <th>Correcta</th><th>Estado</th><th>Tiempo</th></tr></thead><tbody>"""
+            for i in indices:
+                ej = historial[i]
+                clase = "correcto" if ej.correcto else "incorrecto"
+                estado = "Correcto" if ej.correcto else "Incorrecto"
+                resp = ej.respuesta_usuario if ej.respuesta_usuario else "(vacío)"
+                tiempo = f"{ej.latencia / 1000:.1f} s" if ej.latencia is not None else "-"
+                html += f"""<tr><td>{ej.ejercicio}</td><td>{resp}</td>
+                <td>{ej.respuesta_correcta}</td><td class="{clase}">{estado}</td><td>{tiempo}</td></tr>"""
             html += "</tbody></table>"
         html += "</body></html>"
         return html
@@ -2389,8 +2922,8 @@ class AgilidadMentalApp:
         td {{padding: 10px; border: 1px solid #ddd;}}
         </style></head><body>
         <h1>RESULTADOS - TEST DE AGILIDAD MENTAL</h1>
-        <p style="text-align:center;"><strong>Estudiante:</strong> {self.nombre} |
-        <strong>Curso:</strong> {self.curso} | <strong>Fecha:</strong> {self.fecha}</p>
+        <p style="text-align:center;"><strong>Estudiante:</strong> {self.sesion.nombre} |
+        <strong>Curso:</strong> {self.sesion.curso} | <strong>Fecha:</strong> {self.sesion.fecha}</p>
         <div class="nota">NOTA FINAL: {nota}/100</div>"""
 
         if pen > 0:
@@ -2404,20 +2937,17 @@ class AgilidadMentalApp:
 
     def _generar_filas_tabla_html(self):
         """Genera filas HTML"""
-        resultados_por_operacion = self._agrupar_resultados_por_operacion()
+        resultados = self.sesion.resultados_operacion
         filas = ""
-        for operacion in self.operaciones_nivel:
-            if operacion in resultados_por_operacion:
+        for operacion in self.sesion.operaciones_nivel:
+            totales_op = resultados.totales_operacion(operacion)
+            if totales_op is not None:
                 nombre_op = self.obtener_nombre_operacion(operacion)
-                tablas = resultados_por_operacion[operacion]
-                total_c = sum(t["correctas"] for t in tablas)
-                total_i = sum(t["incorrectas"] for t in tablas)
-                tabla_max = max(t["tabla"] for t in tablas)
-                filas += f"<tr><td><strong>{nombre_op}</strong></td><td><strong>{tabla_max}</strong></td>"
-                filas += f"<td><strong>{total_c}</strong></td><td><strong>{total_i}</strong></td></tr>"
-
-        total_c = sum(r["correctas"] for r in self.resultados_operacion.values())
-        total_i = sum(r["incorrectas"] for r in self.resultados_operacion.values())
+                filas += f"<tr><td><strong>{nombre_op}</strong></td><td><strong>{totales_op.tabla_max}</strong></td>"
+                filas += f"<td><strong>{totales_op.correctas}</strong></td><td><strong>{totales_op.incorrectas}</strong></td></tr>"
+
+        total_c = resultados.correctas_total
+        total_i = resultados.incorrectas_total
         filas += f"""<tr style="background-color:#c8e6c9;"><td colspan="2"><strong>TOTAL</strong></td>
         <td><strong>{total_c}</strong></td><td><strong>{total_i}</strong></td></tr>"""
         return filas
@@ -2442,4 +2972,5 @@ if __name__ == "__main__":
     root = ctk.CTk()
     root.iconbitmap(resource_path("logo.ico"))
     app = AgilidadMentalApp(root)
+    root.protocol("WM_DELETE_WINDOW", app.cerrar)
     root.mainloop()
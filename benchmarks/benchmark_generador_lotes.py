@@ -0,0 +1,65 @@
+"""Compara el generador vectorizado de lotes con el generador por ejercicio
+
+Uso: python benchmarks/benchmark_generador_lotes.py [--estudiantes 1200] [--nivel 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ejercicios import _generar_tabla, generar_ejercicios, plan_completo  # noqa: E402
+from generador_lotes import generar_lote  # noqa: E402
+from motor_sesion import OPERACIONES_POR_NIVEL  # noqa: E402
+
+
+def _medir(funcion, repeticiones):
+    """Retorna el mejor tiempo (s) de varias repeticiones"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--estudiantes", type=int, default=1200)
+    parser.add_argument("--nivel", type=int, choices=[1, 2, 3], default=3)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    plan = plan_completo(OPERACIONES_POR_NIVEL[args.nivel])
+    n = args.estudiantes
+
+    def sin_banco():
+        # Como antes del banco: se construyen los ejercicios en cada tabla
+        for _ in range(n):
+            for operacion, tabla in plan:
+                ejercicios = list(_generar_tabla(operacion, tabla))
+                random.shuffle(ejercicios)
+
+    def por_banco():
+        for _ in range(n):
+            for operacion, tabla in plan:
+                generar_ejercicios(operacion, tabla)
+
+    def por_lote():
+        generar_lote(n, plan, semilla=0)
+
+    print(f"{n} estudiantes × {len(plan)} tablas (nivel {args.nivel})")
+    resultados = [
+        ("sin banco", _medir(sin_banco, args.repeticiones)),
+        ("banco + shuffle", _medir(por_banco, args.repeticiones)),
+        ("lote NumPy", _medir(por_lote, args.repeticiones)),
+    ]
+    base = resultados[0][1]
+    for nombre, segundos in resultados:
+        print(f"  {nombre:<16} {segundos * 1000:9.1f} ms   x{base / segundos:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Mide la memoria del historial de ejercicios: filas dict (antes) contra registros compactos
+
+Uso: python benchmarks/benchmark_memoria_historial.py [--corridas 20]
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ejercicios import obtener_banco_ejercicios  # noqa: E402
+from motor_sesion import simular_sesion  # noqa: E402
+
+LIMITES_NIVEL_3 = {
+    "suma": 12, "resta": 12, "multiplicación": 12,
+    "división": 12, "potencia": 3, "raiz": 3
+}
+
+
+def _responder(ej):
+    """Estudiante simulado que falla uno de cada siete ejercicios"""
+    return str(ej.respuesta + (1 if ej.num % 7 == 3 else 0))
+
+
+def _filas_dict(sesion):
+    """Reconstruye el historial como las filas dict de seis campos de antes"""
+    return [{
+        "operacion": r.operacion,
+        "tabla": r.tabla,
+        "ejercicio": r.ejercicio,
+        "respuesta_correcta": r.respuesta_correcta,
+        # Antes cada fila guardaba su propia copia de lo leído del entry
+        "respuesta_usuario": r.respuesta_usuario.encode().decode(),
+        "correcto": r.correcto
+    } for r in sesion.historial_ejercicios]
+
+
+def _medir(funcion):
+    """Retorna (resultado, bytes que siguen vivos tras crearlo)"""
+    tracemalloc.start()
+    resultado = funcion()
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, actual
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corridas", type=int, default=20)
+    args = parser.parse_args()
+
+    # El banco es único por proceso: se construye antes de medir
+    obtener_banco_ejercicios("suma", 1)
+
+    sesiones, despues = _medir(lambda: [
+        simular_sesion(3, LIMITES_NIVEL_3, _responder) for _ in range(args.corridas)
+    ])
+    filas, antes = _medir(lambda: [_filas_dict(s) for s in sesiones])
+
+    total_filas = sum(len(f) for f in filas)
+    print(f"{args.corridas} corridas nivel 3 hasta la tabla 12: {total_filas} filas de historial")
+    print(f"  filas dict (antes)      {antes / 1024:9.1f} KiB  {antes / total_filas:6.1f} B/fila")
+    print(f"  sesiones compactas      {despues / 1024:9.1f} KiB  {despues / total_filas:6.1f} B/fila")
+    print(f"  ahorro                  x{antes / despues:.1f}")
+
+
+if __name__ == "__main__":
+    main()
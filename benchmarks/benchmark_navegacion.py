@@ -0,0 +1,65 @@
+"""Mide cuánto tarda cada navegación entre pantallas estáticas: sin caché (antes) y con caché
+
+Uso: python benchmarks/benchmark_navegacion.py [--vueltas 20]
+
+Necesita customtkinter y una pantalla (en Linux sin escritorio: xvfb-run).
+Cada vuelta recorre inicio -> datos -> preparación; el tiempo incluye la
+geometría pendiente (update_idletasks), como en Config.MEDIR_NAVEGACION.
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import customtkinter as ctk  # noqa: E402
+
+from agilidad_mental import AgilidadMentalApp, Config  # noqa: E402
+
+
+def _recorrer(app, vueltas):
+    """Navega las pantallas estáticas y retorna los ms de cada visita por pantalla"""
+    app.tiempos_navegacion.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(vueltas):
+            app.sesion.seleccionar_nivel(2)
+            app.mostrar_pantalla_inicio()
+            app.mostrar_pantalla_datos()
+            app.sesion.iniciar_estudiante("Benchmark", "Quinto", app.sesion.fecha)
+            app.sesion.continuar_siguiente_operacion("multiplicación")
+            app.sesion.fijar_limite_tabla(9)
+            app.sesion.preparar_tabla()
+            app.mostrar_pantalla_preparacion()
+    return {clave: list(tiempos) for clave, tiempos in app.tiempos_navegacion.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vueltas", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.setdefault("AGILIDAD_RMMATH_DATOS", tempfile.mkdtemp(prefix="rmmath_bench_"))
+    Config.MEDIR_NAVEGACION = True
+    root = ctk.CTk()
+    app = AgilidadMentalApp(root)
+
+    print(f"{'pantalla':<28}{'sin caché':>12}{'con caché':>12}{'1.ª visita':>12}")
+    resultados = {}
+    for cache in (False, True):
+        Config.CACHE_PANTALLAS = cache
+        app._pantallas.clear()
+        resultados[cache] = _recorrer(app, args.vueltas)
+
+    for clave, antes in resultados[False].items():
+        despues = resultados[True][clave]
+        print(f"{clave:<28}{statistics.median(antes):>10.1f} ms"
+              f"{statistics.median(despues[1:] or despues):>10.1f} ms{despues[0]:>10.1f} ms")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
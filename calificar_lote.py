@@ -0,0 +1,265 @@
+"""Califica por lotes las hojas en papel transcritas a CSV (requiere NumPy)
+
+Uso: python calificar_lote.py respuestas.csv [--salida notas.csv] [--semilla-base 0]
+     [--politica reglas.json]
+
+Cada fila es una hoja de una tabla, en el orden en que se imprimió con
+hojas_trabajo.py:
+
+    nombre,curso,fecha,nivel,operacion,tabla,tiempo,r1,r2,...
+
+tiempo son los segundos usados en la operación (acumulados, como en el
+aplicativo). Las filas de un mismo estudiante deben ir seguidas. La salida
+tiene una fila por estudiante con aciertos, penalización y nota, calculados
+con las mismas reglas del test (es_respuesta_correcta, la política de
+penalización y calcular_nota); su tiempo es la suma del tiempo de cada
+hoja, igual que el tiempo total de SesionAgilidad.calcular_nota_final. Las
+filas con nivel, operación, tabla o tiempo inválidos se omiten y se
+informan con su número de línea.
+"""
+import argparse
+import csv
+import math
+import sys
+import time
+
+from ejercicios import (
+    CODIGOS_OPERACIONES,
+    normalizar_respuesta,
+    obtener_tabla_maxima,
+    obtener_tabla_minima,
+    semilla_tabla,
+)
+from generador_lotes import NUMPY_AVAILABLE, generar_lote
+from motor_sesion import OPERACIONES_POR_NIVEL
+from penalizacion import POLITICA_POR_DEFECTO, PoliticaPenalizacion, calcular_nota
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+FILAS_POR_BLOQUE = 4096
+COLUMNAS_FIJAS = 7
+ENCABEZADO_SALIDA = ["nombre", "curso", "fecha", "nivel", "tablas", "correctas", "incorrectas",
+                     "preguntas", "penalizacion", "tiempo", "nota"]
+_INVALIDA = -(1 << 62)  # Marca de respuesta vacía o no numérica (nunca es una respuesta)
+
+
+def _claves_bloque(filas, semilla_base):
+    """Respuestas correctas de cada fila en el orden de su hoja: lista de arreglos 1-D
+
+    Las filas de una misma (operación, tabla) se resuelven juntas con un solo
+    generar_lote, cada una con la semilla de su estudiante.
+    """
+    grupos = {}
+    for i, fila in enumerate(filas):
+        grupos.setdefault((fila[4], int(fila[5])), []).append(i)
+
+    claves = [None] * len(filas)
+    for (operacion, tabla), indices in grupos.items():
+        semillas = np.array([
+            semilla_tabla(filas[i][0], filas[i][1], filas[i][2], operacion, tabla, semilla_base)
+            for i in indices
+        ], dtype=np.uint64)[:, None]
+        lote = generar_lote(len(indices), [(operacion, tabla)], semillas=semillas)
+        respuestas = lote.respuestas_ordenadas(0)
+        for fila_lote, i in enumerate(indices):
+            claves[i] = respuestas[fila_lote]
+    return claves
+
+
+def _leer_respuestas(textos):
+    """Convierte una matriz de textos en enteros (_INVALIDA si no es número), por columnas
+
+    Lo común (dígitos con signo y espacios opcionales) se convierte con NumPy
+    en bloque; lo raro que int() también acepta ("1_000") se corrige celda a
+    celda con normalizar_respuesta, la misma regla del aplicativo.
+    """
+    limpios = np.char.strip(textos)
+    cuerpos = np.char.lstrip(limpios, "+-")
+    largos = np.char.str_len(cuerpos)
+    signos = np.char.str_len(limpios) - largos
+    # Hasta 18 dígitos cabe en int64; un número más largo nunca es una respuesta
+    validos = np.char.isdecimal(cuerpos) & (signos <= 1) & (largos > 0) & (largos <= 18)
+    valores = np.where(validos, cuerpos, "0").astype(np.int64)
+    valores = np.where(np.char.startswith(limpios, "-"), -valores, valores)
+    valores[~validos] = _INVALIDA
+
+    for i, j in zip(*np.nonzero(~validos & (largos > 0))):
+        valor = normalizar_respuesta(str(textos[i, j]))
+        if valor is not None and -(1 << 62) < valor < (1 << 62):
+            valores[i, j] = valor
+    return valores
+
+
+def _calificar_bloque(filas, semilla_base):
+    """Retorna (correctas, preguntas) por fila, comparando todo el bloque de una vez"""
+    claves = _claves_bloque(filas, semilla_base)
+    preguntas = np.array([len(c) for c in claves], dtype=np.int64)
+    ancho = int(preguntas.max())
+
+    esperadas = np.full((len(filas), ancho), _INVALIDA, dtype=np.int64)
+    for i, clave in enumerate(claves):
+        esperadas[i, :len(clave)] = clave
+    # Las celdas que sobran de cada hoja quedan vacías (y no cuentan)
+    textos = np.array([
+        (fila[COLUMNAS_FIJAS:COLUMNAS_FIJAS + n] + [""] * ancho)[:ancho]
+        for fila, n in zip(filas, preguntas.tolist())
+    ], dtype=str).reshape(len(filas), ancho)
+    escritas = _leer_respuestas(textos)
+
+    correctas = ((escritas == esperadas) & (esperadas != _INVALIDA)).sum(axis=1)
+    return correctas.astype(np.int64), preguntas
+
+
+class _AcumuladoEstudiante:
+    """Totales del estudiante en curso (las filas de cada estudiante van seguidas)"""
+
+    def __init__(self, fila):
+        self.clave = tuple(fila[:4])
+        self.tablas = 0
+        self.correctas = 0
+        self.preguntas = 0
+        self.penalizacion = 0
+        self.tiempo = 0
+
+    def sumar(self, correctas, preguntas, penalizacion, tiempo):
+        self.tablas += 1
+        self.correctas += correctas
+        self.preguntas += preguntas
+        self.penalizacion += penalizacion
+        self.tiempo += tiempo
+
+    def fila_salida(self):
+        nota, penalizacion = calcular_nota(self.correctas, self.preguntas, self.penalizacion)
+        return [*self.clave, self.tablas, self.correctas, self.preguntas - self.correctas,
+                self.preguntas, penalizacion, self.tiempo, nota]
+
+
+def calificar_archivo(entrada, salida, semilla_base=0, politica=POLITICA_POR_DEFECTO, omitidas=None):
+    """Califica el CSV por bloques de filas; retorna (filas, estudiantes)
+
+    omitidas: lista opcional donde se anota (línea, motivo) de cada fila inválida.
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("Para calificar lotes instala: pip install numpy")
+
+    lector = csv.reader(entrada)
+    escritor = csv.writer(salida)
+    escritor.writerow(ENCABEZADO_SALIDA)
+    actual = None
+    total_filas = 0
+    estudiantes = 0
+
+    bloque = []
+    for fila in _filas_validas(lector, omitidas if omitidas is not None else []):
+        bloque.append(fila)
+        if len(bloque) < FILAS_POR_BLOQUE:
+            continue
+        actual, n = _procesar_bloque(bloque, actual, escritor, semilla_base, politica)
+        estudiantes += n
+        total_filas += len(bloque)
+        bloque = []
+    if bloque:
+        actual, n = _procesar_bloque(bloque, actual, escritor, semilla_base, politica)
+        estudiantes += n
+        total_filas += len(bloque)
+    if actual is not None:
+        escritor.writerow(actual.fila_salida())
+        estudiantes += 1
+    return total_filas, estudiantes
+
+
+def _filas_validas(lector, omitidas):
+    for fila in lector:
+        if not any(c.strip() for c in fila):
+            continue  # Línea en blanco
+        if fila[0].strip().casefold() == "nombre":
+            continue  # Encabezado
+        fila = [c.strip() for c in fila]
+        motivo = _motivo_fila_invalida(fila)
+        if motivo is not None:
+            omitidas.append((lector.line_num, motivo))
+            continue
+        yield fila
+
+
+def _motivo_fila_invalida(fila):
+    """Retorna por qué la fila no se puede calificar, o None si es válida"""
+    if len(fila) < COLUMNAS_FIJAS:
+        return f"faltan columnas (hay {len(fila)}, se esperan al menos {COLUMNAS_FIJAS})"
+    if not fila[0]:
+        return "falta el nombre"
+    try:
+        nivel = int(fila[3])
+    except ValueError:
+        return f"nivel inválido: {fila[3]!r}"
+    if nivel not in OPERACIONES_POR_NIVEL:
+        return f"nivel inexistente: {nivel}"
+    operacion = fila[4]
+    if operacion not in OPERACIONES_POR_NIVEL[nivel]:
+        return f"operación {operacion!r} no existe en el nivel {nivel}"
+    try:
+        tabla = int(fila[5])
+    except ValueError:
+        return f"tabla inválida: {fila[5]!r}"
+    minima, maxima = obtener_tabla_minima(operacion), obtener_tabla_maxima(operacion, nivel)
+    if not minima <= tabla <= maxima:
+        return f"tabla {tabla} fuera del rango de {operacion} en el nivel {nivel} ({minima} a {maxima})"
+    try:
+        tiempo = float(fila[6] or 0)
+    except ValueError:
+        return f"tiempo inválido: {fila[6]!r}"
+    if not math.isfinite(tiempo) or tiempo < 0:
+        return f"tiempo inválido: {fila[6]!r}"
+    return None
+
+
+def _procesar_bloque(bloque, actual, escritor, semilla_base, politica):
+    """Califica un bloque y escribe los estudiantes que terminaron en él"""
+    correctas, preguntas = _calificar_bloque(bloque, semilla_base)
+    niveles = np.array([int(fila[3]) for fila in bloque], dtype=np.int64)
+    codigos = np.array([CODIGOS_OPERACIONES[fila[4]] for fila in bloque], dtype=np.int64)
+    tiempos = np.array([float(fila[6] or 0) for fila in bloque])
+    penalizaciones = politica.penalizaciones(niveles, codigos, tiempos)
+
+    terminados = 0
+    for fila, c, n, p, t in zip(bloque, correctas.tolist(), preguntas.tolist(),
+                                penalizaciones.tolist(), tiempos.tolist()):
+        if actual is None or tuple(fila[:4]) != actual.clave:
+            if actual is not None:
+                escritor.writerow(actual.fila_salida())
+                terminados += 1
+            actual = _AcumuladoEstudiante(fila)
+        actual.sumar(c, n, p, t)
+    return actual, terminados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("respuestas", help="CSV con una hoja (tabla) por fila")
+    parser.add_argument("--salida", default="-", help="CSV de notas (por defecto, la consola)")
+    parser.add_argument("--semilla-base", type=int, default=0,
+                        help="la misma usada al imprimir las hojas")
+    parser.add_argument("--politica", default=None,
+                        help="JSON con reglas de penalización (por defecto, las vigentes)")
+    args = parser.parse_args()
+    politica = PoliticaPenalizacion.desde_json(args.politica) if args.politica else POLITICA_POR_DEFECTO
+
+    inicio = time.perf_counter()
+    omitidas = []
+    with open(args.respuestas, newline="", encoding="utf-8-sig") as entrada:
+        if args.salida == "-":
+            filas, estudiantes = calificar_archivo(entrada, sys.stdout, args.semilla_base, politica, omitidas)
+        else:
+            with open(args.salida, "w", newline="", encoding="utf-8") as salida:
+                filas, estudiantes = calificar_archivo(entrada, salida, args.semilla_base, politica, omitidas)
+    segundos = time.perf_counter() - inicio
+    for linea, motivo in omitidas:
+        print(f"{args.respuestas}:{linea}: fila omitida, {motivo}", file=sys.stderr)
+    print(f"{filas} hojas de {estudiantes} estudiantes calificadas en {segundos:.2f} s "
+          f"({filas / segundos if segundos else 0:.0f} hojas/s)"
+          + (f"; {len(omitidas)} filas omitidas" if omitidas else ""), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
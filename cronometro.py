@@ -0,0 +1,84 @@
+"""Cronómetro de la operación sobre un reloj monotónico, sin deriva"""
+import math
+import time
+
+
+def formato_mm_ss(segundos):
+    """Texto "MM:SS" que muestra el cronómetro"""
+    return f"{int(segundos // 60):02d}:{int(segundos % 60):02d}"
+
+
+class Cronometro:
+    """Tiempo acumulado de una operación medido con time.monotonic
+
+    El reloj monotónico no retrocede ni salta si el sistema ajusta la hora
+    (p. ej. una sincronización NTP), así que el tiempo que se penaliza es el
+    que realmente pasó. El refresco de pantalla se agenda al próximo segundo
+    entero del tiempo transcurrido: el retraso de un tic no se acumula.
+    """
+
+    __slots__ = ("acumulado", "_inicio", "_reloj")
+
+    def __init__(self, reloj=time.monotonic):
+        self.acumulado = 0.0  # Segundos de tramos anteriores (tablas previas de la operación)
+        self._inicio = None
+        self._reloj = reloj
+
+    @property
+    def corriendo(self):
+        return self._inicio is not None
+
+    def iniciar(self, acumulado=0):
+        """Arranca (o reanuda) desde `acumulado` segundos"""
+        self.acumulado = float(acumulado)
+        self._inicio = self._reloj()
+
+    def detener(self):
+        """Detiene el cronómetro y retorna los segundos transcurridos"""
+        if self._inicio is not None:
+            self.acumulado += self._reloj() - self._inicio
+            self._inicio = None
+        return self.acumulado
+
+    def transcurrido(self):
+        """Segundos transcurridos (incluye el tramo en curso)"""
+        if self._inicio is None:
+            return self.acumulado
+        return self.acumulado + (self._reloj() - self._inicio)
+
+    def restante(self, limite):
+        """Segundos que faltan para `limite` (0 si ya se alcanzó)"""
+        return max(limite - self.transcurrido(), 0.0)
+
+    def ms_hasta_proximo_segundo(self):
+        """Milisegundos hasta que el tiempo transcurrido cruce el próximo segundo entero"""
+        transcurrido = self.transcurrido()
+        return max(1, math.ceil((math.floor(transcurrido) + 1 - transcurrido) * 1000))
+
+    def ms_hasta_proximo_tic(self, limite=None):
+        """Espera del próximo tic: el próximo segundo entero, o `limite` si no se muestra
+
+        Con la ventana minimizada no hay nada que repintar: basta un aviso
+        cuando el tiempo transcurrido llegue al límite.
+        """
+        if limite is not None:
+            return max(1, math.ceil(self.restante(limite) * 1000))
+        return self.ms_hasta_proximo_segundo()
+
+
+class PantallaCronometro:
+    """Lo que el cronómetro tiene pintado, para repintar solo lo que cambia"""
+
+    __slots__ = ("texto", "tiempo_extra")
+
+    def __init__(self, texto="", tiempo_extra=False):
+        self.texto = texto
+        self.tiempo_extra = tiempo_extra
+
+    def cambios(self, segundos, tiempo_extra):
+        """Anota el nuevo estado; retorna (texto si cambió o None, True si recién entra en tiempo extra)"""
+        texto = formato_mm_ss(segundos)
+        nuevo_texto = texto if texto != self.texto else None
+        entra_en_extra = tiempo_extra and not self.tiempo_extra
+        self.texto, self.tiempo_extra = texto, tiempo_extra
+        return nuevo_texto, entra_en_extra
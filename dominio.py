@@ -0,0 +1,233 @@
+"""Índice de dominio por hecho y cola de los hechos más débiles (práctica adaptativa)"""
+import heapq
+import os
+import random
+
+from ejercicios import CODIGOS_OPERACIONES, OPERACIONES, derivar_semilla, obtener_banco_ejercicios
+from persistencia import archivo_estudiante, escribir_atomico
+
+
+def clave_hecho(ejercicio):
+    """Clave estable de un hecho: (código de operación, tabla, num)"""
+    return (ejercicio.codigo, ejercicio.tabla, ejercicio.num)
+
+
+def ejercicio_de_clave(clave):
+    """Retorna el ejercicio del banco de una clave (operación por nombre o código)"""
+    operacion, tabla, num = clave
+    if operacion in CODIGOS_OPERACIONES:
+        operacion = CODIGOS_OPERACIONES[operacion]
+    banco = obtener_banco_ejercicios(OPERACIONES[operacion], tabla)
+    return banco[num]  # En el banco el id de cada ejercicio es su num
+
+
+def semilla_dominio(nombre, curso, semilla_base=0):
+    """Semilla de los desempates del índice de un estudiante (misma práctica en cualquier equipo)"""
+    return derivar_semilla(semilla_base, nombre, curso, "dominio")
+
+
+class EstadoHecho:
+    """Intentos, errores y última latencia de un hecho (p. ej. 7 × 8)"""
+
+    __slots__ = ("ejercicio", "intentos", "errores", "ultima_latencia", "desempate", "version")
+
+    def __init__(self, ejercicio, desempate):
+        self.ejercicio = ejercicio
+        self.intentos = 0
+        self.errores = 0
+        self.ultima_latencia = None
+        self.desempate = desempate
+        self.version = 0
+
+    @property
+    def debilidad(self):
+        """Tasa de error suavizada: 0.5 sin intentos, tiende a errores/intentos"""
+        return (self.errores + 1) / (self.intentos + 2)
+
+
+class _ColaHechos:
+    """Heap con invalidación perezosa de los hechos de un pool (o de todos, sin pool)"""
+
+    __slots__ = ("pool", "heap", "hechos")
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.heap = []
+        self.hechos = 0  # Hechos del pool con estado (entradas vigentes del heap)
+
+    def acepta(self, ejercicio):
+        return self.pool is None or ejercicio in self.pool
+
+
+class IndiceDominio:
+    """Dominio por hecho con una cola de prioridad de los más débiles por pool
+
+    Cada pool (examen de un nivel hasta cierta tabla) tiene su propio heap con
+    invalidación perezosa: al registrar un intento se agrega una entrada nueva
+    (O(log n)) en los heaps de los pools que contienen el hecho y la anterior
+    queda obsoleta por su versión. Un heap se compacta cuando sus obsoletas
+    superan a las vigentes (O(n), amortizado), así que elegir cada ejercicio
+    cuesta O(log n) aunque el índice tenga años de intentos de otros niveles.
+
+    Con ruta, los cambios se guardan como registro solo de anexos
+    "código,tabla,num,intentos,errores,latencia" (ver repaso.ColaRepaso).
+    """
+
+    def __init__(self, semilla=None, ruta=None):
+        self.estados = {}  # clave -> EstadoHecho
+        self._colas = {}  # plan del pool (None: todos los hechos) -> _ColaHechos
+        self._azar = random.Random(semilla)
+        self.ruta = ruta
+        self._pendientes = []
+        self._lineas = 0
+        self._linea_cortada = False
+
+    def __len__(self):
+        return len(self.estados)
+
+    def __contains__(self, clave):
+        return clave in self.estados
+
+    @classmethod
+    def de_estudiante(cls, nombre, curso, semilla_base=0):
+        """Carga el índice guardado del estudiante (vacío si aún no tiene)"""
+        indice = cls(semilla_dominio(nombre, curso, semilla_base),
+                     archivo_estudiante("dominio", nombre, curso, ".log"))
+        indice.cargar()
+        return indice
+
+    def _entrada(self, clave, estado):
+        # Más débil primero; a igual debilidad, el más lento y luego al azar
+        return (-estado.debilidad, -(estado.ultima_latencia or 0), estado.desempate,
+                estado.version, clave)
+
+    def _estado(self, ejercicio):
+        clave = clave_hecho(ejercicio)
+        estado = self.estados.get(clave)
+        if estado is None:
+            estado = self.estados[clave] = EstadoHecho(ejercicio, self._azar.random())
+            self._encolar(clave, estado, nuevo=True)
+        return clave, estado
+
+    def _encolar(self, clave, estado, nuevo=False):
+        """Agrega la entrada vigente del hecho a los heaps de los pools que lo contienen"""
+        entrada = self._entrada(clave, estado)
+        for cola in self._colas.values():
+            if cola.acepta(estado.ejercicio):
+                heapq.heappush(cola.heap, entrada)
+                if nuevo:
+                    cola.hechos += 1
+                elif len(cola.heap) > 2 * cola.hechos + 64:
+                    self._compactar(cola)
+
+    def _compactar(self, cola):
+        """Descarta las entradas obsoletas del heap (las vigentes ya están en él)"""
+        cola.heap = [entrada for entrada in cola.heap
+                     if entrada[3] == self.estados[entrada[-1]].version]
+        heapq.heapify(cola.heap)
+
+    def _cola(self, pool):
+        """Retorna el heap del pool, armándolo en O(n) la primera vez"""
+        plan = None if pool is None else pool.plan
+        cola = self._colas.get(plan)
+        if cola is None:
+            cola = self._colas[plan] = _ColaHechos(pool)
+            cola.heap = [self._entrada(clave, estado) for clave, estado in self.estados.items()
+                         if cola.acepta(estado.ejercicio)]
+            cola.hechos = len(cola.heap)
+            heapq.heapify(cola.heap)
+        return cola
+
+    def incluir(self, ejercicios):
+        """Agrega a la cola los hechos que aún no tienen intentos"""
+        for ejercicio in ejercicios:
+            self._estado(ejercicio)
+
+    def registrar(self, ejercicio, correcto, latencia=None):
+        """Registra un intento del hecho y actualiza su prioridad"""
+        clave, estado = self._estado(ejercicio)
+        estado.intentos += 1
+        if not correcto:
+            estado.errores += 1
+        if latencia is not None:
+            estado.ultima_latencia = latencia
+        estado.version += 1
+        self._encolar(clave, estado)
+        if self.ruta:
+            self._pendientes.append(self._linea(clave, estado))
+
+    def seleccionar(self, cantidad, pool=None):
+        """Retorna hasta `cantidad` ejercicios del pool, del más débil al más fuerte
+
+        pool: PoolEjercicios opcional (sin él se elige entre todos los hechos).
+        Los hechos elegidos vuelven al heap: la cola no cambia.
+        """
+        heap = self._cola(pool).heap
+        elegidos = []
+        apartados = []
+        while heap and len(elegidos) < cantidad:
+            entrada = heapq.heappop(heap)
+            estado = self.estados[entrada[-1]]
+            if entrada[3] != estado.version:
+                continue  # Entrada obsoleta: se descarta
+            apartados.append(entrada)
+            elegidos.append(estado.ejercicio)
+        for entrada in apartados:
+            heapq.heappush(heap, entrada)
+        return elegidos
+
+    # ==================== ARCHIVO ====================
+    @staticmethod
+    def _linea(clave, estado):
+        latencia = "" if estado.ultima_latencia is None else estado.ultima_latencia
+        return f"{clave[0]},{clave[1]},{clave[2]},{estado.intentos},{estado.errores},{latencia}\n"
+
+    def cargar(self):
+        """Lee el registro del disco (la última línea de cada hecho gana)"""
+        if not self.ruta or not os.path.exists(self.ruta):
+            return
+        with open(self.ruta, encoding="utf-8") as f:
+            for linea in f:
+                if not linea.endswith("\n"):
+                    self._linea_cortada = True  # Cierre abrupto a mitad de la línea
+                    continue
+                try:
+                    codigo, tabla, num, intentos, errores, latencia = linea.rstrip("\n").split(",")
+                    clave = (int(codigo), int(tabla), int(num))
+                    ejercicio = ejercicio_de_clave(clave)
+                    intentos, errores = int(intentos), int(errores)
+                    latencia = float(latencia) if latencia else None
+                except (ValueError, KeyError, IndexError):
+                    continue  # Línea dañada: se ignora
+                self._lineas += 1
+                estado = self.estados.get(clave)
+                if estado is None:
+                    estado = self.estados[clave] = EstadoHecho(ejercicio, self._azar.random())
+                estado.intentos, estado.errores, estado.ultima_latencia = intentos, errores, latencia
+        self._colas = {}  # Los heaps se arman con los estados cargados al pedirlos
+
+    def guardar(self):
+        """Anexa al archivo los cambios pendientes (o lo compacta si creció mucho)"""
+        if not self.ruta or not self._pendientes:
+            return
+        self._lineas += len(self._pendientes)
+        if self._lineas > 2 * len(self.estados) + 256:
+            escribir_atomico(self.ruta, "".join(
+                self._linea(clave, estado) for clave, estado in self.estados.items() if estado.intentos
+            ))
+            self._lineas = len(self.estados)
+        else:
+            with open(self.ruta, "a", encoding="utf-8") as f:
+                if self._linea_cortada:
+                    f.write("\n")
+                    self._linea_cortada = False
+                f.writelines(self._pendientes)
+        self._pendientes = []
+
+    @classmethod
+    def desde_historial(cls, historial, semilla=None):
+        """Construye el índice a partir de filas RegistroHistorial"""
+        indice = cls(semilla)
+        for registro in historial:
+            indice.registrar(registro.ejercicio_banco, registro.correcto, registro.latencia)
+        return indice
@@ -0,0 +1,310 @@
+"""Reglas y banco de ejercicios de Agilidad RMmath (sin dependencias de interfaz)"""
+import hashlib
+import random
+
+
+# ==================== REGLAS Y CONSTANTES ====================
+class ConfigEjercicios:
+    """Reglas de generación, tiempos y penalización - independientes de la interfaz"""
+
+    # Tiempos por nivel
+    NIVEL_1_TIEMPO_PRINCIPAL = 12 * 60
+    NIVEL_1_TIEMPO_MAXIMO = 15 * 60
+    NIVEL_2_TIEMPO_PRINCIPAL = 10 * 60
+    NIVEL_2_TIEMPO_MAXIMO = 12 * 60
+    NIVEL_3_TIEMPO_PRINCIPAL = 10 * 60
+    NIVEL_3_TIEMPO_MAXIMO = 12 * 60
+
+    # Tiempos especiales para potenciación y radicación
+    POTENCIA_RAIZ_TIEMPO_PRINCIPAL = 3 * 60
+    POTENCIA_RAIZ_TIEMPO_MAXIMO = 5 * 60
+
+    # Ejercicios y penalización
+    EJERCICIOS_POR_TABLA = 13
+    MAX_INTENTOS_GENERACION = 1000
+    PENALIZACION_POR_MINUTO = 1  # 1 punto por cada minuto extra
+    PENALIZACION_MAXIMA = 3  # Máximo 3 puntos (3 minutos extra)
+
+    # Rango de tablas disponibles en el selector
+    TABLA_MAXIMA = 12
+    TABLA_MAXIMA_POTENCIA_RAIZ = 3
+
+    # Rangos extendidos para los cursos superiores (tabla máxima por operación)
+    NIVELES_RANGO_EXTENDIDO = (3,)
+    RANGOS_EXTENDIDOS = {
+        "multiplicación": 100,
+        "división": 100,
+        "potencia": 10,
+        "raiz": 10
+    }
+
+    # Examen mixto: ejercicios sorteados de todas las operaciones y tablas del nivel
+    EXAMEN_MIXTO_MIN = 10
+    EXAMEN_MIXTO_MAX = 500
+    EXAMEN_MIXTO_POR_DEFECTO = 50
+
+    # Operaciones
+    NOMBRES_OPERACIONES = {
+        "suma": "Suma",
+        "resta": "Resta",
+        "multiplicación": "Multiplicación",
+        "división": "División",
+        "potencia": "Potenciación",
+        "raiz": "Radicación"
+    }
+
+
+def obtener_tabla_minima(operacion):
+    """Retorna tabla mínima por operación"""
+    return 2 if operacion in ["multiplicación", "división", "potencia", "raiz"] else 1
+
+
+def obtener_tabla_maxima(operacion, nivel=None):
+    """Retorna tabla máxima por operación (rango extendido en los niveles superiores)"""
+    if nivel in ConfigEjercicios.NIVELES_RANGO_EXTENDIDO and operacion in ConfigEjercicios.RANGOS_EXTENDIDOS:
+        return ConfigEjercicios.RANGOS_EXTENDIDOS[operacion]
+    if operacion in ["potencia", "raiz"]:
+        return ConfigEjercicios.TABLA_MAXIMA_POTENCIA_RAIZ
+    return ConfigEjercicios.TABLA_MAXIMA
+
+
+def plan_completo(operaciones, tabla_max=None, nivel=None):
+    """Retorna la lista de (operación, tabla) desde la tabla mínima hasta tabla_max"""
+    plan = []
+    for operacion in operaciones:
+        ultima = obtener_tabla_maxima(operacion, nivel)
+        if tabla_max is not None:
+            ultima = min(ultima, tabla_max)
+        for tabla in range(obtener_tabla_minima(operacion), ultima + 1):
+            plan.append((operacion, tabla))
+    return plan
+
+
+# ==================== EJERCICIOS ====================
+# Pseudo-operaciones del examen mixto, la práctica adaptativa y el repaso (no
+# tienen ejercicios propios en el banco: toman los de todas las operaciones)
+OPERACION_MIXTA = "mixto"
+OPERACION_ADAPTATIVA = "adaptativo"
+OPERACION_REPASO = "repaso"
+
+# Código numérico internado de cada operación (orden de NOMBRES_OPERACIONES)
+OPERACIONES = tuple(ConfigEjercicios.NOMBRES_OPERACIONES) + (
+    OPERACION_MIXTA, OPERACION_ADAPTATIVA, OPERACION_REPASO
+)
+CODIGOS_OPERACIONES = {op: i for i, op in enumerate(OPERACIONES)}
+
+# Índices de raíz mayores que 4 se escriben como superíndice (⁵√, ¹⁰√)
+_SUPERINDICES = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+
+def calcular_respuesta(operacion, tabla, num):
+    """Retorna la respuesta correcta del ejercicio (operación, tabla, num)"""
+    if operacion == "suma":
+        return tabla + num
+    elif operacion == "resta":
+        return tabla - num
+    elif operacion == "multiplicación":
+        return tabla * num
+    elif operacion == "potencia":
+        return num ** tabla
+    # División y raíz: la respuesta es el número de la tabla
+    return num
+
+
+def texto_ejercicio(operacion, tabla, num):
+    """Retorna el texto que se muestra para el ejercicio (operación, tabla, num)"""
+    if operacion == "suma":
+        return f"{tabla} + {num} ="
+    elif operacion == "resta":
+        return f"{tabla} - {num} ="
+    elif operacion == "multiplicación":
+        return f"{tabla} × {num} ="
+    elif operacion == "división":
+        return f"{tabla * num} ÷ {tabla} ="
+    elif operacion == "potencia":
+        return f"{num}^{tabla} ="
+    radicando = num ** tabla  # Potencia perfecta por construcción
+    if tabla == 2:
+        return f"√{radicando} ="
+    elif tabla == 3:
+        return f"∛{radicando} ="
+    elif tabla == 4:
+        return f"∜{radicando} ="
+    return f"{str(tabla).translate(_SUPERINDICES)}√{radicando} ="
+
+
+def normalizar_respuesta(texto):
+    """Convierte lo escrito en un entero ("  12", "+12", "012" -> 12); None si no es número"""
+    try:
+        return int(texto)
+    except (TypeError, ValueError):
+        return None
+
+
+def es_respuesta_correcta(ejercicio, texto):
+    """Regla única de corrección: el número escrito es igual a la respuesta"""
+    return normalizar_respuesta(texto) == ejercicio.respuesta
+
+
+class Ejercicio:
+    """Ejercicio del banco; el texto se deriva al pedirlo y no se almacena"""
+
+    __slots__ = ("codigo", "tabla", "num", "id", "respuesta")
+
+    def __init__(self, operacion, tabla, num, id_ejercicio):
+        self.codigo = CODIGOS_OPERACIONES[operacion]
+        self.tabla = tabla
+        self.num = num
+        self.id = id_ejercicio
+        self.respuesta = calcular_respuesta(operacion, tabla, num)
+
+    @property
+    def operacion(self):
+        return OPERACIONES[self.codigo]
+
+    @property
+    def texto(self):
+        return texto_ejercicio(self.operacion, self.tabla, self.num)
+
+    def __repr__(self):
+        return f"Ejercicio({self.texto!r} {self.respuesta}, id={self.id})"
+
+
+def _generar_tabla(operacion, tabla):
+    """Genera los ejercicios de una tabla en orden, con su id fijo"""
+    if operacion == "resta":
+        # En resta solo se generan ejercicios desde 0 hasta la tabla
+        numeros = range(0, tabla + 1)
+    else:
+        numeros = range(0, ConfigEjercicios.EJERCICIOS_POR_TABLA)
+    return tuple(Ejercicio(operacion, tabla, num, idx) for idx, num in enumerate(numeros))
+
+
+# ==================== BANCO DE EJERCICIOS ====================
+# Se construye una sola vez por proceso, la primera vez que se pide una tabla.
+# Los ejercicios del banco se comparten entre llamadas: no deben modificarse.
+_banco_ejercicios = None
+
+
+def _construir_banco():
+    """Precalcula todas las tablas permitidas de todas las operaciones"""
+    banco = {}
+    for operacion in ConfigEjercicios.NOMBRES_OPERACIONES:
+        for tabla in range(obtener_tabla_minima(operacion), obtener_tabla_maxima(operacion) + 1):
+            banco[(operacion, tabla)] = _generar_tabla(operacion, tabla)
+    return banco
+
+
+def obtener_banco_ejercicios(operacion, tabla):
+    """Retorna la tupla de ejercicios precalculados de (operación, tabla)"""
+    global _banco_ejercicios
+    if _banco_ejercicios is None:
+        _banco_ejercicios = _construir_banco()
+
+    ejercicios = _banco_ejercicios.get((operacion, tabla))
+    if ejercicios is None:
+        # Tabla fuera del rango del selector: se genera una vez y se memoriza
+        ejercicios = _generar_tabla(operacion, tabla)
+        _banco_ejercicios[(operacion, tabla)] = ejercicios
+    return ejercicios
+
+
+# ==================== ORDEN DETERMINISTA ====================
+# Cada ejercicio j recibe una clave splitmix64(semilla, j) y el orden es el de
+# las claves. No hay estado compartido: cada semilla es un flujo independiente
+# que da el mismo orden en cualquier proceso, núcleo o máquina (y en NumPy).
+MASCARA_64 = (1 << 64) - 1
+PASO_SPLITMIX = 0x9E3779B97F4A7C15
+
+
+def _mezclar64(z):
+    """Función de mezcla de splitmix64"""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASCARA_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASCARA_64
+    return z ^ (z >> 31)
+
+
+def clave_orden(semilla, indice):
+    """Clave pseudoaleatoria del ejercicio indice bajo una semilla"""
+    return _mezclar64((semilla + (indice + 1) * PASO_SPLITMIX) & MASCARA_64)
+
+
+def orden_determinista(n, semilla):
+    """Retorna una permutación de range(n) reproducible a partir de la semilla"""
+    return sorted(range(n), key=lambda j: clave_orden(semilla, j))
+
+
+def derivar_semilla(*partes):
+    """Deriva una semilla de 64 bits estable a partir de textos o números"""
+    texto = "\x1f".join(str(p).strip().casefold() for p in partes)
+    return int.from_bytes(hashlib.blake2b(texto.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def semilla_tabla(nombre, curso, fecha, operacion, tabla, semilla_base=0):
+    """Semilla de la tabla de un estudiante (misma hoja en cualquier máquina)"""
+    return derivar_semilla(semilla_base, nombre, curso, fecha, operacion, tabla)
+
+
+def generar_ejercicios(operacion, tabla, semilla=None):
+    """Retorna una permutación de los ejercicios del banco
+
+    Sin semilla se usa el generador global de random; con semilla el orden es
+    siempre el mismo (ver semilla_tabla).
+    """
+    banco = obtener_banco_ejercicios(operacion, tabla)
+    if semilla is None:
+        return random.sample(banco, len(banco))
+    return [banco[j] for j in orden_determinista(len(banco), semilla)]
+
+
+# ==================== POOL DEL EXAMEN MIXTO ====================
+class PoolEjercicios:
+    """Todos los ejercicios de un plan (operación, tabla) en un arreglo plano
+
+    Se construye una vez por plan y se muestrea sin reemplazo con un
+    Fisher-Yates parcial: cada sorteo cuesta O(k), no O(tamaño del pool).
+    """
+
+    def __init__(self, plan):
+        self.plan = tuple(plan)
+        self.ejercicios = tuple(
+            ej for operacion, tabla in self.plan for ej in obtener_banco_ejercicios(operacion, tabla)
+        )
+        self._conjunto = None
+
+    def __len__(self):
+        return len(self.ejercicios)
+
+    def __contains__(self, ejercicio):
+        if self._conjunto is None:
+            self._conjunto = frozenset(self.ejercicios)
+        return ejercicio in self._conjunto
+
+    def muestrear(self, cantidad, semilla=None):
+        """Retorna min(cantidad, tamaño) ejercicios distintos en orden aleatorio"""
+        n = len(self.ejercicios)
+        cantidad = min(cantidad, n)
+        if semilla is None:
+            return random.sample(self.ejercicios, cantidad)
+
+        # Solo se guardan las posiciones intercambiadas (arreglo virtual 0..n-1)
+        intercambios = {}
+        muestra = []
+        for i in range(cantidad):
+            j = i + clave_orden(semilla, i) % (n - i)
+            elegido = intercambios.get(j, j)
+            intercambios[j] = intercambios.get(i, i)
+            muestra.append(self.ejercicios[elegido])
+        return muestra
+
+
+_pools = {}
+
+
+def obtener_pool(plan):
+    """Retorna el pool (memorizado) de un plan de (operación, tabla)"""
+    plan = tuple(plan)
+    pool = _pools.get(plan)
+    if pool is None:
+        pool = _pools[plan] = PoolEjercicios(plan)
+    return pool
@@ -0,0 +1,133 @@
+"""Generación vectorizada de ejercicios para lotes de estudiantes (requiere NumPy)"""
+from ejercicios import (
+    CODIGOS_OPERACIONES,
+    MASCARA_64,
+    PASO_SPLITMIX,
+    ConfigEjercicios,
+    obtener_banco_ejercicios,
+    semilla_tabla,
+)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def semillas_lote(estudiantes, plan, semilla_base=0):
+    """Semillas (estudiantes × tablas) derivadas de (nombre, curso, fecha) de cada estudiante"""
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("Para generar lotes instala: pip install numpy")
+    return np.array(
+        [[semilla_tabla(nombre, curso, fecha, operacion, tabla, semilla_base)
+          for operacion, tabla in plan]
+         for nombre, curso, fecha in estudiantes],
+        dtype=np.uint64
+    ).reshape(len(estudiantes), len(plan))
+
+
+def _claves_deterministas(semillas, ancho):
+    """Claves splitmix64 vectorizadas, idénticas a ejercicios.clave_orden"""
+    indices = np.arange(1, ancho + 1, dtype=np.uint64)
+    z = semillas[..., None] + indices * np.uint64(PASO_SPLITMIX)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+class LoteEjercicios:
+    """Operandos, respuestas y permutaciones de N estudiantes × plan de tablas
+
+    Los arreglos de operandos y respuestas tienen forma (tablas, columnas): la
+    columna j es el ejercicio con id j del banco. Las permutaciones tienen forma
+    (estudiantes, tablas, columnas) y dejan las columnas vacías (resta) al final.
+    """
+
+    def __init__(self, plan, operando1, operando2, respuestas, longitudes, permutaciones):
+        self.plan = plan
+        self.operando1 = operando1
+        self.operando2 = operando2
+        self.respuestas = respuestas
+        self.longitudes = longitudes
+        self.permutaciones = permutaciones
+
+    @property
+    def num_estudiantes(self):
+        return self.permutaciones.shape[0]
+
+    def orden(self, estudiante, indice):
+        """Retorna los ids de ejercicio en el orden que verá el estudiante"""
+        return self.permutaciones[estudiante, indice, :self.longitudes[indice]]
+
+    def ejercicios(self, estudiante, indice):
+        """Materializa la tabla del estudiante como en generar_ejercicios"""
+        operacion, tabla = self.plan[indice]
+        banco = obtener_banco_ejercicios(operacion, tabla)
+        return [banco[j] for j in self.orden(estudiante, indice).tolist()]
+
+    def respuestas_ordenadas(self, indice):
+        """Retorna las respuestas de la tabla por estudiante, en su orden (hoja de respuestas)"""
+        n = self.longitudes[indice]
+        return self.respuestas[indice][self.permutaciones[:, indice, :n]]
+
+
+def generar_lote(num_estudiantes, plan, semilla=None, semillas=None):
+    """Genera en una sola pasada los ejercicios de todo el lote
+
+    Sigue las reglas de ejercicios.py: la resta va de 0 a la tabla, la división
+    es (tabla·num) ÷ tabla, y potencia/raíz usan num ** tabla.
+
+    Con semillas (estudiantes × tablas, ver semillas_lote) cada tabla sale en el
+    mismo orden que generar_ejercicios(operacion, tabla, semilla) y el lote puede
+    repartirse entre procesos sin cambiar ningún resultado.
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("Para generar lotes instala: pip install numpy")
+
+    codigos = np.array([CODIGOS_OPERACIONES[op] for op, _ in plan], dtype=np.int64)[:, None]
+    tablas = np.array([tabla for _, tabla in plan], dtype=np.int64)[:, None]
+
+    es_resta = codigos == CODIGOS_OPERACIONES["resta"]
+    longitudes = np.where(es_resta, tablas + 1, ConfigEjercicios.EJERCICIOS_POR_TABLA)[:, 0]
+    ancho = int(longitudes.max()) if len(plan) else 0
+    nums = np.arange(ancho, dtype=np.int64)[None, :]
+    validos = nums < longitudes[:, None]
+
+    es_division = codigos == CODIGOS_OPERACIONES["división"]
+    es_potencia = codigos == CODIGOS_OPERACIONES["potencia"]
+    es_raiz = codigos == CODIGOS_OPERACIONES["raiz"]
+    exponentes = tablas[es_potencia | es_raiz]
+    if exponentes.size and (ancho - 1) ** int(exponentes.max()) > np.iinfo(np.int64).max:
+        # int64 se desbordaría en silencio (los rangos configurados llegan a 12 ** 10)
+        raise ValueError(f"Exponente {int(exponentes.max())} fuera del rango de un lote")
+    potencias = nums ** tablas
+
+    operando1 = np.select(
+        [es_division, es_potencia, es_raiz],
+        [tablas * nums, nums, potencias],
+        default=np.broadcast_to(tablas, potencias.shape)
+    )
+    operando2 = np.where(es_division | es_potencia | es_raiz, tablas, nums)
+    respuestas = np.select(
+        [codigos == CODIGOS_OPERACIONES["suma"], es_resta,
+         codigos == CODIGOS_OPERACIONES["multiplicación"], es_potencia],
+        [tablas + nums, tablas - nums, tablas * nums, potencias],
+        default=np.broadcast_to(nums, potencias.shape)
+    )
+    operando1 = np.where(validos, operando1, 0)
+    operando2 = np.where(validos, operando2, 0)
+    respuestas = np.where(validos, respuestas, 0)
+
+    # Una clave aleatoria por ejercicio; las columnas vacías quedan al final
+    if semillas is not None:
+        semillas = np.asarray(semillas, dtype=np.uint64).reshape(num_estudiantes, len(plan))
+        claves = _claves_deterministas(semillas, ancho)
+        claves[:, ~validos] = np.uint64(MASCARA_64)
+    else:
+        rng = np.random.default_rng(semilla)
+        claves = rng.random((num_estudiantes, len(plan), ancho))
+        claves[:, ~validos] = 2.0
+    permutaciones = np.argsort(claves, axis=-1, kind="stable").astype(np.int16)
+
+    return LoteEjercicios(plan, operando1, operando2, respuestas, longitudes, permutaciones)
@@ -0,0 +1,231 @@
+"""Impresión por lotes: hojas en blanco y hojas de respuestas para toda una lista
+
+Uso: python hojas_trabajo.py lista.csv --nivel 2 [--plan "multiplicación:2-9,división:2-9"]
+     [--salida hojas] [--combinado] [--procesos 4] [--semilla-base 0]
+
+La lista es un CSV con columnas nombre, curso y (opcional) fecha. Cada
+estudiante recibe el orden de semilla_tabla, así que su hoja y su clave son
+las mismas en cualquier equipo y en cualquier reparto entre procesos.
+"""
+import argparse
+import csv
+import html
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from ejercicios import (
+    ConfigEjercicios,
+    generar_ejercicios,
+    obtener_tabla_maxima,
+    obtener_tabla_minima,
+    plan_completo,
+    semilla_tabla,
+)
+from motor_sesion import OPERACIONES_POR_NIVEL
+
+COLOR_TITULO = "#9C27B0"
+# Estudiantes por tarea del pool (acota lo que cada resultado ocupa en memoria)
+ESTUDIANTES_POR_BLOQUE = 64
+
+ESTILO_HOJAS = f"""<style>
+body {{font-family: Arial; margin: 40px;}}
+h1 {{color: {COLOR_TITULO}; text-align: center;}}
+h2 {{margin-bottom: 4px;}}
+table {{width: 100%; border-collapse: collapse; margin: 10px 0 20px;}}
+td {{padding: 8px; border: 1px solid #ddd; width: 25%;}}
+.hoja {{page-break-after: always;}}
+.respuesta {{color: {COLOR_TITULO}; font-weight: bold;}}
+</style>"""
+
+
+# ==================== LISTA Y PLAN ====================
+def leer_lista(ruta):
+    """Retorna [(nombre, curso, fecha)] del CSV (la fila de encabezado es opcional)"""
+    hoy = datetime.now().strftime("%d/%m/%Y")
+    estudiantes = []
+    with open(ruta, newline="", encoding="utf-8-sig") as f:
+        for fila in csv.reader(f):
+            if not fila or not fila[0].strip():
+                continue
+            if not estudiantes and fila[0].strip().casefold() == "nombre":
+                continue
+            curso = fila[1].strip() if len(fila) > 1 else ""
+            fecha = fila[2].strip() if len(fila) > 2 and fila[2].strip() else hoy
+            estudiantes.append((fila[0].strip(), curso, fecha))
+    return estudiantes
+
+
+def leer_plan(texto, nivel):
+    """Convierte "operación:desde-hasta,..." en [(operación, tabla)]
+
+    Sin texto se usa el plan completo del nivel. "op" es toda la operación,
+    "op:5" una sola tabla, "op:5-" desde la 5 hasta la última y "op:-5"
+    desde la primera hasta la 5. Las operaciones y tablas deben existir en
+    el nivel, como en el aplicativo.
+    """
+    operaciones = OPERACIONES_POR_NIVEL[nivel]
+    if not texto:
+        return plan_completo(operaciones, nivel=nivel)
+    plan = []
+    for parte in texto.split(","):
+        operacion, _, rango = parte.strip().partition(":")
+        if operacion not in ConfigEjercicios.NOMBRES_OPERACIONES:
+            raise ValueError(f"Operación desconocida: {operacion!r}")
+        if operacion not in operaciones:
+            raise ValueError(f"La operación {operacion!r} no es del nivel {nivel} "
+                             f"(operaciones del nivel: {', '.join(operaciones)})")
+        minima, maxima = obtener_tabla_minima(operacion), obtener_tabla_maxima(operacion, nivel)
+        desde, guion, hasta = rango.partition("-")
+        try:
+            desde = int(desde) if desde else minima
+            if hasta:
+                hasta = int(hasta)
+            else:
+                hasta = maxima if guion or not rango else desde
+        except ValueError:
+            raise ValueError(f"Rango inválido para {operacion}: {rango!r}") from None
+        if not minima <= desde <= hasta <= maxima:
+            raise ValueError(f"Rango {desde}-{hasta} fuera de las tablas de {operacion} "
+                             f"en el nivel {nivel} ({minima} a {maxima})")
+        plan.extend((operacion, tabla) for tabla in range(desde, hasta + 1))
+    return plan
+
+
+# ==================== HOJAS ====================
+def _encabezado(titulo, nombre, curso, fecha):
+    return (f"<h1>{titulo}</h1><p style=\"text-align:center;\"><strong>Estudiante:</strong> "
+            f"{html.escape(nombre)} | <strong>Curso:</strong> {html.escape(curso)} | "
+            f"<strong>Fecha:</strong> {html.escape(fecha)}</p><hr>")
+
+
+# Celdas HTML (en blanco, con respuesta) de cada ejercicio del banco, armadas una
+# vez por proceso: todas las hojas del lote comparten los mismos ejercicios
+_celdas = {}
+
+
+def _celdas_ejercicio(ej):
+    celdas = _celdas.get(ej)
+    if celdas is None:
+        texto = ej.texto
+        celdas = _celdas[ej] = (f"<td>{texto} ________</td>",
+                                f"<td>{texto} <span class=\"respuesta\">{ej.respuesta}</span></td>")
+    return celdas
+
+
+def _tabla_html(ejercicios, con_respuestas, columnas=4):
+    celdas = [_celdas_ejercicio(ej)[con_respuestas] for ej in ejercicios]
+    filas = ("<tr>" + "".join(celdas[i:i + columnas]) + "</tr>"
+             for i in range(0, len(celdas), columnas))
+    return "<table>" + "".join(filas) + "</table>"
+
+
+def generar_hojas_estudiante(estudiante, plan, semilla_base=0):
+    """Retorna (hoja en blanco, hoja de respuestas) en HTML de un estudiante"""
+    nombre, curso, fecha = estudiante
+    hoja = [_encabezado("HOJA DE EJERCICIOS", nombre, curso, fecha)]
+    clave = [_encabezado("HOJA DE RESPUESTAS", nombre, curso, fecha)]
+    for operacion, tabla in plan:
+        ejercicios = generar_ejercicios(
+            operacion, tabla, semilla_tabla(nombre, curso, fecha, operacion, tabla, semilla_base)
+        )
+        titulo = f"<h2>{ConfigEjercicios.NOMBRES_OPERACIONES[operacion]} - Tabla {tabla}</h2>"
+        hoja.append(titulo + _tabla_html(ejercicios, False))
+        clave.append(titulo + _tabla_html(ejercicios, True))
+    return ("<div class=\"hoja\">" + "".join(hoja) + "</div>",
+            "<div class=\"hoja\">" + "".join(clave) + "</div>")
+
+
+INICIO_DOCUMENTO = f"<!DOCTYPE html><html><head><meta charset=\"UTF-8\"><title>Hojas</title>{ESTILO_HOJAS}</head><body>"
+FIN_DOCUMENTO = "</body></html>"
+
+
+def _nombre_archivo(indice, nombre):
+    return f"{indice:04d}_{re.sub(r'[^0-9A-Za-zÁÉÍÓÚÜÑáéíóúüñ]+', '_', nombre).strip('_')}.html"
+
+
+def _procesar_bloque(bloque, plan, semilla_base, salida):
+    """Trabajo de un proceso: con salida escribe un archivo por estudiante, si no retorna el HTML"""
+    resultado = []
+    for indice, estudiante in bloque:
+        hoja, clave = generar_hojas_estudiante(estudiante, plan, semilla_base)
+        if salida is None:
+            resultado.append(hoja + clave)
+        else:
+            with open(os.path.join(salida, _nombre_archivo(indice, estudiante[0])), "w", encoding="utf-8") as f:
+                f.write(INICIO_DOCUMENTO + hoja + clave + FIN_DOCUMENTO)
+    return resultado if salida is None else len(bloque)
+
+
+def _en_ventana(ejecutor, funcion, tareas, ventana):
+    """Como ejecutor.map, pero con a lo sumo `ventana` tareas enviadas y sin leer
+
+    map envía todas las tareas de una vez y guarda los resultados que aún no
+    se leen; aquí se envía la siguiente solo cuando se consume una.
+    """
+    pendientes = deque()
+    for argumentos in tareas:
+        if len(pendientes) >= ventana:
+            yield pendientes.popleft().result()
+        pendientes.append(ejecutor.submit(funcion, *argumentos))
+    while pendientes:
+        yield pendientes.popleft().result()
+
+
+def imprimir_lote(estudiantes, plan, salida, combinado=False, procesos=None, semilla_base=0):
+    """Genera las hojas de toda la lista repartidas entre procesos; retorna los segundos"""
+    os.makedirs(salida, exist_ok=True)
+    procesos = procesos or os.cpu_count() or 1
+    numerados = list(enumerate(estudiantes, 1))
+    # Varios bloques por proceso para repartir bien la carga sin pagar una tarea por hoja
+    tamano = min(max(1, -(-len(numerados) // (procesos * 4))), ESTUDIANTES_POR_BLOQUE)
+    bloques = [numerados[i:i + tamano] for i in range(0, len(numerados), tamano)]
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        destino = None if combinado else salida
+        # Dos bloques por proceso en vuelo: los procesos no esperan y la memoria queda acotada
+        resultados = _en_ventana(ejecutor, _procesar_bloque,
+                                 ((bloque, plan, semilla_base, destino) for bloque in bloques),
+                                 2 * procesos)
+        if combinado:
+            # Los bloques llegan en orden y se escriben uno a uno
+            with open(os.path.join(salida, "hojas_combinadas.html"), "w", encoding="utf-8") as f:
+                f.write(INICIO_DOCUMENTO)
+                for paginas in resultados:
+                    f.writelines(paginas)
+                f.write(FIN_DOCUMENTO)
+        else:
+            for _ in resultados:
+                pass
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("lista", help="CSV con nombre, curso y fecha opcional")
+    parser.add_argument("--nivel", type=int, choices=[1, 2, 3], default=2)
+    parser.add_argument("--plan", default="", help='p. ej. "multiplicación:2-9,división:2-9"')
+    parser.add_argument("--salida", default="hojas")
+    parser.add_argument("--combinado", action="store_true", help="un solo archivo para toda la lista")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--semilla-base", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        plan = leer_plan(args.plan, args.nivel)
+    except ValueError as e:
+        parser.error(str(e))
+    estudiantes = leer_lista(args.lista)
+    segundos = imprimir_lote(estudiantes, plan, args.salida, args.combinado,
+                             args.procesos, args.semilla_base)
+    hojas = 2 * len(estudiantes)  # Hoja en blanco + hoja de respuestas
+    print(f"{len(estudiantes)} estudiantes × {len(plan)} tablas: {hojas} hojas en {segundos:.2f} s "
+          f"({hojas / segundos if segundos else 0:.0f} hojas/s) -> {os.path.abspath(args.salida)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Lista desplazable por secciones que solo crea widgets para lo que está a la vista"""
+import math
+import tkinter as tk
+from bisect import bisect_right
+
+import customtkinter as ctk
+
+
+class ListaVirtual(tk.Frame):
+    """Secciones (encabezado + filas de alto fijo) sobre un Canvas con widgets reciclados
+
+    cantidades: número de filas de cada sección. crear_encabezado(parent) y
+    crear_fila(parent) retornan (widget, datos) reutilizables;
+    llenar_encabezado(datos, sección) y llenar_fila(datos, sección, fila) los
+    ponen al día. Solo existen widgets para lo visible más `sobrante` filas
+    arriba y abajo: al desplazarse se reasignan, así que abrir la lista cuesta
+    lo mismo con diez filas que con diez mil.
+    """
+
+    def __init__(self, parent, cantidades, alto_encabezado, alto_fila, crear_encabezado,
+                 llenar_encabezado, crear_fila, llenar_fila, sobrante=3, margen=20, fondo="white"):
+        super().__init__(parent, bg=fondo)
+        self.canvas = tk.Canvas(self, bg=fondo, highlightthickness=0, yscrollincrement=1)
+        self.barra = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._al_desplazar)
+        self.barra.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self._cantidades = list(cantidades)
+        self._alto_encabezado = alto_encabezado
+        self._alto_fila = alto_fila
+        self._crear = {"encabezado": crear_encabezado, "fila": crear_fila}
+        self._llenar_encabezado = llenar_encabezado
+        self._llenar_fila = llenar_fila
+        self._sobrante = sobrante
+        self._margen = margen
+
+        # y de inicio de cada sección (sumas acumuladas: O(secciones), no O(filas))
+        self._inicios = []
+        y = 0
+        for cantidad in self._cantidades:
+            self._inicios.append(y)
+            y += alto_encabezado + cantidad * alto_fila
+        self._alto_total = y
+        self.canvas.configure(scrollregion=(0, 0, 0, self._alto_total))
+
+        self._visibles = {}  # (sección, fila o None) -> (tipo, widget, datos, ventana)
+        self._libres = {"encabezado": [], "fila": []}
+        self._ancho = 0
+
+        self.canvas.bind("<Configure>", self._al_redimensionar)
+        # La rueda se atiende en la ventana: los widgets reciclados no necesitan enlaces propios
+        self.winfo_toplevel().bind("<MouseWheel>", self._al_girar_rueda, add="+")
+        self.winfo_toplevel().bind("<Button-4>", self._al_girar_rueda, add="+")
+        self.winfo_toplevel().bind("<Button-5>", self._al_girar_rueda, add="+")
+
+    # ==================== GEOMETRÍA ====================
+    def _y(self, clave):
+        seccion, fila = clave
+        y = self._inicios[seccion]
+        return y if fila is None else y + self._alto_encabezado + fila * self._alto_fila
+
+    def _claves_entre(self, y0, y1):
+        """Encabezados y filas que tocan la franja [y0, y1)"""
+        seccion = max(0, bisect_right(self._inicios, y0) - 1)
+        while seccion < len(self._cantidades) and self._inicios[seccion] < y1:
+            inicio = self._inicios[seccion]
+            if inicio + self._alto_encabezado > y0:
+                yield seccion, None
+            inicio_filas = inicio + self._alto_encabezado
+            desde = max(0, int((y0 - inicio_filas) // self._alto_fila))
+            hasta = min(self._cantidades[seccion], math.ceil((y1 - inicio_filas) / self._alto_fila))
+            for fila in range(desde, hasta):
+                yield seccion, fila
+            seccion += 1
+
+    # ==================== RECICLAJE ====================
+    def _actualizar(self):
+        """Da widget a lo visible (más el sobrante) y libera lo que salió de la vista"""
+        extra = self._sobrante * self._alto_fila
+        y0 = self.canvas.canvasy(0) - extra
+        y1 = self.canvas.canvasy(self.canvas.winfo_height()) + extra
+        necesarias = set(self._claves_entre(y0, y1))
+
+        for clave in [c for c in self._visibles if c not in necesarias]:
+            tipo, widget, datos, ventana = self._visibles.pop(clave)
+            self.canvas.itemconfigure(ventana, state="hidden")
+            self._libres[tipo].append((widget, datos, ventana))
+
+        for clave in necesarias:
+            if clave in self._visibles:
+                continue
+            tipo = "fila" if clave[1] is not None else "encabezado"
+            alto = self._alto_fila if tipo == "fila" else self._alto_encabezado
+            if self._libres[tipo]:
+                widget, datos, ventana = self._libres[tipo].pop()
+            else:
+                widget, datos = self._crear[tipo](self.canvas)
+                ventana = self.canvas.create_window(0, 0, window=widget, anchor="nw")
+            if tipo == "fila":
+                self._llenar_fila(datos, *clave)
+            else:
+                self._llenar_encabezado(datos, clave[0])
+            self.canvas.coords(ventana, self._margen, self._y(clave))
+            self.canvas.itemconfigure(ventana, state="normal", height=alto,
+                                      width=max(self._ancho - 2 * self._margen, 1))
+            self._visibles[clave] = (tipo, widget, datos, ventana)
+
+    def _al_desplazar(self, primero, ultimo):
+        self.barra.set(primero, ultimo)
+        self._actualizar()
+
+    def _al_redimensionar(self, event):
+        if event.width != self._ancho:
+            self._ancho = event.width
+            ancho = max(event.width - 2 * self._margen, 1)
+            for _, _, _, ventana in self._visibles.values():
+                self.canvas.itemconfigure(ventana, width=ancho)
+            for libres in self._libres.values():
+                for _, _, ventana in libres:
+                    self.canvas.itemconfigure(ventana, width=ancho)
+        self._actualizar()
+
+    def _al_girar_rueda(self, event):
+        if not str(event.widget).startswith(str(self.canvas)):
+            return
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.canvas.yview_scroll(-self._alto_fila, "units")
+        else:
+            self.canvas.yview_scroll(self._alto_fila, "units")
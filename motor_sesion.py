@@ -0,0 +1,631 @@
+"""Motor de sesión de Agilidad RMmath: lógica del test sin interfaz gráfica"""
+import itertools
+import sys
+from array import array
+from datetime import datetime
+
+from dominio import IndiceDominio, clave_hecho, ejercicio_de_clave, semilla_dominio
+from ejercicios import (
+    CODIGOS_OPERACIONES,
+    OPERACION_ADAPTATIVA,
+    OPERACION_MIXTA,
+    OPERACION_REPASO,
+    OPERACIONES,
+    ConfigEjercicios,
+    es_respuesta_correcta,
+    generar_ejercicios,
+    obtener_pool,
+    obtener_tabla_minima,
+    plan_completo,
+    semilla_tabla,
+)
+from penalizacion import POLITICA_POR_DEFECTO, calcular_nota
+
+
+VERSION_INSTANTANEA = 1
+
+OPERACIONES_POR_NIVEL = {
+    1: ["suma", "resta"],
+    2: ["suma", "resta", "multiplicación", "división"],
+    3: ["suma", "resta", "multiplicación", "división", "potencia", "raiz"]
+}
+
+
+class RegistroHistorial:
+    """Fila del historial: el ejercicio del banco y lo que respondió el estudiante
+
+    La operación, la tabla, el texto y la respuesta correcta se leen del
+    ejercicio compartido del banco en lugar de copiarse en cada fila.
+    """
+
+    __slots__ = ("ejercicio_banco", "respuesta_usuario", "correcto", "latencia")
+
+    def __init__(self, ejercicio_banco, respuesta_usuario, correcto, latencia=None):
+        self.ejercicio_banco = ejercicio_banco
+        # Las respuestas se repiten mucho ("0", "12"...): se comparte una sola copia
+        self.respuesta_usuario = sys.intern(respuesta_usuario)
+        self.correcto = correcto
+        self.latencia = latencia  # ms trabajando en el ejercicio (None si no se midió)
+
+    @property
+    def operacion(self):
+        return self.ejercicio_banco.operacion
+
+    @property
+    def tabla(self):
+        return self.ejercicio_banco.tabla
+
+    @property
+    def ejercicio(self):
+        return self.ejercicio_banco.texto
+
+    @property
+    def respuesta_correcta(self):
+        return self.ejercicio_banco.respuesta
+
+
+class MarcadorEnVivo:
+    """Aciertos de la tabla mientras se escribe (modo carrera)
+
+    Cada cambio corrige solo el ejercicio que cambió y ajusta el conteo, así
+    que actualizar el marcador es O(1) sin importar el largo de la tabla. La
+    regla es la misma de la corrección final: es_respuesta_correcta.
+    """
+
+    __slots__ = ("ejercicios", "aciertos", "correctas")
+
+    def __init__(self, ejercicios):
+        self.ejercicios = ejercicios
+        self.aciertos = bytearray(len(ejercicios))  # 1 si la posición está correcta
+        self.correctas = 0
+
+    def actualizar(self, posicion, texto):
+        """Corrige un ejercicio tras un cambio; retorna el nuevo total de aciertos"""
+        correcto = es_respuesta_correcta(self.ejercicios[posicion], texto)
+        self.correctas += correcto - self.aciertos[posicion]
+        self.aciertos[posicion] = correcto
+        return self.correctas
+
+
+class TotalesOperacion:
+    """Acumulados de una operación, actualizados al guardar cada tabla"""
+
+    __slots__ = ("correctas", "incorrectas", "total", "tabla_max", "tiempo_total", "penalizacion")
+
+    def __init__(self):
+        self.correctas = 0
+        self.incorrectas = 0
+        self.total = 0
+        self.tabla_max = 0
+        self.tiempo_total = 0
+        self.penalizacion = 0
+
+
+class AlmacenResultados:
+    """Resultados por tabla guardados en columnas, con totales siempre al día
+
+    Cada tabla es una fila (clave "operación_tablaN"). Los totales generales y
+    por operación se actualizan al escribir, así que las pantallas de resumen
+    y los reportes los leen sin volver a recorrer las filas.
+    """
+
+    def __init__(self):
+        self._filas = {}  # clave -> índice de fila
+        self.codigos = array("b")
+        self.tablas = array("i")
+        self.correctas = array("i")
+        self.incorrectas = array("i")
+        self.totales = array("i")
+        self.tiempos = array("d")
+        self.penalizaciones = array("d")
+
+        self.por_operacion = {}  # operación -> TotalesOperacion (orden de aparición)
+        self.correctas_total = 0
+        self.incorrectas_total = 0
+        self.preguntas_total = 0
+        self.tiempo_total = 0
+        self.penalizacion_total = 0
+
+    def __len__(self):
+        return len(self._filas)
+
+    def __contains__(self, clave):
+        return clave in self._filas
+
+    def guardar(self, operacion, tabla, correctas, incorrectas, total, tiempo, penalizacion=0):
+        """Guarda (o reemplaza) el resultado de una tabla y actualiza los totales
+
+        penalizacion: puntos que resta la tabla por tiempo extra (ver
+        SesionAgilidad.penalizacion_tabla); se acumula como los aciertos.
+        """
+        clave = f"{operacion}_tabla{tabla}"
+        totales_op = self.por_operacion.get(operacion)
+        if totales_op is None:
+            totales_op = self.por_operacion[operacion] = TotalesOperacion()
+
+        i = self._filas.get(clave)
+        if i is None:
+            i = self._filas[clave] = len(self.codigos)
+            self.codigos.append(CODIGOS_OPERACIONES[operacion])
+            self.tablas.append(tabla)
+            self.correctas.append(0)
+            self.incorrectas.append(0)
+            self.totales.append(0)
+            self.tiempos.append(0)
+            self.penalizaciones.append(0)
+
+        self._acumular(totales_op, i, -1)
+        self.correctas[i] = correctas
+        self.incorrectas[i] = incorrectas
+        self.totales[i] = total
+        self.tiempos[i] = tiempo
+        self.penalizaciones[i] = penalizacion
+        self._acumular(totales_op, i, 1)
+        totales_op.tabla_max = max(totales_op.tabla_max, tabla)
+
+    def _acumular(self, totales_op, i, signo):
+        """Suma (o resta) la fila i a los totales"""
+        totales_op.correctas += signo * self.correctas[i]
+        totales_op.incorrectas += signo * self.incorrectas[i]
+        totales_op.total += signo * self.totales[i]
+        totales_op.tiempo_total += signo * self.tiempos[i]
+        totales_op.penalizacion += signo * self.penalizaciones[i]
+        self.correctas_total += signo * self.correctas[i]
+        self.incorrectas_total += signo * self.incorrectas[i]
+        self.preguntas_total += signo * self.totales[i]
+        self.tiempo_total += signo * self.tiempos[i]
+        self.penalizacion_total += signo * self.penalizaciones[i]
+
+    def cargar_filas(self, filas):
+        """Guarda filas (código, tabla, correctas, incorrectas, total, tiempo, penalización)"""
+        for codigo, tabla, correctas, incorrectas, total, tiempo, penalizacion in filas:
+            self.guardar(OPERACIONES[codigo], tabla, correctas, incorrectas, total, tiempo, penalizacion)
+
+    def totales_operacion(self, operacion):
+        """Retorna los TotalesOperacion de una operación, o None si no tiene tablas"""
+        return self.por_operacion.get(operacion)
+
+    def fila(self, i):
+        """Retorna la fila i como diccionario (para mostrarla)"""
+        return {
+            "operacion": OPERACIONES[self.codigos[i]],
+            "tabla": self.tablas[i],
+            "correctas": self.correctas[i],
+            "incorrectas": self.incorrectas[i],
+            "total": self.totales[i],
+            "tiempo": self.tiempos[i],
+            "penalizacion": self.penalizaciones[i]
+        }
+
+    def items(self):
+        """Itera (clave, fila) en el orden en que se guardaron"""
+        for clave, i in self._filas.items():
+            yield clave, self.fila(i)
+
+    def values(self):
+        """Itera las filas en el orden en que se guardaron"""
+        for i in self._filas.values():
+            yield self.fila(i)
+
+
+class SesionAgilidad:
+    """Estado y reglas de un test: progresión de tablas, evaluación y nota
+
+    No crea widgets ni mide tiempo: la interfaz (o un simulador) lee las
+    respuestas, actualiza tiempo_operacion_actual y llama a estos métodos.
+
+    Con semilla_base el orden de cada tabla se deriva de estudiante, curso,
+    fecha y tabla, y puede regenerarse igual en cualquier máquina.
+    """
+
+    def __init__(self, semilla_base=None, politica=POLITICA_POR_DEFECTO):
+        self.semilla_base = semilla_base
+        self.politica = politica
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Inicializa el estado de la sesión"""
+        self.nivel = None
+        self.nombre = ""
+        self.curso = ""
+        self.fecha = datetime.now().strftime("%d/%m/%Y")
+        self.tabla_max = 10
+        self.tabla_actual = 1
+        self.limites_tablas = {}
+        self.tiempo_operacion_actual = 0  # Tiempo de la operación actual
+        self.tiempo_principal_operacion = 0  # Tiempo principal por operación (12 o 10 min)
+        self.tiempo_maximo_operacion = 0  # Tiempo máximo por operación (15 o 12 min)
+        self.finalizado = False
+        self.resultados_operacion = AlmacenResultados()
+        self.operaciones_nivel = []
+        self.operacion_actual = ""
+        self.ejercicios = []
+        self.historial_ejercicios = []
+        self._grupos_historial = {}  # (código, tabla) -> índices en historial_ejercicios
+        self.cantidad_examen_mixto = 0
+        self.pool_examen_mixto = None
+        self.indice_dominio = None
+        self.cola_repaso = None
+
+    # ==================== PROGRESIÓN ====================
+    def seleccionar_nivel(self, nivel):
+        """Selecciona nivel y configura operaciones"""
+        self.nivel = nivel
+        self.operaciones_nivel = list(OPERACIONES_POR_NIVEL.get(nivel, OPERACIONES_POR_NIVEL[3]))
+
+    def iniciar_estudiante(self, nombre, curso, fecha, indice_dominio=None, cola_repaso=None):
+        """Registra los datos del estudiante y reinicia los resultados
+
+        indice_dominio: índice de dominio previo del estudiante (práctica adaptativa);
+        sin él se arma del historial recién cuando se pide (ver obtener_indice_dominio).
+        cola_repaso: cola de repaso espaciado del estudiante (ver repaso.ColaRepaso).
+        """
+        self.nombre = nombre
+        self.curso = curso
+        self.fecha = fecha
+        self.indice_dominio = indice_dominio
+        self.cola_repaso = cola_repaso
+
+        self.resultados_operacion = AlmacenResultados()
+        self.operacion_actual = ""
+        self.tabla_actual = 1
+        self.limites_tablas = {}
+
+    def operacion_pendiente(self):
+        """Retorna la operación a configurar (la primera del nivel si no hay ninguna)"""
+        if not self.operacion_actual:
+            self.operacion_actual = self.operaciones_nivel[0]
+        return self.operacion_actual
+
+    def fijar_limite_tabla(self, tabla_max):
+        """Fija hasta qué tabla se practica la operación actual"""
+        self.limites_tablas[self.operacion_actual] = tabla_max
+        self.tabla_max = tabla_max
+        self.tabla_actual = obtener_tabla_minima(self.operacion_actual)
+
+    def iniciar_examen_mixto(self, cantidad, tabla_max, adaptativo=False):
+        """Configura un examen de `cantidad` ejercicios de todo el nivel hasta tabla_max
+
+        Con adaptativo=True se eligen los hechos más débiles del estudiante
+        (ver dominio.IndiceDominio) en lugar de sortearlos.
+        """
+        operacion = OPERACION_ADAPTATIVA if adaptativo else OPERACION_MIXTA
+        self.operaciones_nivel = [operacion]
+        self.operacion_actual = operacion
+        self.limites_tablas = {operacion: tabla_max}
+        self.tabla_max = tabla_max
+        self.tabla_actual = tabla_max
+        self.cantidad_examen_mixto = cantidad
+        self.pool_examen_mixto = obtener_pool(
+            plan_completo(OPERACIONES_POR_NIVEL.get(self.nivel, OPERACIONES_POR_NIVEL[3]), tabla_max, self.nivel)
+        )
+
+    def iniciar_repaso(self, cantidad=None):
+        """Configura un repaso con los hechos vencidos de la cola del estudiante"""
+        self.operaciones_nivel = [OPERACION_REPASO]
+        self.operacion_actual = OPERACION_REPASO
+        self.limites_tablas = {OPERACION_REPASO: 0}
+        self.tabla_max = 0
+        self.tabla_actual = 0
+        self.cantidad_examen_mixto = cantidad
+        self.pool_examen_mixto = None
+
+    def es_examen_mixto(self):
+        """Verifica si la sesión mezcla operaciones (examen mixto, adaptativo o repaso)"""
+        return self.operacion_actual in (OPERACION_MIXTA, OPERACION_ADAPTATIVA, OPERACION_REPASO)
+
+    def preparar_tabla(self):
+        """Genera los ejercicios de la tabla actual; False si ya no quedan operaciones"""
+        self.finalizado = False
+
+        if self.operacion_actual == OPERACION_REPASO:
+            self.ejercicios = self.cola_repaso.vencidos(self.cantidad_examen_mixto) if self.cola_repaso else []
+            return True
+
+        if self.operacion_actual == OPERACION_ADAPTATIVA:
+            indice = self.obtener_indice_dominio()
+            indice.incluir(self.pool_examen_mixto.ejercicios)
+            self.ejercicios = indice.seleccionar(
+                self.cantidad_examen_mixto, self.pool_examen_mixto
+            )
+            return True
+
+        if self.es_examen_mixto():
+            self.ejercicios = self.pool_examen_mixto.muestrear(
+                self.cantidad_examen_mixto, self.semilla_tabla_actual()
+            )
+            return True
+
+        if self.tabla_actual > self.tabla_max:
+            idx = self.operaciones_nivel.index(self.operacion_actual) + 1
+            if idx >= len(self.operaciones_nivel):
+                return False
+            self.operacion_actual = self.operaciones_nivel[idx]
+            self.tabla_actual = obtener_tabla_minima(self.operacion_actual)
+
+        self.ejercicios = generar_ejercicios(self.operacion_actual, self.tabla_actual,
+                                             self.semilla_tabla_actual())
+        return True
+
+    def obtener_indice_dominio(self):
+        """Retorna el índice de dominio, armándolo del historial la primera vez"""
+        if self.indice_dominio is None:
+            self.indice_dominio = IndiceDominio.desde_historial(
+                self.historial_ejercicios, semilla_dominio(self.nombre, self.curso, self.semilla_base or 0)
+            )
+        return self.indice_dominio
+
+    def semilla_tabla_actual(self):
+        """Retorna la semilla de la tabla actual, o None si el orden es aleatorio"""
+        if self.semilla_base is None:
+            return None
+        return semilla_tabla(self.nombre, self.curso, self.fecha,
+                             self.operacion_actual, self.tabla_actual, self.semilla_base)
+
+    def iniciar_tabla(self):
+        """Prepara tiempos de la tabla; True si es la primera tabla de la operación"""
+        primera_tabla = (self.es_examen_mixto()
+                         or self.tabla_actual == obtener_tabla_minima(self.operacion_actual))
+        if primera_tabla:
+            # Primera tabla de esta operación, reiniciar tiempo
+            self.tiempo_operacion_actual = 0
+        # Si no es la primera tabla, mantener tiempo_operacion_actual sin cambios
+
+        self.finalizado = False
+        self.tiempo_principal_operacion, self.tiempo_maximo_operacion = \
+            self.tiempos_operacion(self.operacion_actual)
+        return primera_tabla
+
+    def tiempos_operacion(self, operacion):
+        """Retorna (tiempo principal, tiempo máximo) en segundos de una operación"""
+        if operacion in ["potencia", "raiz"]:
+            # Tiempos especiales para potenciación y radicación
+            return ConfigEjercicios.POTENCIA_RAIZ_TIEMPO_PRINCIPAL, ConfigEjercicios.POTENCIA_RAIZ_TIEMPO_MAXIMO
+        elif self.nivel == 1:
+            return ConfigEjercicios.NIVEL_1_TIEMPO_PRINCIPAL, ConfigEjercicios.NIVEL_1_TIEMPO_MAXIMO
+        else:  # Nivel 2 y 3
+            return ConfigEjercicios.NIVEL_2_TIEMPO_PRINCIPAL, ConfigEjercicios.NIVEL_2_TIEMPO_MAXIMO
+
+    def es_ultima_operacion(self):
+        """Verifica si la operación actual es la última del nivel"""
+        idx_actual = self.operaciones_nivel.index(self.operacion_actual)
+        return idx_actual == len(self.operaciones_nivel) - 1
+
+    def es_ultima_tabla(self):
+        """Verifica si la tabla actual es la última elegida"""
+        return self.tabla_actual == self.tabla_max
+
+    def operacion_siguiente(self):
+        """Retorna la operación que sigue a la actual, o None si es la última"""
+        idx_actual = self.operaciones_nivel.index(self.operacion_actual)
+        if idx_actual + 1 < len(self.operaciones_nivel):
+            return self.operaciones_nivel[idx_actual + 1]
+        return None
+
+    def debe_mostrar_boton_siguiente(self):
+        """Verifica si mostrar botón siguiente"""
+        return not (self.es_ultima_tabla() and self.es_ultima_operacion())
+
+    def tabla_guardada(self):
+        """Verifica si la tabla actual ya tiene resultado guardado"""
+        return f"{self.operacion_actual}_tabla{self.tabla_actual}" in self.resultados_operacion
+
+    def avanzar_tabla(self):
+        """Pasa a la siguiente tabla; False si ya era la última"""
+        if self.tabla_actual < self.tabla_max:
+            self.tabla_actual += 1
+            return True
+        return False
+
+    def continuar_siguiente_operacion(self, siguiente_op):
+        """Continúa con la siguiente operación"""
+        self.operacion_actual = siguiente_op
+        self.tabla_actual = obtener_tabla_minima(siguiente_op)
+        # Reiniciar tiempo para la nueva operación
+        self.tiempo_operacion_actual = 0
+
+    # ==================== EVALUACIÓN ====================
+    def corregir_respuestas(self, respuestas, latencias=None):
+        """Corrige la tabla en una sola pasada (dict posición del ejercicio -> texto escrito)
+
+        latencias: ms por posición (ver tiempos_respuesta.BufferEventos), opcional.
+        Retorna (correctas, incorrectas, filas del historial). Conteos e
+        historial usan la misma regla: es_respuesta_correcta.
+        """
+        correctas = 0
+        filas = []
+        for i, ej in enumerate(self.ejercicios):
+            respuesta_usuario = respuestas.get(i, "").strip()
+            correcto = es_respuesta_correcta(ej, respuesta_usuario)
+            correctas += correcto
+            latencia = latencias[i] if latencias is not None and i < len(latencias) else None
+            filas.append(RegistroHistorial(ej, respuesta_usuario, correcto, latencia))
+        return correctas, len(filas) - correctas, filas
+
+    def guardar_resultado(self, correctas, incorrectas, filas):
+        """Guarda resultado de la tabla actual y su historial"""
+        self.resultados_operacion.guardar(
+            self.operacion_actual, self.tabla_actual, correctas, incorrectas,
+            len(self.ejercicios), self.tiempo_operacion_actual,
+            self.penalizacion_tabla(self.operacion_actual, self.tiempo_operacion_actual)
+        )
+        self._agrupar_historial(len(self.historial_ejercicios), filas)
+        self.historial_ejercicios.extend(filas)
+
+        for fila in filas:
+            if self.indice_dominio is not None:
+                self.indice_dominio.registrar(fila.ejercicio_banco, fila.correcto, fila.latencia)
+            if self.cola_repaso is not None:
+                self.cola_repaso.registrar(fila.ejercicio_banco, fila.correcto)
+
+        for guardado in (self.indice_dominio, self.cola_repaso):
+            if guardado is not None:
+                try:
+                    guardado.guardar()
+                except OSError:
+                    pass  # Los cambios quedan pendientes y se reintentan en la próxima tabla
+
+    def finalizar_tabla(self, respuestas, latencias=None):
+        """Corrige y guarda la tabla actual; retorna (correctas, incorrectas)"""
+        correctas, incorrectas, filas = self.corregir_respuestas(respuestas, latencias)
+        self.finalizado = True
+        self.guardar_resultado(correctas, incorrectas, filas)
+        return correctas, incorrectas
+
+    def _agrupar_historial(self, inicio, filas):
+        """Anota cada fila nueva en el grupo (operación, tabla) de su ejercicio"""
+        for i, fila in enumerate(filas, inicio):
+            ej = fila.ejercicio_banco
+            indices = self._grupos_historial.get((ej.codigo, ej.tabla))
+            if indices is None:
+                indices = self._grupos_historial[(ej.codigo, ej.tabla)] = array("I")
+            indices.append(i)
+
+    # ==================== RESULTADOS ====================
+    def grupos_historial(self):
+        """Retorna [(operación, tabla, índices en historial_ejercicios)] en orden de aparición
+
+        Los grupos se arman al guardar cada tabla, así que pedirlos no recorre
+        el historial (en el examen mixto cada fila va al grupo de su operación).
+        """
+        return [(OPERACIONES[codigo], tabla, indices)
+                for (codigo, tabla), indices in self._grupos_historial.items()]
+
+    def resumen_operacion(self, operacion):
+        """Retorna (correctas, incorrectas, total de preguntas) de una operación"""
+        totales = self.resultados_operacion.totales_operacion(operacion)
+        if totales is None:
+            return 0, 0, 0
+        return totales.correctas, totales.incorrectas, totales.total
+
+    def penalizacion_tabla(self, operacion, tiempo_operacion):
+        """Puntos de penalización por el tiempo extra acumulado en la operación"""
+        return self.politica.penalizacion(self.nivel, operacion, tiempo_operacion)
+
+    def calcular_nota_final(self):
+        """Calcula nota final con penalización por tiempo extra en cada operación
+
+        Lee los acumulados del almacén (O(1)): la penalización de cada tabla
+        se calcula una sola vez, al guardarla.
+        """
+        resultados = self.resultados_operacion
+        nota_final, penalizacion = calcular_nota(
+            resultados.correctas_total, resultados.preguntas_total, resultados.penalizacion_total
+        )
+        return nota_final, resultados.tiempo_total, penalizacion
+
+    # ==================== PUNTO DE CONTROL ====================
+    def instantanea(self, respuestas=None, tiempo_operacion=None):
+        """Estado de la sesión en listas, números y textos (listo para JSON)
+
+        respuestas: dict posición -> texto escrito en la tabla en curso.
+        tiempo_operacion: tiempo del cronómetro si sigue corriendo (si no,
+        se usa tiempo_operacion_actual). Los ejercicios van como claves del
+        banco, así que el orden de la tabla se restaura exacto.
+        """
+        return self.instantanea_diferida(respuestas, tiempo_operacion)()
+
+    def instantanea_diferida(self, respuestas=None, tiempo_operacion=None):
+        """Como instantanea, pero retorna una función que arma el historial al llamarla
+
+        Aquí solo se copia la tabla en curso y los resultados (pocas filas).
+        El historial solo crece y sus filas no cambian, así que la función
+        puede llamarse después en otro hilo (ver EscritorDiferido): convierte
+        las filas que había al pedir la instantánea.
+        """
+        respuestas = respuestas or {}
+        resultados = self.resultados_operacion
+        datos = {
+            "version": VERSION_INSTANTANEA,
+            "nivel": self.nivel,
+            "nombre": self.nombre,
+            "curso": self.curso,
+            "fecha": self.fecha,
+            "semilla_base": self.semilla_base,
+            "operaciones_nivel": list(self.operaciones_nivel),
+            "operacion_actual": self.operacion_actual,
+            "tabla_actual": self.tabla_actual,
+            "tabla_max": self.tabla_max,
+            "limites_tablas": dict(self.limites_tablas),
+            "cantidad_examen_mixto": self.cantidad_examen_mixto,
+            "tiempo_operacion_actual": (self.tiempo_operacion_actual if tiempo_operacion is None
+                                        else tiempo_operacion),
+            "finalizado": self.finalizado,
+            "ejercicios": [clave_hecho(ej) for ej in self.ejercicios],
+            "respuestas": [respuestas.get(i, "") for i in range(len(self.ejercicios))],
+            "resultados": [
+                (resultados.codigos[i], resultados.tablas[i], resultados.correctas[i],
+                 resultados.incorrectas[i], resultados.totales[i], resultados.tiempos[i],
+                 resultados.penalizaciones[i])
+                for i in range(len(resultados))
+            ],
+        }
+        historial = self.historial_ejercicios
+        filas = len(historial)
+
+        def armar():
+            datos["historial"] = [
+                (*clave_hecho(fila.ejercicio_banco), fila.respuesta_usuario, fila.correcto, fila.latencia)
+                for fila in itertools.islice(historial, filas)
+            ]
+            return datos
+        return armar
+
+    def restaurar_instantanea(self, datos, indice_dominio=None, cola_repaso=None):
+        """Vuelve al estado de una instantánea; retorna las respuestas (posición -> texto)"""
+        if datos.get("version") != VERSION_INSTANTANEA:
+            raise ValueError("Versión de punto de control no compatible")
+        self.semilla_base = datos["semilla_base"]
+        self.seleccionar_nivel(datos["nivel"])
+        self.iniciar_estudiante(datos["nombre"], datos["curso"], datos["fecha"], indice_dominio, cola_repaso)
+        self.operaciones_nivel = list(datos["operaciones_nivel"])
+        self.operacion_actual = datos["operacion_actual"]
+        self.limites_tablas = dict(datos["limites_tablas"])
+        self.tabla_max = datos["tabla_max"]
+        self.tabla_actual = datos["tabla_actual"]
+        self.cantidad_examen_mixto = datos["cantidad_examen_mixto"]
+        if self.operacion_actual in (OPERACION_MIXTA, OPERACION_ADAPTATIVA):
+            self.pool_examen_mixto = obtener_pool(
+                plan_completo(OPERACIONES_POR_NIVEL.get(self.nivel, OPERACIONES_POR_NIVEL[3]),
+                              self.tabla_max, self.nivel)
+            )
+
+        self.resultados_operacion.cargar_filas(datos["resultados"])
+        self.historial_ejercicios = [
+            RegistroHistorial(ejercicio_de_clave((codigo, tabla, num)), respuesta, correcto, latencia)
+            for codigo, tabla, num, respuesta, correcto, latencia in datos["historial"]
+        ]
+        self._grupos_historial = {}
+        self._agrupar_historial(0, self.historial_ejercicios)
+
+        self.ejercicios = [ejercicio_de_clave(tuple(clave)) for clave in datos["ejercicios"]]
+        self.tiempo_operacion_actual = datos["tiempo_operacion_actual"]
+        self.tiempo_principal_operacion, self.tiempo_maximo_operacion = \
+            self.tiempos_operacion(self.operacion_actual)
+        self.finalizado = datos["finalizado"]
+        return {i: texto for i, texto in enumerate(datos["respuestas"]) if texto}
+
+
+# ==================== SIMULACIÓN ====================
+def simular_sesion(nivel, limites_tablas, responder, tiempo_por_tabla=0, semilla_base=None):
+    """Recorre un test completo sin interfaz y retorna la sesión terminada
+
+    limites_tablas: dict operación -> tabla máxima.
+    responder(ejercicio) -> texto escrito por el estudiante simulado.
+    """
+    sesion = SesionAgilidad(semilla_base)
+    sesion.seleccionar_nivel(nivel)
+    sesion.iniciar_estudiante("Simulación", "", sesion.fecha)
+
+    for operacion in sesion.operaciones_nivel:
+        sesion.continuar_siguiente_operacion(operacion)
+        sesion.fijar_limite_tabla(limites_tablas[operacion])
+        while True:
+            sesion.preparar_tabla()
+            sesion.iniciar_tabla()
+            sesion.tiempo_operacion_actual += tiempo_por_tabla
+            respuestas = {i: responder(ej) for i, ej in enumerate(sesion.ejercicios)}
+            sesion.finalizar_tabla(respuestas)
+            if not sesion.avanzar_tabla():
+                break
+    return sesion
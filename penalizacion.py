@@ -0,0 +1,163 @@
+"""Nota y penalización por tiempo extra: reglas en tabla y recalificación por lotes
+
+Las reglas se revisan en orden y gana la primera que coincide con el nivel y
+la operación. Al crear la política se compilan en una grilla nivel × código
+de operación, así que penalizar una tabla es una consulta O(1) y recalificar
+miles de sesiones es una sola operación de NumPy sobre sus columnas.
+"""
+import json
+import math
+
+from ejercicios import CODIGOS_OPERACIONES, OPERACIONES, ConfigEjercicios
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class ReglaPenalizacion:
+    """Una fila de la tabla: a qué niveles/operaciones aplica y cuánto penaliza
+
+    niveles u operaciones en None significan "todos".
+    """
+
+    __slots__ = ("niveles", "operaciones", "tiempo_principal", "puntos_por_minuto", "maximo")
+
+    def __init__(self, niveles, operaciones, tiempo_principal, puntos_por_minuto, maximo):
+        self.niveles = None if niveles is None else tuple(niveles)
+        self.operaciones = None if operaciones is None else tuple(operaciones)
+        self.tiempo_principal = tiempo_principal
+        self.puntos_por_minuto = puntos_por_minuto
+        self.maximo = maximo
+
+    def aplica(self, nivel, operacion):
+        return ((self.niveles is None or nivel in self.niveles)
+                and (self.operaciones is None or operacion in self.operaciones))
+
+
+# Reglas vigentes (antes fijas en calcular_nota_final)
+REGLAS_POR_DEFECTO = (
+    # Potenciación y radicación: tiempo especial y máximo de 2 puntos (2 minutos extra)
+    ReglaPenalizacion(None, ("potencia", "raiz"), ConfigEjercicios.POTENCIA_RAIZ_TIEMPO_PRINCIPAL,
+                      ConfigEjercicios.PENALIZACION_POR_MINUTO, 2),
+    ReglaPenalizacion((1,), None, ConfigEjercicios.NIVEL_1_TIEMPO_PRINCIPAL,
+                      ConfigEjercicios.PENALIZACION_POR_MINUTO, ConfigEjercicios.PENALIZACION_MAXIMA),
+    # Nivel 2 y 3
+    ReglaPenalizacion(None, None, ConfigEjercicios.NIVEL_2_TIEMPO_PRINCIPAL,
+                      ConfigEjercicios.PENALIZACION_POR_MINUTO, ConfigEjercicios.PENALIZACION_MAXIMA),
+)
+
+
+class PoliticaPenalizacion:
+    """Tabla de reglas compilada en una grilla (nivel, código de operación) -> regla"""
+
+    def __init__(self, reglas=REGLAS_POR_DEFECTO):
+        self.reglas = tuple(reglas)
+        niveles = {n for r in self.reglas if r.niveles for n in r.niveles}
+        self.nivel_maximo = max(niveles | {3})
+        # Fila 0: niveles desconocidos (None); las demás, nivel 1..nivel_maximo
+        self._grilla = tuple(
+            tuple(self._buscar(nivel or None, op) for op in OPERACIONES)
+            for nivel in range(self.nivel_maximo + 1)
+        )
+        self._columnas = None
+
+    def _buscar(self, nivel, operacion):
+        for regla in self.reglas:
+            if regla.aplica(nivel, operacion):
+                return regla
+        return None
+
+    def _regla(self, nivel, operacion):
+        fila = nivel if isinstance(nivel, int) and 0 < nivel <= self.nivel_maximo else 0
+        return self._grilla[fila][CODIGOS_OPERACIONES[operacion]]
+
+    def penalizacion(self, nivel, operacion, tiempo_operacion):
+        """Puntos de penalización de una tabla según el tiempo usado en su operación"""
+        regla = self._regla(nivel, operacion)
+        if regla is None or tiempo_operacion <= regla.tiempo_principal:
+            return 0
+        # Minutos extra redondeando hacia arriba, con el máximo de la regla
+        minutos_extra = math.ceil((tiempo_operacion - regla.tiempo_principal) / 60)
+        return min(minutos_extra * regla.puntos_por_minuto, regla.maximo)
+
+    def penalizaciones(self, niveles, codigos, tiempos):
+        """Versión vectorizada de penalizacion (arreglos de igual largo)"""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Para recalificar por lotes instala: pip install numpy")
+        if self._columnas is None:
+            # Parámetros de la grilla como arreglos (nivel, código); sin regla no penaliza
+            forma = (self.nivel_maximo + 1, len(OPERACIONES))
+            principal = np.full(forma, np.inf)
+            por_minuto = np.zeros(forma)
+            maximo = np.zeros(forma)
+            for n, fila in enumerate(self._grilla):
+                for c, regla in enumerate(fila):
+                    if regla is not None:
+                        principal[n, c] = regla.tiempo_principal
+                        por_minuto[n, c] = regla.puntos_por_minuto
+                        maximo[n, c] = regla.maximo
+            self._columnas = (principal, por_minuto, maximo)
+
+        principal, por_minuto, maximo = self._columnas
+        niveles = np.asarray(niveles, dtype=np.int64)
+        niveles = np.where((niveles > 0) & (niveles <= self.nivel_maximo), niveles, 0)
+        codigos = np.asarray(codigos, dtype=np.int64)
+        extra = np.asarray(tiempos, dtype=np.float64) - principal[niveles, codigos]
+        minutos = np.ceil(np.maximum(extra, 0) / 60)
+        return np.minimum(minutos * por_minuto[niveles, codigos], maximo[niveles, codigos])
+
+    @classmethod
+    def desde_json(cls, ruta):
+        """Carga reglas [{"niveles", "operaciones", "tiempo_principal", "puntos_por_minuto", "maximo"}]"""
+        with open(ruta, encoding="utf-8") as f:
+            datos = json.load(f)
+        return cls(ReglaPenalizacion(d.get("niveles"), d.get("operaciones"), d["tiempo_principal"],
+                                     d.get("puntos_por_minuto", ConfigEjercicios.PENALIZACION_POR_MINUTO),
+                                     d["maximo"])
+                   for d in datos)
+
+
+POLITICA_POR_DEFECTO = PoliticaPenalizacion()
+
+
+def calcular_nota(correctas, preguntas, penalizacion):
+    """Retorna (nota final sobre 100, penalización redondeada)"""
+    nota_base = (correctas / preguntas) * 100 if preguntas > 0 else 0
+    nota_final = max(round(nota_base - penalizacion, 1), 0)
+    penalizacion = round(penalizacion, 1)
+    # Puntos enteros se muestran sin decimales ("-3 punto(s)")
+    return nota_final, int(penalizacion) if penalizacion == int(penalizacion) else penalizacion
+
+
+def recalificar(almacenes, niveles, politica=POLITICA_POR_DEFECTO):
+    """Recalcula penalización y nota de muchas sesiones guardadas con otra política
+
+    almacenes: AlmacenResultados de cada sesión; niveles: nivel de cada una.
+    Retorna (notas, penalizaciones) en el orden recibido. Las columnas de
+    todas las sesiones se concatenan sin copiar fila por fila y se penalizan
+    de una vez.
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("Para recalificar por lotes instala: pip install numpy")
+    if not almacenes:
+        return [], []
+
+    largos = np.array([len(a.codigos) for a in almacenes], dtype=np.int64)
+    codigos = np.concatenate([np.frombuffer(a.codigos, dtype=np.int8) for a in almacenes])
+    tiempos = np.concatenate([np.frombuffer(a.tiempos, dtype=np.float64) for a in almacenes])
+    sesion_de_fila = np.repeat(np.arange(len(almacenes)), largos)
+    niveles_fila = np.asarray(niveles, dtype=np.int64)[sesion_de_fila]
+
+    por_fila = politica.penalizaciones(niveles_fila, codigos, tiempos)
+    penalizaciones = np.bincount(sesion_de_fila, weights=por_fila, minlength=len(almacenes))
+
+    notas = []
+    penalizaciones_redondeadas = []
+    for almacen, penalizacion in zip(almacenes, penalizaciones.tolist()):
+        nota, penalizacion = calcular_nota(almacen.correctas_total, almacen.preguntas_total, penalizacion)
+        notas.append(nota)
+        penalizaciones_redondeadas.append(penalizacion)
+    return notas, penalizaciones_redondeadas
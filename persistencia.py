@@ -0,0 +1,108 @@
+"""Ubicación y escritura segura de los datos que el aplicativo guarda en disco"""
+import os
+import threading
+from datetime import datetime
+
+from ejercicios import derivar_semilla
+
+# Tests terminados, guardados como instantáneas para recalificarlos después
+SUBDIRECTORIO_TERMINADAS = os.path.join("sesiones", "terminadas")
+
+
+def directorio_datos(subdirectorio=""):
+    """Retorna (y crea) la carpeta de datos del usuario
+
+    En Windows usa %APPDATA%; en otros sistemas ~/.agilidad_rmmath. La variable
+    AGILIDAD_RMMATH_DATOS permite cambiarla (pruebas, equipos compartidos).
+    """
+    base = os.environ.get("AGILIDAD_RMMATH_DATOS")
+    if not base:
+        if os.environ.get("APPDATA"):
+            base = os.path.join(os.environ["APPDATA"], "Agilidad RMmath")
+        else:
+            base = os.path.join(os.path.expanduser("~"), ".agilidad_rmmath")
+    ruta = os.path.join(base, subdirectorio)
+    os.makedirs(ruta, exist_ok=True)
+    return ruta
+
+
+def archivo_estudiante(subdirectorio, nombre, curso, extension):
+    """Ruta del archivo de un estudiante (nombre estable, sin caracteres inválidos)"""
+    return os.path.join(directorio_datos(subdirectorio),
+                        f"{derivar_semilla(nombre, curso):016x}{extension}")
+
+
+def archivo_sesion_terminada(nombre, curso):
+    """Ruta nueva donde archivar un test terminado (una por test, ver recalificar.py)"""
+    sello = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return os.path.join(directorio_datos(SUBDIRECTORIO_TERMINADAS),
+                        f"{sello}_{derivar_semilla(nombre, curso):016x}.json")
+
+
+def escribir_atomico(ruta, contenido):
+    """Escribe un archivo completo sin dejarlo nunca a medias (temporal + reemplazo)"""
+    temporal = f"{ruta}.tmp"
+    if isinstance(contenido, bytes):
+        archivo = open(temporal, "wb")
+    else:
+        archivo = open(temporal, "w", encoding="utf-8")
+    with archivo as f:
+        f.write(contenido)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+
+
+class EscritorDiferido:
+    """Escribe archivos en un hilo aparte, juntando los pedidos que se acumulan
+
+    programar() solo deja el contenido pendiente y retorna enseguida, así que
+    puede llamarse desde el hilo de Tk. Si llegan varios pedidos para la misma
+    ruta mientras el hilo escribe, solo se escribe el último (los anteriores
+    ya están obsoletos). Cada escritura es atómica (ver escribir_atomico).
+    """
+
+    def __init__(self):
+        self._pendientes = {}  # ruta -> generar() del contenido, o None para borrar
+        self._condicion = threading.Condition()
+        self._escribiendo = False
+        self._hilo = None
+
+    def programar(self, ruta, generar):
+        """Pide escribir en ruta el texto que retorne generar() (se llama en el hilo)"""
+        with self._condicion:
+            self._pendientes[ruta] = generar
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._trabajar, name="EscritorDiferido", daemon=True)
+                self._hilo.start()
+            self._condicion.notify()
+
+    def borrar(self, ruta):
+        """Pide borrar ruta después de las escrituras ya pedidas"""
+        self.programar(ruta, None)
+
+    def esperar(self, tiempo_maximo=None):
+        """Bloquea hasta que no queden escrituras pendientes (p. ej. al cerrar)"""
+        with self._condicion:
+            return self._condicion.wait_for(lambda: not self._pendientes and not self._escribiendo,
+                                            tiempo_maximo)
+
+    def _trabajar(self):
+        while True:
+            with self._condicion:
+                self._condicion.wait_for(lambda: self._pendientes)
+                ruta, generar = next(iter(self._pendientes.items()))
+                del self._pendientes[ruta]
+                self._escribiendo = True
+            try:
+                if generar is None:
+                    if os.path.exists(ruta):
+                        os.remove(ruta)
+                else:
+                    escribir_atomico(ruta, generar())
+            except (OSError, ValueError, TypeError):
+                pass  # Un archivo que no se pudo escribir se repone con el próximo pedido
+            finally:
+                with self._condicion:
+                    self._escribiendo = False
+                    self._condicion.notify_all()
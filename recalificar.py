@@ -0,0 +1,100 @@
+"""Recalifica los tests terminados con otra política de penalización (requiere NumPy)
+
+Uso: python recalificar.py [sesion.json ...] [--politica reglas.json] [--salida notas.csv]
+
+Sin archivos se leen todos los tests que el aplicativo archivó al terminar
+(carpeta sesiones/terminadas de los datos). Cada archivo es una instantánea
+JSON (ver SesionAgilidad.instantanea); de ella solo se usan el nivel y los
+resultados por tabla, y todas las sesiones se penalizan juntas con
+penalizacion.recalificar. La salida tiene la nota guardada y la nueva.
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+
+from motor_sesion import VERSION_INSTANTANEA, AlmacenResultados
+from penalizacion import (
+    NUMPY_AVAILABLE,
+    POLITICA_POR_DEFECTO,
+    PoliticaPenalizacion,
+    calcular_nota,
+    recalificar,
+)
+from persistencia import SUBDIRECTORIO_TERMINADAS, directorio_datos
+
+ENCABEZADO_SALIDA = ["archivo", "nombre", "curso", "fecha", "nivel", "penalizacion_anterior",
+                     "nota_anterior", "penalizacion", "nota"]
+
+
+def cargar_sesiones(rutas, omitidas=None):
+    """Lee las instantáneas; retorna ([(ruta, datos)], almacenes, niveles) de las legibles
+
+    omitidas: lista donde anotar (ruta, motivo) de los archivos ilegibles.
+    """
+    sesiones, almacenes, niveles = [], [], []
+    for ruta in rutas:
+        try:
+            with open(ruta, encoding="utf-8") as f:
+                datos = json.load(f)
+            if datos.get("version") != VERSION_INSTANTANEA:
+                raise ValueError("versión no compatible")
+            almacen = AlmacenResultados()
+            almacen.cargar_filas(datos["resultados"])
+            nivel = int(datos["nivel"])
+        except (OSError, ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            if omitidas is not None:
+                omitidas.append((ruta, e))
+            continue
+        sesiones.append((ruta, datos))
+        almacenes.append(almacen)
+        niveles.append(nivel)
+    return sesiones, almacenes, niveles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sesiones", nargs="*",
+                        help="instantáneas JSON (por defecto, los tests archivados)")
+    parser.add_argument("--politica", default=None,
+                        help="JSON con reglas de penalización (por defecto, las vigentes)")
+    parser.add_argument("--salida", default="-", help="CSV de notas (por defecto, la consola)")
+    args = parser.parse_args()
+    if not NUMPY_AVAILABLE:
+        parser.error("Para recalificar por lotes instala: pip install numpy")
+    politica = PoliticaPenalizacion.desde_json(args.politica) if args.politica else POLITICA_POR_DEFECTO
+    rutas = args.sesiones or sorted(
+        glob.glob(os.path.join(directorio_datos(SUBDIRECTORIO_TERMINADAS), "*.json"))
+    )
+
+    inicio = time.perf_counter()
+    omitidas = []
+    sesiones, almacenes, niveles = cargar_sesiones(rutas, omitidas)
+    notas, penalizaciones = recalificar(almacenes, niveles, politica)
+
+    salida = sys.stdout if args.salida == "-" else open(args.salida, "w", newline="", encoding="utf-8")
+    try:
+        escritor = csv.writer(salida)
+        escritor.writerow(ENCABEZADO_SALIDA)
+        for (ruta, datos), almacen, nivel, nota, penalizacion in zip(
+                sesiones, almacenes, niveles, notas, penalizaciones):
+            nota_anterior, penalizacion_anterior = calcular_nota(
+                almacen.correctas_total, almacen.preguntas_total, almacen.penalizacion_total
+            )
+            escritor.writerow([os.path.basename(ruta), datos.get("nombre", ""), datos.get("curso", ""),
+                               datos.get("fecha", ""), nivel, penalizacion_anterior, nota_anterior,
+                               penalizacion, nota])
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+    segundos = time.perf_counter() - inicio
+    for ruta, motivo in omitidas:
+        print(f"{ruta}: archivo omitido, {motivo}", file=sys.stderr)
+    print(f"{len(almacenes)} sesiones recalificadas en {segundos:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
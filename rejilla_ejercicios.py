@@ -0,0 +1,302 @@
+"""Rejilla de ejercicios dibujada en un solo Canvas (renderizador liviano para equipos lentos)
+
+Las filas, sus colores y los exponentes de potencia son ítems de un
+tk.Canvas creados una vez por fila y reconfigurados en cada tabla. Solo hay
+entries reales para las filas visibles (más un margen): al desplazarse se
+mueven a las filas nuevas y el texto de las que salen queda guardado.
+Desplazar o redimensionar mueve ítems del mismo Canvas, que Tk redibuja una
+sola vez.
+"""
+import tkinter as tk
+from tkinter import font as tkfont
+
+import customtkinter as ctk
+
+ALTO_FILA = 77  # 65 de la fila + 6 arriba y abajo
+ALTO_RECUADRO = 65
+ALTO_ENTRY = 50
+ANCHO_TEXTO = 250  # Ancho de la columna del ejercicio (alineado a la derecha)
+SEPARACION = 20
+RADIO = 15
+MARGEN_FILAS = 1  # Filas con entry fuera de la vista, arriba y abajo
+
+
+def _puntos_redondeados(x0, y0, x1, y1, r):
+    """Polígono (con smooth=True) de un rectángulo de esquinas redondeadas"""
+    return (x0 + r, y0, x1 - r, y0, x1, y0, x1, y0 + r, x1, y1 - r, x1, y1,
+            x1 - r, y1, x0 + r, y1, x0, y1, x0, y1 - r, x0, y0 + r, x0, y0)
+
+
+class _ItemsFila:
+    """Ítems del Canvas de una fila (se crean una vez y se reutilizan)"""
+
+    __slots__ = ("recuadro", "texto", "base", "exponente", "igual")
+
+    def __init__(self, recuadro, texto, base, exponente, igual):
+        self.recuadro = recuadro
+        self.texto = texto
+        self.base = base
+        self.exponente = exponente
+        self.igual = igual
+
+
+class RejillaEjercicios(tk.Frame):
+    """Lista de ejercicios en un Canvas con un grupo pequeño de entries reciclados
+
+    vcmd: validatecommand compartido (recibe %P y %W); posicion_entry: dict
+    ruta Tk del entry -> posición, que la rejilla mantiene al reciclar.
+    al_enfocar(posición) y al_tab(posición) se llaman desde los entries.
+    """
+
+    def __init__(self, parent, vcmd, posicion_entry, al_enfocar, al_tab, fondo="white"):
+        super().__init__(parent, bg=fondo)
+        self.canvas = tk.Canvas(self, bg=fondo, highlightthickness=0, yscrollincrement=1)
+        self.barra = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._al_desplazar)
+        self.barra.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self._vcmd = vcmd
+        self._posicion_entry = posicion_entry
+        self._al_enfocar = al_enfocar
+        self._al_tab = al_tab
+        self._fuente = tkfont.Font(family="Comic Sans MS", size=24, weight="bold")
+        self._fuente_exponente = tkfont.Font(family="Comic Sans MS", size=14, weight="bold")
+
+        self._items = []  # _ItemsFila por fila creada
+        self._entries = []  # [(entry, id de ventana en el Canvas)]
+        self._asignadas = {}  # posición -> índice en _entries
+        self._posicion_de = {}  # índice en _entries -> posición
+        self.ejercicios = []
+        self.textos = []  # Texto de cada posición sin entry asignado
+        self._colores = ("white", "white")
+        self._ancho_entry = 150
+        self._ancho = 0
+        self._habilitado = False
+
+        self.canvas.bind("<Configure>", self._al_redimensionar)
+        self._enlazar_rueda(self.canvas)
+
+    # ==================== CONTENIDO ====================
+    def mostrar(self, ejercicios, colores, ancho_entry):
+        """Pone una tabla nueva: textos y colores en los ítems existentes, respuestas vacías"""
+        self.ejercicios = ejercicios
+        self.textos = [""] * len(ejercicios)
+        self._colores = colores
+        self._ancho_entry = ancho_entry
+        self._habilitado = False
+
+        for indice in list(self._posicion_de):
+            self._liberar(indice, guardar=False)
+        while len(self._items) < len(ejercicios):
+            self._crear_items()
+        for i, items in enumerate(self._items):
+            if i < len(ejercicios):
+                self._configurar_items(i, items, ejercicios[i])
+            else:
+                for item in (items.recuadro, items.texto, items.base, items.exponente, items.igual):
+                    self.canvas.itemconfigure(item, state="hidden")
+        for entry, ventana in self._entries:
+            entry.configure(state="normal", validate="none")
+            entry.delete(0, "end")
+            entry.configure(validate="key", state="disabled")
+            self.canvas.itemconfigure(ventana, width=ancho_entry)
+
+        self.canvas.configure(scrollregion=(0, 0, 0, len(ejercicios) * ALTO_FILA + 6))
+        self.canvas.yview_moveto(0)
+        self._ubicar_todo()
+
+    def _crear_items(self):
+        c = self.canvas
+        self._items.append(_ItemsFila(
+            c.create_polygon(0, 0, 0, 0, smooth=True, outline=""),
+            c.create_text(0, 0, anchor="e", font=self._fuente, fill="black"),
+            c.create_text(0, 0, anchor="e", font=self._fuente, fill="black"),
+            c.create_text(0, 0, anchor="sw", font=self._fuente_exponente, fill="black"),
+            c.create_text(0, 0, anchor="e", font=self._fuente, fill="black", text=" ="),
+        ))
+
+    def _configurar_items(self, i, items, ejercicio):
+        c = self.canvas
+        c.itemconfigure(items.recuadro, fill=self._colores[i % 2], state="normal")
+        if ejercicio.operacion == "potencia":
+            # Potencia con el exponente pequeño y arriba
+            c.itemconfigure(items.texto, state="hidden")
+            c.itemconfigure(items.base, text=str(ejercicio.num), state="normal")
+            c.itemconfigure(items.exponente, text=str(ejercicio.tabla), state="normal")
+            c.itemconfigure(items.igual, state="normal")
+        else:
+            c.itemconfigure(items.texto, text=ejercicio.texto, state="normal")
+            for item in (items.base, items.exponente, items.igual):
+                c.itemconfigure(item, state="hidden")
+
+    def _izquierda(self):
+        """x donde empieza el bloque ejercicio + entry, centrado en el ancho visible"""
+        return (self._ancho - (ANCHO_TEXTO + SEPARACION + self._ancho_entry)) / 2
+
+    def _ubicar_todo(self):
+        """Coloca todas las filas de la tabla (al cambiar de tabla)"""
+        izquierda = self._izquierda()
+        for i in range(len(self.ejercicios)):
+            self._ubicar_fila(i, izquierda)
+        self._reubicar_entries()
+
+    def _ubicar_fila(self, i, izquierda):
+        c = self.canvas
+        items = self._items[i]
+        y0 = i * ALTO_FILA + 6
+        centro = y0 + ALTO_RECUADRO / 2
+        c.coords(items.recuadro, *_puntos_redondeados(5, y0, max(self._ancho - 5, 10), y0 + ALTO_RECUADRO, RADIO))
+        derecha = izquierda + ANCHO_TEXTO
+        c.coords(items.texto, derecha, centro)
+        if self.ejercicios[i].operacion == "potencia":
+            x_igual = derecha - self._fuente.measure(" =")
+            x_exponente = x_igual - self._fuente_exponente.measure(c.itemcget(items.exponente, "text"))
+            c.coords(items.igual, derecha, centro)
+            c.coords(items.exponente, x_exponente, centro)
+            c.coords(items.base, x_exponente, centro)
+
+    def _al_redimensionar(self, event):
+        if event.width == self._ancho:
+            return
+        dx = (event.width - self._ancho) / 2
+        self._ancho = event.width
+        # Los textos y entries solo se desplazan; los recuadros cambian de ancho
+        for items in self._items[:len(self.ejercicios)]:
+            for item in (items.texto, items.base, items.exponente, items.igual):
+                self.canvas.move(item, dx, 0)
+        for entry, ventana in self._entries:
+            self.canvas.move(ventana, dx, 0)
+        for i, items in enumerate(self._items[:len(self.ejercicios)]):
+            y0 = i * ALTO_FILA + 6
+            self.canvas.coords(items.recuadro, *_puntos_redondeados(
+                5, y0, max(self._ancho - 5, 10), y0 + ALTO_RECUADRO, RADIO))
+        self._reubicar_entries()
+
+    # ==================== ENTRIES RECICLADOS ====================
+    def _al_desplazar(self, primero, ultimo):
+        self.barra.set(primero, ultimo)
+        self._reubicar_entries()
+
+    def _rango_visible(self):
+        arriba = self.canvas.canvasy(0)
+        abajo = self.canvas.canvasy(self.canvas.winfo_height())
+        desde = max(0, int(arriba // ALTO_FILA) - MARGEN_FILAS)
+        hasta = min(len(self.ejercicios), int(abajo // ALTO_FILA) + 1 + MARGEN_FILAS)
+        return range(desde, hasta)
+
+    def _reubicar_entries(self):
+        """Da un entry a cada fila visible; los de filas que salieron de la vista se liberan"""
+        visibles = self._rango_visible()
+        enfocado = self.focus_get()
+        for posicion, indice in list(self._asignadas.items()):
+            if posicion not in visibles and self._entries[indice][0] is not enfocado:
+                self._liberar(indice)
+
+        libres = [i for i in range(len(self._entries)) if i not in self._posicion_de]
+        for posicion in visibles:
+            if posicion in self._asignadas:
+                continue
+            indice = libres.pop() if libres else self._crear_entry()
+            self._asignar(indice, posicion)
+
+    def _crear_entry(self):
+        entry = tk.Entry(
+            self.canvas,
+            font=self._fuente,
+            justify="center",
+            relief="flat",
+            highlightthickness=3,
+            highlightbackground="white",
+            highlightcolor="white",
+            fg="black",
+            disabledforeground="black",
+            state="disabled",
+            validate="key",
+            validatecommand=self._vcmd
+        )
+        indice = len(self._entries)
+        ventana = self.canvas.create_window(0, 0, window=entry, anchor="w", state="hidden",
+                                            width=self._ancho_entry, height=ALTO_ENTRY)
+        self._entries.append((entry, ventana))
+        entry.bind("<FocusIn>", lambda e, i=indice: self._al_enfocar(self._posicion_de.get(i)))
+        entry.bind("<Tab>", lambda e, i=indice: self._al_tab(self._posicion_de.get(i)))
+        self._enlazar_rueda(entry)
+        return indice
+
+    def _asignar(self, indice, posicion):
+        entry, ventana = self._entries[indice]
+        color = self._colores[posicion % 2]
+        # Cargar el texto guardado sin pasar por validatecommand (no es una tecla)
+        entry.configure(state="normal", validate="none", bg=color, disabledbackground=color)
+        entry.delete(0, "end")
+        entry.insert(0, self.textos[posicion])
+        entry.configure(validate="key", state="normal" if self._habilitado else "disabled")
+
+        y = posicion * ALTO_FILA + 6 + ALTO_RECUADRO / 2
+        self.canvas.coords(ventana, self._izquierda() + ANCHO_TEXTO + SEPARACION, y)
+        self.canvas.itemconfigure(ventana, state="normal")
+        self._asignadas[posicion] = indice
+        self._posicion_de[indice] = posicion
+        self._posicion_entry[str(entry)] = posicion
+
+    def _liberar(self, indice, guardar=True):
+        entry, ventana = self._entries[indice]
+        posicion = self._posicion_de.pop(indice)
+        del self._asignadas[posicion]
+        self._posicion_entry.pop(str(entry), None)
+        if guardar:
+            self.textos[posicion] = entry.get()
+        self.canvas.itemconfigure(ventana, state="hidden")
+
+    # ==================== ACCESO ====================
+    def habilitar(self, habilitado):
+        """Habilita o deshabilita la escritura en todas las respuestas"""
+        self._habilitado = habilitado
+        for indice in self._posicion_de:
+            self._entries[indice][0].configure(state="normal" if habilitado else "disabled")
+
+    def respuestas(self):
+        """Retorna posición -> texto de toda la tabla (con o sin entry asignado)"""
+        resultado = dict(enumerate(self.textos))
+        for posicion, indice in self._asignadas.items():
+            resultado[posicion] = self._entries[indice][0].get()
+        return resultado
+
+    def escribir(self, posicion, texto):
+        """Pone el texto de una respuesta (p. ej. al reanudar un test)"""
+        self.textos[posicion] = texto
+        indice = self._asignadas.get(posicion)
+        if indice is not None:
+            entry = self._entries[indice][0]
+            estado = entry.cget("state")
+            entry.configure(state="normal")
+            entry.delete(0, "end")
+            entry.insert(0, texto)
+            entry.configure(state=estado)
+
+    def enfocar(self, posicion):
+        """Muestra la fila y pone el foco en su entry"""
+        if not 0 <= posicion < len(self.ejercicios):
+            return None
+        arriba = self.canvas.canvasy(0)
+        alto = self.canvas.winfo_height()
+        y0 = posicion * ALTO_FILA
+        if y0 < arriba or y0 + ALTO_FILA > arriba + alto:
+            total = len(self.ejercicios) * ALTO_FILA + 6
+            self.canvas.yview_moveto(max(0, y0 - (alto - ALTO_FILA) / 2) / total)
+            self._reubicar_entries()
+        entry = self._entries[self._asignadas[posicion]][0]
+        entry.focus_set()
+        entry.select_range(0, "end")
+        return entry
+
+    # ==================== RUEDA DEL MOUSE ====================
+    def _enlazar_rueda(self, widget):
+        widget.bind("<MouseWheel>", self._al_girar_rueda)
+        widget.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-ALTO_FILA, "units"))
+        widget.bind("<Button-5>", lambda e: self.canvas.yview_scroll(ALTO_FILA, "units"))
+
+    def _al_girar_rueda(self, event):
+        pasos = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(pasos * ALTO_FILA, "units")
@@ -0,0 +1,61 @@
+"""Construcción de pantallas por partes, sin congelar la ventana"""
+import time
+from collections import deque
+
+
+class RenderProgresivo:
+    """Ejecuta pasos de construcción en tandas que no pasan de `presupuesto_ms`
+
+    La primera tanda corre en after_idle y las siguientes en after(0): entre
+    una y otra Tk pinta lo que ya existe y atiende clics y teclas. Lo primero
+    de la pantalla (encabezado, acción principal) se construye antes de
+    llamar a programar(), que encola el resto. cancelar() descarta lo
+    pendiente al navegar a otra pantalla; completar() lo ejecuta de una vez
+    cuando algo necesita la pantalla entera (p. ej. habilitar los entries).
+    """
+
+    def __init__(self, root, presupuesto_ms=12, reloj=time.perf_counter):
+        self.root = root
+        self.presupuesto = presupuesto_ms / 1000
+        self._reloj = reloj
+        self._pasos = deque()  # Funciones sin argumentos, en orden
+        self._tanda = None  # id del after de la próxima tanda
+
+    @property
+    def pendiente(self):
+        return bool(self._pasos)
+
+    def programar(self, pasos):
+        """Encola pasos para las próximas tandas"""
+        self._pasos.extend(pasos)
+        if self._pasos and self._tanda is None:
+            self._tanda = self.root.after_idle(self._ejecutar_tanda)
+
+    def _ejecutar_tanda(self):
+        self._tanda = None
+        limite = self._reloj() + self.presupuesto
+        try:
+            # Al menos un paso por tanda, aunque solo ese ya pase del presupuesto
+            while self._pasos:
+                self._pasos.popleft()()
+                if self._reloj() >= limite:
+                    break
+        finally:
+            # Si un paso falla, el resto de la pantalla se sigue construyendo
+            if self._pasos and self._tanda is None:
+                self._tanda = self.root.after(0, self._ejecutar_tanda)
+
+    def cancelar(self):
+        """Descarta los pasos pendientes (la pantalla que los pidió ya no está)"""
+        self._pasos.clear()
+        if self._tanda is not None:
+            self.root.after_cancel(self._tanda)
+            self._tanda = None
+
+    def completar(self):
+        """Ejecuta ya todos los pasos pendientes"""
+        if self._tanda is not None:
+            self.root.after_cancel(self._tanda)
+            self._tanda = None
+        while self._pasos:
+            self._pasos.popleft()()
@@ -0,0 +1,129 @@
+"""Repaso espaciado: cola de hechos fallados por estudiante, guardada entre sesiones"""
+import heapq
+import os
+import time
+
+from dominio import clave_hecho, ejercicio_de_clave
+from persistencia import archivo_estudiante, escribir_atomico
+
+# Días hasta el próximo repaso según la caja (Leitner). Un error vuelve a la
+# caja 0 (repasar ya); acertar en la última caja saca el hecho de la cola.
+INTERVALOS_REPASO_DIAS = (0, 1, 3, 7, 16, 35)
+SEGUNDOS_POR_DIA = 24 * 60 * 60
+CAJA_DOMINADO = -1  # Marca en el archivo: el hecho salió de la cola
+
+
+class ColaRepaso:
+    """Heap (vence, hecho) de un estudiante con un registro solo de anexos
+
+    El archivo es un registro de cambios "código,tabla,num,caja,vence": cargarlo
+    reproduce las líneas (la última de cada hecho gana) y guardar solo anexa
+    los cambios pendientes. Cuando las líneas viejas superan a las vigentes el
+    archivo se reescribe compacto de forma atómica.
+    """
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta
+        self.cajas = {}  # clave -> (caja, vence)
+        self._heap = []
+        self._pendientes = []
+        self._lineas = 0
+        self._linea_cortada = False
+
+    def __len__(self):
+        return len(self.cajas)
+
+    @classmethod
+    def de_estudiante(cls, nombre, curso):
+        """Carga la cola guardada del estudiante (vacía si aún no tiene)"""
+        cola = cls(archivo_estudiante("repaso", nombre, curso, ".log"))
+        cola.cargar()
+        return cola
+
+    def cargar(self):
+        """Lee el registro del disco y arma el heap en O(n)"""
+        if not self.ruta or not os.path.exists(self.ruta):
+            return
+        with open(self.ruta, encoding="utf-8") as f:
+            for linea in f:
+                partes = linea.split(",")
+                if not linea.endswith("\n") or len(partes) != 5:
+                    # Línea cortada por un cierre abrupto: se ignora
+                    self._linea_cortada = not linea.endswith("\n")
+                    continue
+                try:
+                    codigo, tabla, num, caja, vence = (int(p) for p in partes)
+                except ValueError:
+                    continue  # Línea dañada: se ignora igual que una cortada
+                self._lineas += 1
+                if caja == CAJA_DOMINADO:
+                    self.cajas.pop((codigo, tabla, num), None)
+                else:
+                    self.cajas[(codigo, tabla, num)] = (caja, vence)
+        self._heap = [(vence, clave) for clave, (_, vence) in self.cajas.items()]
+        heapq.heapify(self._heap)
+
+    def _programar(self, clave, caja, vence):
+        if caja == CAJA_DOMINADO:
+            self.cajas.pop(clave, None)
+        else:
+            self.cajas[clave] = (caja, vence)
+            heapq.heappush(self._heap, (vence, clave))
+        self._pendientes.append(f"{clave[0]},{clave[1]},{clave[2]},{caja},{vence}\n")
+
+    def registrar(self, ejercicio, correcto, ahora=None):
+        """Actualiza la cola con una respuesta: los errores entran, los aciertos avanzan"""
+        ahora = int(time.time() if ahora is None else ahora)
+        clave = clave_hecho(ejercicio)
+        if not correcto:
+            self._programar(clave, 0, ahora)
+        elif clave in self.cajas:
+            caja = self.cajas[clave][0] + 1
+            if caja >= len(INTERVALOS_REPASO_DIAS):
+                self._programar(clave, CAJA_DOMINADO, ahora)
+            else:
+                self._programar(clave, caja, ahora + INTERVALOS_REPASO_DIAS[caja] * SEGUNDOS_POR_DIA)
+
+    def cantidad_vencidos(self, ahora=None):
+        """Cuenta los hechos por repasar (recorre solo la parte vencida del heap)"""
+        return len(self.vencidos(None, ahora))
+
+    def vencidos(self, cantidad=None, ahora=None):
+        """Retorna hasta `cantidad` ejercicios vencidos, el más atrasado primero"""
+        ahora = time.time() if ahora is None else ahora
+        heap = self._heap
+        elegidos = []
+        apartados = []
+        vistos = set()
+        while heap and heap[0][0] <= ahora and (cantidad is None or len(elegidos) < cantidad):
+            vence, clave = heapq.heappop(heap)
+            actual = self.cajas.get(clave)
+            if actual is None or actual[1] != vence or clave in vistos:
+                continue  # Entrada obsoleta o repetida (el hecho se reprogramó o salió)
+            vistos.add(clave)
+            apartados.append((vence, clave))
+            elegidos.append(ejercicio_de_clave(clave))
+        for entrada in apartados:
+            heapq.heappush(heap, entrada)
+        return elegidos
+
+    def guardar(self):
+        """Anexa al archivo los cambios pendientes (o lo compacta si creció mucho)"""
+        if not self.ruta or not self._pendientes:
+            return
+        self._lineas += len(self._pendientes)
+        if self._lineas > 2 * len(self.cajas) + 256:
+            escribir_atomico(self.ruta, "".join(
+                f"{c[0]},{c[1]},{c[2]},{caja},{vence}\n" for c, (caja, vence) in self.cajas.items()
+            ))
+            self._lineas = len(self.cajas)
+        else:
+            with open(self.ruta, "a", encoding="utf-8") as f:
+                if self._linea_cortada:
+                    f.write("\n")
+                    self._linea_cortada = False
+                f.writelines(self._pendientes)
+        self._pendientes = []
+        if len(self._heap) > 2 * len(self.cajas) + 64:
+            self._heap = [(vence, clave) for clave, (_, vence) in self.cajas.items()]
+            heapq.heapify(self._heap)
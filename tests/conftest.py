@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def datos_temporales(tmp_path, monkeypatch):
+    """Cada prueba guarda colas, índices y puntos de control en su propia carpeta"""
+    monkeypatch.setenv("AGILIDAD_RMMATH_DATOS", str(tmp_path / "datos"))
+    return tmp_path / "datos"
@@ -0,0 +1,110 @@
+"""Calificación por lotes de hojas transcritas a CSV"""
+import csv
+import io
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import numpy as np  # noqa: E402
+
+from calificar_lote import _leer_respuestas, calificar_archivo  # noqa: E402
+from ejercicios import generar_ejercicios, normalizar_respuesta, semilla_tabla  # noqa: E402
+from motor_sesion import SesionAgilidad  # noqa: E402
+from penalizacion import calcular_nota  # noqa: E402
+
+ESTUDIANTE = ("Ana Pérez", "Quinto", "01/03/2026")
+
+
+def _fila_hoja(operacion, tabla, tiempo, errores=0, nivel=2, estudiante=ESTUDIANTE):
+    """Fila del CSV con las respuestas correctas de la hoja y `errores` respuestas falladas"""
+    ejercicios = generar_ejercicios(operacion, tabla, semilla_tabla(*estudiante, operacion, tabla))
+    respuestas = [str(ej.respuesta) for ej in ejercicios]
+    for i in range(errores):
+        respuestas[i] = str(ejercicios[i].respuesta + 1)
+    return [*estudiante, str(nivel), operacion, str(tabla), str(tiempo), *respuestas]
+
+
+def _calificar(filas):
+    entrada = io.StringIO()
+    csv.writer(entrada).writerows(filas)
+    entrada.seek(0)
+    salida = io.StringIO()
+    omitidas = []
+    resultado = calificar_archivo(entrada, salida, omitidas=omitidas)
+    return resultado, list(csv.DictReader(io.StringIO(salida.getvalue()))), omitidas
+
+
+def test_nota_con_aciertos_y_penalizacion():
+    # Nivel 2: 10 min de tiempo principal; 11:30 acumulados son 2 minutos extra
+    filas = [
+        ["nombre", "curso", "fecha", "nivel", "operacion", "tabla", "tiempo"],
+        _fila_hoja("multiplicación", 2, 300, errores=3),
+        _fila_hoja("multiplicación", 3, 690),
+    ]
+    (hojas, estudiantes), salida, omitidas = _calificar(filas)
+
+    assert (hojas, estudiantes, omitidas) == (2, 1, [])
+    fila = salida[0]
+    assert fila["nombre"] == ESTUDIANTE[0]
+    assert (int(fila["correctas"]), int(fila["incorrectas"]), int(fila["preguntas"])) == (23, 3, 26)
+    assert float(fila["penalizacion"]) == 2
+    assert float(fila["nota"]) == calcular_nota(23, 26, 2)[0]
+
+
+def test_tiempo_y_penalizacion_como_en_el_aplicativo():
+    filas = [_fila_hoja("multiplicación", 2, 300), _fila_hoja("multiplicación", 3, 690),
+             _fila_hoja("división", 2, 200), _fila_hoja("división", 3, 640.5, errores=1)]
+    _, salida, _ = _calificar(filas)
+
+    sesion = SesionAgilidad()
+    sesion.seleccionar_nivel(2)
+    for fila in filas:
+        operacion, tabla, tiempo = fila[4], int(fila[5]), float(fila[6])
+        preguntas = len(fila) - 7
+        correctas = preguntas - (1 if tiempo == 640.5 else 0)
+        sesion.resultados_operacion.guardar(operacion, tabla, correctas, preguntas - correctas, preguntas,
+                                            tiempo, sesion.penalizacion_tabla(operacion, tiempo))
+    nota, tiempo_total, penalizacion = sesion.calcular_nota_final()
+    assert (float(salida[0]["tiempo"]), float(salida[0]["penalizacion"]), float(salida[0]["nota"])) == \
+        (tiempo_total, penalizacion, nota)
+
+
+def test_lectura_por_columnas_igual_a_normalizar_respuesta():
+    textos = [" 12", "+3", "-4", "007", "", "  ", "abc", "1_2", "١٢", "²", "+-5", "--5", "- 5",
+              "12.0", "99999999999999999999", "-0", "1 2"]
+    leidas = _leer_respuestas(np.array([textos], dtype=str))[0].tolist()
+    esperadas = [normalizar_respuesta(t) for t in textos]
+    assert [None if v == -(1 << 62) else v for v in leidas] == \
+        [v if v is not None and abs(v) < (1 << 62) else None for v in esperadas]
+
+
+def test_respuestas_vacias_o_no_numericas_son_incorrectas():
+    fila = _fila_hoja("suma", 4, 0)
+    fila[7], fila[8] = "", "abc"
+    _, salida, _ = _calificar([fila])
+    assert int(salida[0]["correctas"]) == len(fila) - 7 - 2
+
+
+def test_filas_invalidas_se_omiten_con_su_linea():
+    otro = ("Luis", "Quinto", "01/03/2026")
+    filas = [
+        _fila_hoja("suma", 2, 100),
+        [*ESTUDIANTE, "2", "sumas", "2", "100", "4"],
+        [*ESTUDIANTE, "2", "suma", "", "100", "4"],
+        [*ESTUDIANTE, "x", "suma", "2", "100", "4"],
+        [*ESTUDIANTE, "2", "suma", "3", "1:30", "4"],
+        [*ESTUDIANTE, "1", "raiz", "2", "100", "4"],
+        _fila_hoja("suma", 2, 100, estudiante=otro),
+    ]
+    (hojas, estudiantes), salida, omitidas = _calificar(filas)
+
+    assert (hojas, estudiantes) == (2, 2)
+    assert [linea for linea, _ in omitidas] == [2, 3, 4, 5, 6]
+    assert "sumas" in omitidas[0][1]
+    assert "tabla" in omitidas[1][1]
+    assert "nivel" in omitidas[2][1]
+    assert "tiempo" in omitidas[3][1]
+    assert "nivel 1" in omitidas[4][1]
+    assert [f["nombre"] for f in salida] == [ESTUDIANTE[0], "Luis"]
+    assert all(int(f["incorrectas"]) == 0 for f in salida)
@@ -0,0 +1,85 @@
+"""Cronómetro monotónico: tiempo, pausas, tics al segundo entero y repintado"""
+import random
+
+from cronometro import Cronometro, PantallaCronometro
+
+
+class Reloj:
+    """Reloj falso que solo avanza cuando la prueba lo pide"""
+
+    def __init__(self, ahora=1000.0):
+        self.ahora = ahora
+
+    def __call__(self):
+        return self.ahora
+
+
+def test_transcurrido_restante_y_pausas():
+    reloj = Reloj()
+    cronometro = Cronometro(reloj)
+    cronometro.iniciar(30)
+    reloj.ahora += 12.5
+    assert cronometro.transcurrido() == 42.5
+    assert cronometro.restante(60) == 17.5
+
+    assert cronometro.detener() == 42.5
+    reloj.ahora += 300  # En pausa no corre
+    assert cronometro.transcurrido() == 42.5 and not cronometro.corriendo
+
+    cronometro.iniciar(cronometro.acumulado)
+    reloj.ahora += 20
+    assert cronometro.transcurrido() == 62.5
+    assert cronometro.restante(60) == 0.0
+
+
+def test_tics_al_segundo_entero_sin_deriva_y_repintado_solo_al_cambiar():
+    reloj = Reloj()
+    cronometro = Cronometro(reloj)
+    pantalla = PantallaCronometro("00:00")
+    azar = random.Random(3)
+    pintados = []
+    agenda = []  # after falso: (instante, función)
+
+    def after(ms, funcion):
+        # Tk dispara tarde, nunca antes
+        agenda.append((reloj.ahora + ms / 1000 + azar.uniform(0, 0.03), funcion))
+
+    def tic():
+        texto, entra_en_extra = pantalla.cambios(cronometro.transcurrido(), cronometro.transcurrido() > 60)
+        if texto is not None or entra_en_extra:
+            pintados.append((texto, entra_en_extra))
+        if cronometro.transcurrido() < 90:
+            after(cronometro.ms_hasta_proximo_tic(), tic)
+
+    cronometro.iniciar()
+    after(cronometro.ms_hasta_proximo_tic(), tic)
+    tics = 0
+    while agenda:
+        reloj.ahora, funcion = agenda.pop()
+        tics += 1
+        funcion()
+
+    # Un tic por segundo: cada segundo se pinta una vez, sin saltos ni repeticiones
+    assert [texto for texto, _ in pintados] == [f"{s // 60:02d}:{s % 60:02d}" for s in range(1, 91)]
+    assert tics == 90
+    # El tic de 01:00 ya llega pasado el segundo 60: ahí empieza el tiempo extra
+    assert [i for i, (_, extra) in enumerate(pintados) if extra] == [59]
+
+
+def test_misma_pantalla_no_repinta():
+    pantalla = PantallaCronometro()
+    assert pantalla.cambios(5.2, False) == ("00:05", False)
+    assert pantalla.cambios(5.9, False) == (None, False)
+    assert pantalla.cambios(5.95, True) == (None, True)
+    assert pantalla.cambios(6.0, True) == ("00:06", False)
+
+
+def test_oculta_espera_hasta_el_limite():
+    reloj = Reloj()
+    cronometro = Cronometro(reloj)
+    cronometro.iniciar(100)
+    reloj.ahora += 0.25
+    assert cronometro.ms_hasta_proximo_tic() == 750
+    assert cronometro.ms_hasta_proximo_tic(limite=720) == 619750
+    reloj.ahora += 1000
+    assert cronometro.ms_hasta_proximo_tic(limite=720) == 1
@@ -0,0 +1,81 @@
+"""Índice de dominio: orden de los más débiles por pool y registro en disco"""
+import random
+
+from dominio import IndiceDominio, clave_hecho, semilla_dominio
+from ejercicios import obtener_pool, plan_completo
+
+
+def _registrar_al_azar(indice, ejercicios, intentos, semilla=1):
+    azar = random.Random(semilla)
+    for _ in range(intentos):
+        # Milisegundos con decimales, como los da BufferEventos.latencias
+        indice.registrar(azar.choice(ejercicios), azar.random() < 0.7, azar.uniform(500, 9000))
+
+
+def _orden_esperado(indice, pool, cantidad):
+    estados = [e for e in indice.estados.values() if e.ejercicio in pool]
+    estados.sort(key=lambda e: (-e.debilidad, -(e.ultima_latencia or 0), e.desempate))
+    return [e.ejercicio for e in estados[:cantidad]]
+
+
+def test_seleccionar_por_pool_da_los_mas_debiles():
+    nivel_1 = obtener_pool(plan_completo(["suma", "resta"], 5, 1))
+    nivel_3 = obtener_pool(plan_completo(["multiplicación", "división", "potencia"], nivel=3))
+    indice = IndiceDominio(semilla=7)
+    _registrar_al_azar(indice, nivel_3.ejercicios, 20000)
+    indice.incluir(nivel_1.ejercicios)
+    _registrar_al_azar(indice, nivel_1.ejercicios, 300, semilla=2)
+
+    assert indice.seleccionar(25, nivel_1) == _orden_esperado(indice, nivel_1, 25)
+    # Un registro posterior cambia la prioridad sin rearmar el heap del pool
+    debil = indice.seleccionar(1, nivel_1)[0]
+    for _ in range(5):
+        indice.registrar(debil, True)
+    assert indice.seleccionar(25, nivel_1) == _orden_esperado(indice, nivel_1, 25)
+    assert indice.seleccionar(10) == _orden_esperado(indice, nivel_3.ejercicios + nivel_1.ejercicios, 10)
+
+
+def test_el_heap_de_un_pool_no_crece_con_otros_niveles():
+    pequeno = obtener_pool(plan_completo(["suma"], 3, 1))
+    grande = obtener_pool(plan_completo(["multiplicación", "división"], nivel=3))
+    indice = IndiceDominio(semilla=1)
+    indice.incluir(pequeno.ejercicios)
+    indice.seleccionar(5, pequeno)
+    _registrar_al_azar(indice, grande.ejercicios, 5000)
+
+    assert len(indice._cola(pequeno).heap) == len(pequeno)
+
+
+def test_registro_en_disco_conserva_el_dominio(tmp_path):
+    ruta = tmp_path / "dominio.log"
+    pool = obtener_pool(plan_completo(["multiplicación"], 6, 2))
+    indice = IndiceDominio(semilla_dominio("Ana", "Quinto"), str(ruta))
+    _registrar_al_azar(indice, pool.ejercicios, 400)
+    indice.guardar()
+    with open(ruta, "a", encoding="utf-8") as f:
+        f.write("2,x,3,1,0,\n9,3")  # Línea dañada y línea cortada por un cierre abrupto
+
+    cargado = IndiceDominio(semilla_dominio("Ana", "Quinto"), str(ruta))
+    cargado.cargar()
+    assert len(cargado.estados) == len(indice.estados)
+    assert {c: (e.intentos, e.errores, e.ultima_latencia) for c, e in cargado.estados.items()} == \
+        {c: (e.intentos, e.errores, e.ultima_latencia) for c, e in indice.estados.items()}
+    assert cargado.seleccionar(10, pool) == _orden_esperado(cargado, pool, 10)
+
+    # Los anexos siguientes no quedan pegados a la línea cortada
+    cargado.registrar(pool.ejercicios[0], False)
+    cargado.guardar()
+    otra = IndiceDominio(ruta=str(ruta))
+    otra.cargar()
+    assert otra.estados[clave_hecho(pool.ejercicios[0])].intentos == \
+        cargado.estados[clave_hecho(pool.ejercicios[0])].intentos
+
+
+def test_de_estudiante_usa_la_semilla_del_estudiante():
+    pool = obtener_pool(plan_completo(["suma", "resta"], 4, 1))
+    elegidos = []
+    for _ in range(2):
+        indice = IndiceDominio.de_estudiante("Ana", "Quinto")
+        indice.incluir(pool.ejercicios)
+        elegidos.append(indice.seleccionar(10, pool))
+    assert elegidos[0] == elegidos[1]
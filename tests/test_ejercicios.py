@@ -0,0 +1,48 @@
+"""Banco de ejercicios con los rangos extendidos del nivel 3"""
+import re
+
+import pytest
+
+from ejercicios import generar_ejercicios, obtener_banco_ejercicios, obtener_tabla_maxima, obtener_tabla_minima
+from motor_sesion import OPERACIONES_POR_NIVEL, simular_sesion
+
+_NORMALES = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹", "0123456789")
+
+
+def _verificar(ej):
+    """Recalcula la respuesta a partir del texto que ve el estudiante"""
+    texto = ej.texto
+    if ej.operacion == "raiz":
+        indice, radicando = re.fullmatch(r"([⁰¹²³⁴⁵⁶⁷⁸⁹]*)[√∛∜](\d+) =", texto).groups()
+        indice = int(indice.translate(_NORMALES)) if indice else {"√": 2, "∛": 3, "∜": 4}[texto[0]]
+        assert indice == ej.tabla
+        return ej.respuesta ** indice == int(radicando)
+    a, simbolo, b = re.fullmatch(r"(\d+) ?([-+×÷^]) ?(\d+) =", texto).groups()
+    a, b = int(a), int(b)
+    if simbolo == "÷":
+        return ej.respuesta * b == a
+    return {"+": a + b, "-": a - b, "×": a * b, "^": a ** b}[simbolo] == ej.respuesta
+
+
+@pytest.mark.parametrize("operacion", OPERACIONES_POR_NIVEL[3])
+def test_rangos_extendidos_dan_ejercicios_correctos(operacion):
+    tablas = range(obtener_tabla_minima(operacion), obtener_tabla_maxima(operacion, 3) + 1)
+    assert tablas[-1] == {"suma": 12, "resta": 12, "multiplicación": 100, "división": 100,
+                          "potencia": 10, "raiz": 10}[operacion]
+    for tabla in tablas:
+        ejercicios = generar_ejercicios(operacion, tabla, semilla=tabla)
+        assert sorted(ejercicios, key=lambda ej: ej.id) == list(obtener_banco_ejercicios(operacion, tabla))
+        assert all(_verificar(ej) for ej in ejercicios), (operacion, tabla)
+
+
+def test_sesion_de_nivel_3_recorre_las_tablas_extendidas():
+    limites = {op: obtener_tabla_maxima(op, 3) for op in OPERACIONES_POR_NIVEL[3]}
+    sesion = simular_sesion(3, limites, lambda ej: str(ej.respuesta), semilla_base=2)
+
+    resultados = sesion.resultados_operacion
+    for operacion, limite in limites.items():
+        assert resultados.totales_operacion(operacion).tabla_max == limite
+    assert resultados.correctas_total == resultados.preguntas_total
+    assert sesion.calcular_nota_final()[0] == 100
+    raiz = [fila for fila in sesion.historial_ejercicios if fila.operacion == "raiz" and fila.tabla == 10]
+    assert max(int(fila.respuesta_usuario) for fila in raiz) == 12 and raiz[0].ejercicio.startswith("¹⁰√")
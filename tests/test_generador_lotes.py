@@ -0,0 +1,55 @@
+"""El lote vectorizado reproduce, tabla por tabla, lo que da generar_ejercicios"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ejercicios import generar_ejercicios, obtener_banco_ejercicios
+from generador_lotes import generar_lote, semillas_lote
+
+ESTUDIANTES = [("Ana", "4A", "01/03/2025"), ("Luis", "4A", "01/03/2025"), ("Ana", "4B", "02/03/2025")]
+PLAN = [("suma", 2), ("resta", 5), ("multiplicación", 100), ("división", 7),
+        ("potencia", 3), ("raiz", 10)]
+
+
+@pytest.fixture(scope="module")
+def lote():
+    semillas = semillas_lote(ESTUDIANTES, PLAN, semilla_base=3)
+    return generar_lote(len(ESTUDIANTES), PLAN, semillas=semillas), semillas
+
+
+def test_mismo_orden_y_respuestas_que_generar_ejercicios(lote):
+    lote, semillas = lote
+    for i, (operacion, tabla) in enumerate(PLAN):
+        esperadas = []
+        for e in range(len(ESTUDIANTES)):
+            ejercicios = generar_ejercicios(operacion, tabla, int(semillas[e, i]))
+            assert lote.ejercicios(e, i) == ejercicios
+            esperadas.append([ej.respuesta for ej in ejercicios])
+        assert lote.respuestas_ordenadas(i).tolist() == esperadas
+
+
+def test_operandos_y_respuestas_del_banco(lote):
+    lote, _ = lote
+    for i, (operacion, tabla) in enumerate(PLAN):
+        banco = obtener_banco_ejercicios(operacion, tabla)
+        n = lote.longitudes[i]
+        assert n == len(banco)
+        assert lote.respuestas[i, :n].tolist() == [ej.respuesta for ej in banco]
+        # Las columnas vacías de la resta quedan en cero y al final del orden
+        assert not lote.respuestas[i, n:].any()
+    # El radicando de la raíz de índice 10 se conserva exacto
+    assert lote.operando1[PLAN.index(("raiz", 10)), 12] == 12 ** 10
+
+
+def test_sin_semillas_es_reproducible_por_semilla():
+    a = generar_lote(4, PLAN[:4], semilla=11)
+    b = generar_lote(4, PLAN[:4], semilla=11)
+    assert np.array_equal(a.permutaciones, b.permutaciones)
+    for i in range(4):
+        for e in range(4):
+            assert sorted(a.orden(e, i).tolist()) == list(range(a.longitudes[i]))
+
+
+def test_exponente_que_desborda_int64_se_rechaza():
+    with pytest.raises(ValueError):
+        generar_lote(1, [("potencia", 18)], semilla=0)
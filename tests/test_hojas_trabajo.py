@@ -0,0 +1,80 @@
+"""Lectura del plan e impresión por lotes de hojas de trabajo"""
+from concurrent.futures import Future
+
+import pytest
+
+import hojas_trabajo
+from ejercicios import plan_completo
+from hojas_trabajo import _en_ventana, leer_plan
+from motor_sesion import OPERACIONES_POR_NIVEL
+
+
+def _tablas(plan):
+    return [tabla for _, tabla in plan]
+
+
+def test_sin_plan_es_el_plan_completo_del_nivel():
+    assert leer_plan("", 2) == plan_completo(OPERACIONES_POR_NIVEL[2], nivel=2)
+
+
+@pytest.mark.parametrize("texto, nivel, tablas", [
+    ("multiplicación:2-5", 2, [2, 3, 4, 5]),
+    ("multiplicación:7", 2, [7]),
+    ("multiplicación:10-", 2, [10, 11, 12]),
+    ("multiplicación:-4", 2, [2, 3, 4]),
+    ("multiplicación", 2, list(range(2, 13))),
+    ("multiplicación:98-", 3, [98, 99, 100]),
+    ("potencia:2-", 3, list(range(2, 11))),
+    ("suma:11-", 1, [11, 12]),
+])
+def test_rangos(texto, nivel, tablas):
+    plan = leer_plan(texto, nivel)
+    assert {operacion for operacion, _ in plan} == {texto.partition(":")[0]}
+    assert _tablas(plan) == tablas
+
+
+def test_varias_operaciones_en_orden():
+    assert leer_plan("resta:3-4, suma:2", 1) == [("resta", 3), ("resta", 4), ("suma", 2)]
+
+
+@pytest.mark.parametrize("texto, nivel, mensaje", [
+    ("sumas:2", 1, "desconocida"),
+    ("multiplicación:2-5", 1, "no es del nivel 1"),
+    ("potencia:2", 2, "no es del nivel 2"),
+    ("multiplicación:1-5", 2, "fuera"),
+    ("multiplicación:2-13", 2, "fuera"),
+    ("suma:5-3", 1, "fuera"),
+    ("suma:a-3", 1, "inválido"),
+])
+def test_planes_invalidos(texto, nivel, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        leer_plan(texto, nivel)
+
+
+def test_en_ventana_acota_las_tareas_en_vuelo():
+    enviadas = []
+    leidas = []
+
+    class Ejecutor:
+        def submit(self, funcion, *argumentos):
+            enviadas.append(argumentos)
+            futuro = Future()
+            futuro.set_result(funcion(*argumentos))
+            return futuro
+
+    for resultado in _en_ventana(Ejecutor(), lambda x: x * 2, ((i,) for i in range(20)), 3):
+        leidas.append(resultado)
+        assert len(enviadas) - len(leidas) <= 3
+    assert leidas == [2 * i for i in range(20)]
+
+
+def test_combinado_sale_en_el_orden_de_la_lista(tmp_path, monkeypatch):
+    monkeypatch.setattr(hojas_trabajo, "ESTUDIANTES_POR_BLOQUE", 2)
+    estudiantes = [(f"Estudiante {i}", "4A", "01/03/2025") for i in range(9)]
+    plan = leer_plan("suma:1-2", 1)
+    hojas_trabajo.imprimir_lote(estudiantes, plan, str(tmp_path), combinado=True, procesos=2)
+
+    combinado = (tmp_path / "hojas_combinadas.html").read_text(encoding="utf-8")
+    esperado = "".join(hoja + clave for hoja, clave in
+                       (hojas_trabajo.generar_hojas_estudiante(e, plan, 0) for e in estudiantes))
+    assert combinado == hojas_trabajo.INICIO_DOCUMENTO + esperado + hojas_trabajo.FIN_DOCUMENTO
@@ -0,0 +1,57 @@
+"""Geometría de la lista virtual: qué encabezados y filas tocan una franja"""
+import random
+
+import pytest
+
+pytest.importorskip("customtkinter")
+
+from lista_virtual import ListaVirtual  # noqa: E402
+
+ALTO_ENCABEZADO = 40
+ALTO_FILA = 25
+
+
+def _lista(cantidades):
+    """Solo la geometría: sin ventana ni widgets"""
+    lista = ListaVirtual.__new__(ListaVirtual)
+    lista._cantidades = list(cantidades)
+    lista._alto_encabezado = ALTO_ENCABEZADO
+    lista._alto_fila = ALTO_FILA
+    lista._inicios = []
+    y = 0
+    for cantidad in cantidades:
+        lista._inicios.append(y)
+        y += ALTO_ENCABEZADO + cantidad * ALTO_FILA
+    lista._alto_total = y
+    return lista
+
+
+def _recorriendo(lista, y0, y1):
+    """Todas las claves cuyo alto se cruza con [y0, y1)"""
+    claves = []
+    for seccion, cantidad in enumerate(lista._cantidades):
+        for fila in [None, *range(cantidad)]:
+            y = lista._y((seccion, fila))
+            alto = ALTO_ENCABEZADO if fila is None else ALTO_FILA
+            if y < y1 and y + alto > y0:
+                claves.append((seccion, fila))
+    return claves
+
+
+def test_y_de_encabezados_y_filas():
+    lista = _lista([3, 0, 2])
+    assert lista._y((0, None)) == 0
+    assert lista._y((0, 2)) == ALTO_ENCABEZADO + 2 * ALTO_FILA
+    assert lista._y((1, None)) == ALTO_ENCABEZADO + 3 * ALTO_FILA
+    assert lista._y((2, 1)) == 3 * ALTO_ENCABEZADO + 4 * ALTO_FILA
+    assert lista._alto_total == 3 * ALTO_ENCABEZADO + 5 * ALTO_FILA
+
+
+def test_claves_entre_igual_a_recorrer_todo():
+    azar = random.Random(5)
+    lista = _lista([azar.choice([0, 1, 13, 40]) for _ in range(30)])
+    franjas = [(0, 1), (0, 600), (-120, 90), (lista._alto_total - 10, lista._alto_total + 200),
+               (ALTO_ENCABEZADO, ALTO_ENCABEZADO + ALTO_FILA)]
+    franjas += [(y, y + azar.randrange(1, 900)) for y in (azar.uniform(-50, lista._alto_total) for _ in range(200))]
+    for y0, y1 in franjas:
+        assert list(lista._claves_entre(y0, y1)) == _recorriendo(lista, y0, y1), (y0, y1)
@@ -0,0 +1,116 @@
+"""Motor de la sesión sin interfaz: historial agrupado, instantáneas y nota"""
+import random
+
+import pytest
+
+from ejercicios import OPERACIONES, ConfigEjercicios
+from motor_sesion import MarcadorEnVivo, SesionAgilidad, simular_sesion
+
+LIMITES_NIVEL_3 = {"suma": 4, "resta": 4, "multiplicación": 5, "división": 5, "potencia": 3, "raiz": 3}
+
+
+def _responder_al_azar(semilla=3):
+    azar = random.Random(semilla)
+    return lambda ej: str(ej.respuesta) if azar.random() < 0.8 else ""
+
+
+def _agrupar_recorriendo(historial):
+    grupos = {}
+    for i, fila in enumerate(historial):
+        grupos.setdefault((fila.operacion, fila.tabla), []).append(i)
+    return [(operacion, tabla, indices) for (operacion, tabla), indices in grupos.items()]
+
+
+def _grupos(sesion):
+    return [(operacion, tabla, list(indices)) for operacion, tabla, indices in sesion.grupos_historial()]
+
+
+def test_grupos_historial_coinciden_con_recorrer_el_historial():
+    sesion = simular_sesion(3, LIMITES_NIVEL_3, _responder_al_azar(), semilla_base=5)
+    sesion.iniciar_examen_mixto(40, 5)
+    sesion.preparar_tabla()
+    sesion.iniciar_tabla()
+    sesion.finalizar_tabla({i: "0" for i in range(len(sesion.ejercicios))})
+
+    assert _grupos(sesion) == _agrupar_recorriendo(sesion.historial_ejercicios)
+
+    restaurada = SesionAgilidad()
+    restaurada.restaurar_instantanea(sesion.instantanea())
+    assert _grupos(restaurada) == _grupos(sesion)
+
+
+def _nota_como_antes(sesion):
+    """Nota y penalización calculadas como lo hacía calcular_nota_final original"""
+    resultados = sesion.resultados_operacion
+    penalizacion_total = 0
+    for codigo, tiempo in zip(resultados.codigos, resultados.tiempos):
+        operacion = OPERACIONES[codigo]
+        if operacion in ["potencia", "raiz"]:
+            tiempo_principal, maxima = ConfigEjercicios.POTENCIA_RAIZ_TIEMPO_PRINCIPAL, 2
+        elif sesion.nivel == 1:
+            tiempo_principal, maxima = ConfigEjercicios.NIVEL_1_TIEMPO_PRINCIPAL, ConfigEjercicios.PENALIZACION_MAXIMA
+        else:
+            tiempo_principal, maxima = ConfigEjercicios.NIVEL_2_TIEMPO_PRINCIPAL, ConfigEjercicios.PENALIZACION_MAXIMA
+        if tiempo > tiempo_principal:
+            tiempo_extra = tiempo - tiempo_principal
+            minutos_extra = int(tiempo_extra / 60) + (1 if tiempo_extra % 60 > 0 else 0)
+            penalizacion_total += min(minutos_extra * ConfigEjercicios.PENALIZACION_POR_MINUTO, maxima)
+    correctas = sum(fila.correcto for fila in sesion.historial_ejercicios)
+    nota_base = correctas / len(sesion.historial_ejercicios) * 100
+    return max(round(nota_base - penalizacion_total, 1), 0), round(penalizacion_total, 1)
+
+
+@pytest.mark.parametrize("nivel, tiempo_por_tabla", [
+    (1, 0), (1, 181), (2, 150), (2, 333.5), (3, 61), (3, 250),
+])
+def test_nota_final_igual_a_la_original(nivel, tiempo_por_tabla):
+    limites = {op: min(limite, 6) for op, limite in LIMITES_NIVEL_3.items()}
+    sesion = simular_sesion(nivel, limites, _responder_al_azar(nivel), tiempo_por_tabla, semilla_base=1)
+
+    nota, tiempo_total, penalizacion = sesion.calcular_nota_final()
+    nota_esperada, penalizacion_esperada = _nota_como_antes(sesion)
+    assert (nota, penalizacion) == (nota_esperada, penalizacion_esperada)
+    assert tiempo_total == sum(sesion.resultados_operacion.tiempos)
+
+
+@pytest.mark.parametrize("nivel, operacion, tiempo, puntos", [
+    (1, "suma", 12 * 60, 0), (1, "suma", 12 * 60 + 1, 1), (2, "resta", 10 * 60 + 61, 2),
+    (2, "multiplicación", 10 * 60 + 500, 3), (3, "potencia", 3 * 60 + 60, 1), (3, "raiz", 3 * 60 + 600, 2),
+])
+def test_penalizacion_por_tabla(nivel, operacion, tiempo, puntos):
+    sesion = SesionAgilidad()
+    sesion.seleccionar_nivel(nivel)
+    assert sesion.penalizacion_tabla(operacion, tiempo) == puntos
+
+
+def test_marcador_en_vivo_coincide_con_la_correccion():
+    sesion = SesionAgilidad(semilla_base=4)
+    sesion.seleccionar_nivel(2)
+    sesion.iniciar_estudiante("Ana", "Quinto", sesion.fecha)
+    sesion.continuar_siguiente_operacion("multiplicación")
+    sesion.fijar_limite_tabla(12)
+    sesion.tabla_actual = 7
+    sesion.preparar_tabla()
+    marcador = MarcadorEnVivo(sesion.ejercicios)
+    escritas = {}
+    azar = random.Random(8)
+
+    def teclear(posicion, texto):
+        # validatecommand avisa cada valor intermedio del entry
+        for fin in range(len(texto) + 1):
+            escritas[posicion] = texto[:fin]
+            marcador.actualizar(posicion, escritas[posicion])
+        assert marcador.correctas == sesion.corregir_respuestas(escritas)[0]
+
+    for posicion, ej in enumerate(sesion.ejercicios):
+        teclear(posicion, str(ej.respuesta) if azar.random() < 0.7 else str(ej.respuesta + 1))
+    antes = marcador.correctas
+    # Corregir de bien a mal, de mal a bien y borrar
+    bien = next(p for p, ej in enumerate(sesion.ejercicios) if escritas[p] == str(ej.respuesta))
+    teclear(bien, str(sesion.ejercicios[bien].respuesta + 2))
+    assert marcador.correctas == antes - 1
+    mal = next(p for p, ej in enumerate(sesion.ejercicios) if p != bien and escritas[p] != str(ej.respuesta))
+    teclear(mal, f" {sesion.ejercicios[mal].respuesta}")
+    assert marcador.correctas == antes
+    teclear(bien, "")
+    assert marcador.correctas == antes
@@ -0,0 +1,75 @@
+"""Arranque de un test desde la pantalla de datos (cacheada y reconstruida)"""
+from datetime import datetime
+
+import pytest
+
+ctk = pytest.importorskip("customtkinter")
+
+
+@pytest.fixture
+def app():
+    import agilidad_mental
+    try:
+        root = ctk.CTk()
+    except Exception as e:  # Sin pantalla (p. ej. servidor sin X)
+        pytest.skip(f"sin pantalla para Tk: {e}")
+    root.withdraw()
+    aplicacion = agilidad_mental.AgilidadMentalApp(root)
+    yield aplicacion
+    aplicacion.render.cancelar()
+    root.destroy()
+
+
+def _llenar_datos(app, nombre="Ana", curso="Quinto"):
+    app.entry_nombre.insert(0, nombre)
+    app.combo_curso.set(curso)
+
+
+@pytest.mark.parametrize("reconstruir", [False, True])
+def test_validar_datos_tras_volver_a_la_pantalla(app, monkeypatch, reconstruir):
+    pedidos = []
+    monkeypatch.setattr(app, "solicitar_limite_tabla_operacion", lambda: pedidos.append("tabla"))
+
+    app.sesion.seleccionar_nivel(2)
+    app.mostrar_pantalla_datos()
+    app.mostrar_pantalla_inicio()
+    if reconstruir:
+        app._pantallas.clear()
+    app.mostrar_pantalla_datos()
+
+    assert app.entry_fecha.get() == datetime.now().strftime("%d/%m/%Y")
+    _llenar_datos(app)
+    app.validar_datos()
+
+    assert pedidos == ["tabla"]
+    assert (app.sesion.nombre, app.sesion.curso) == ("Ana", "Quinto")
+    assert app.sesion.fecha == datetime.now().strftime("%d/%m/%Y")
+
+
+def test_repaso_sin_vencidos_avisa(app, monkeypatch):
+    avisos = []
+    monkeypatch.setattr("agilidad_mental.messagebox.showinfo", lambda *a: avisos.append(a))
+
+    app.sesion.seleccionar_nivel(1)
+    app.mostrar_pantalla_datos()
+    _llenar_datos(app)
+    app.validar_datos(repaso=True)
+
+    assert len(avisos) == 1
+    assert app.btn_repaso.cget("text") == "📚 Repaso"
+
+
+def test_pantalla_cacheada_conserva_su_empaque(app):
+    construidas = []
+
+    def construir():
+        construidas.append(ctk.CTkFrame(app.root))
+        return construidas[-1], {}
+
+    for _ in range(2):
+        app._mostrar_pantalla("prueba", construir, padx=15, pady=15)
+        app.mostrar_pantalla_inicio()
+    app._mostrar_pantalla("prueba", construir, padx=15, pady=15)
+    assert len(construidas) == 1
+    info = construidas[0].pack_info()
+    assert (int(info["padx"]), int(info["pady"])) == (15, 15)
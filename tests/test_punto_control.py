@@ -0,0 +1,59 @@
+"""Punto de control: se escribe en otro hilo y restaura el test donde quedó"""
+import json
+
+from motor_sesion import SesionAgilidad, simular_sesion
+from persistencia import EscritorDiferido
+
+LIMITES = {"suma": 3, "resta": 3, "multiplicación": 4, "división": 4}
+
+
+def _a_json(datos):
+    return json.loads(json.dumps(datos, ensure_ascii=False))
+
+
+def _sesion_a_medias():
+    """Nivel 2 con dos operaciones completas y una tabla a medio responder"""
+    sesion = simular_sesion(2, LIMITES, lambda ej: str(ej.respuesta), tiempo_por_tabla=70, semilla_base=9)
+    sesion.continuar_siguiente_operacion("multiplicación")
+    sesion.fijar_limite_tabla(4)
+    sesion.preparar_tabla()
+    sesion.iniciar_tabla()
+    return sesion
+
+
+def test_guardar_y_restaurar_el_test_en_curso(tmp_path):
+    sesion = _sesion_a_medias()
+    respuestas = {0: str(sesion.ejercicios[0].respuesta), 3: "7"}
+    ruta = str(tmp_path / "sesion_en_curso.json")
+
+    escritor = EscritorDiferido()
+    armar = sesion.instantanea_diferida(respuestas, 123.5)
+    escritor.programar(ruta, lambda: json.dumps(armar(), ensure_ascii=False))
+    assert escritor.esperar(5)
+
+    with open(ruta, encoding="utf-8") as f:
+        datos = json.load(f)
+    restaurada = SesionAgilidad()
+    assert restaurada.restaurar_instantanea(datos) == respuestas
+    assert restaurada.tiempo_operacion_actual == 123.5
+    assert restaurada.ejercicios == sesion.ejercicios
+    assert restaurada.calcular_nota_final() == sesion.calcular_nota_final()
+    assert _a_json(restaurada.instantanea(respuestas, 123.5)) == _a_json(sesion.instantanea(respuestas, 123.5))
+
+
+def test_la_instantanea_diferida_no_ve_tablas_posteriores():
+    sesion = _sesion_a_medias()
+    armar = sesion.instantanea_diferida()
+    filas = len(sesion.historial_ejercicios)
+    # La tabla termina antes de que el escritor arme la instantánea
+    sesion.finalizar_tabla({i: str(ej.respuesta) for i, ej in enumerate(sesion.ejercicios)})
+    assert len(armar()["historial"]) == filas
+
+
+def test_borrar_despues_de_escribir_deja_el_archivo_borrado(tmp_path):
+    ruta = tmp_path / "sesion_en_curso.json"
+    escritor = EscritorDiferido()
+    escritor.programar(str(ruta), lambda: "{}")
+    escritor.borrar(str(ruta))
+    assert escritor.esperar(5)
+    assert not ruta.exists()
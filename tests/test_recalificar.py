@@ -0,0 +1,56 @@
+"""Recalificación por lotes de tests archivados con otra política de penalización"""
+import json
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from motor_sesion import simular_sesion
+from penalizacion import PoliticaPenalizacion, ReglaPenalizacion, recalificar
+from recalificar import cargar_sesiones
+
+LIMITES = {"suma": 4, "resta": 4, "multiplicación": 5, "división": 5, "potencia": 3, "raiz": 3}
+# Más estricta que la vigente: 5 minutos por operación y hasta 6 puntos
+POLITICA_ESTRICTA = PoliticaPenalizacion([ReglaPenalizacion(None, None, 5 * 60, 1, 6)])
+
+
+def _archivar_sesiones(carpeta, cantidad=12):
+    azar = random.Random(4)
+    sesiones, rutas = [], []
+    for k in range(cantidad):
+        nivel = k % 3 + 1
+        sesion = simular_sesion(nivel, LIMITES, lambda ej: str(ej.respuesta) if azar.random() < 0.85 else "",
+                                tiempo_por_tabla=azar.choice([0, 45, 130, 260]), semilla_base=k)
+        ruta = carpeta / f"sesion_{k}.json"
+        ruta.write_text(json.dumps(sesion.instantanea(), ensure_ascii=False), encoding="utf-8")
+        sesiones.append(sesion)
+        rutas.append(str(ruta))
+    return sesiones, rutas
+
+
+def test_con_la_politica_vigente_da_la_nota_del_aplicativo(tmp_path):
+    sesiones, rutas = _archivar_sesiones(tmp_path)
+    (tmp_path / "dañada.json").write_text("{", encoding="utf-8")
+    omitidas = []
+    leidas, almacenes, niveles = cargar_sesiones(rutas + [str(tmp_path / "dañada.json")], omitidas)
+
+    assert [ruta for ruta, _ in leidas] == rutas
+    assert [ruta for ruta, _ in omitidas] == [str(tmp_path / "dañada.json")]
+    notas, penalizaciones = recalificar(almacenes, niveles)
+    assert list(zip(notas, penalizaciones)) == [
+        (nota, penalizacion) for nota, _, penalizacion in (s.calcular_nota_final() for s in sesiones)
+    ]
+    assert any(penalizaciones)
+
+
+def test_otra_politica_cambia_las_notas(tmp_path):
+    sesiones, rutas = _archivar_sesiones(tmp_path)
+    _, almacenes, niveles = cargar_sesiones(rutas)
+    notas, penalizaciones = recalificar(almacenes, niveles, POLITICA_ESTRICTA)
+
+    for almacen, nivel, penalizacion in zip(almacenes, niveles, penalizaciones):
+        esperada = sum(POLITICA_ESTRICTA.penalizacion(nivel, fila["operacion"], fila["tiempo"])
+                       for fila in almacen.values())
+        assert penalizacion == esperada
+    assert notas != [s.calcular_nota_final()[0] for s in sesiones]
@@ -0,0 +1,44 @@
+"""Rejilla en Canvas: qué filas reciben entry según el desplazamiento"""
+import pytest
+
+pytest.importorskip("customtkinter")
+
+from rejilla_ejercicios import ALTO_FILA, MARGEN_FILAS, RejillaEjercicios, _puntos_redondeados  # noqa: E402
+
+
+class CanvasFalso:
+    def __init__(self, desplazamiento, alto):
+        self.desplazamiento, self.alto = desplazamiento, alto
+
+    def canvasy(self, y):
+        return self.desplazamiento + y
+
+    def winfo_height(self):
+        return self.alto
+
+
+def _rejilla(filas, desplazamiento, alto):
+    rejilla = RejillaEjercicios.__new__(RejillaEjercicios)
+    rejilla.ejercicios = [None] * filas
+    rejilla.canvas = CanvasFalso(desplazamiento, alto)
+    return rejilla
+
+
+@pytest.mark.parametrize("filas, desplazamiento, alto", [
+    (13, 0, 5 * ALTO_FILA), (100, 40 * ALTO_FILA + 7, 10 * ALTO_FILA), (100, 95 * ALTO_FILA, 20 * ALTO_FILA),
+    (3, 0, 50 * ALTO_FILA),
+])
+def test_rango_visible_cubre_la_vista_y_el_margen(filas, desplazamiento, alto):
+    rango = _rejilla(filas, desplazamiento, alto)._rango_visible()
+    tocan = [i for i in range(filas)
+             if i * ALTO_FILA < desplazamiento + alto and (i + 1) * ALTO_FILA > desplazamiento]
+    assert set(tocan) <= set(rango)
+    assert rango.start >= 0 and rango.stop <= filas
+    assert len(rango) <= len(tocan) + 2 * MARGEN_FILAS + 1
+
+
+def test_puntos_redondeados_quedan_dentro_del_rectangulo():
+    puntos = _puntos_redondeados(10, 20, 110, 60, 15)
+    xs, ys = puntos[0::2], puntos[1::2]
+    assert (min(xs), max(xs), min(ys), max(ys)) == (10, 110, 20, 60)
+    assert len(puntos) == 24
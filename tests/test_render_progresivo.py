@@ -0,0 +1,89 @@
+"""Construcción por tandas con un planificador falso en lugar de Tk"""
+from render_progresivo import RenderProgresivo
+
+
+class RaizFalsa:
+    """after_idle/after/after_cancel de Tk sobre una cola que la prueba ejecuta"""
+
+    def __init__(self):
+        self.cola = {}
+        self._siguiente = 0
+
+    def after_idle(self, funcion):
+        return self.after(0, funcion)
+
+    def after(self, ms, funcion):
+        self._siguiente += 1
+        self.cola[self._siguiente] = funcion
+        return self._siguiente
+
+    def after_cancel(self, ident):
+        del self.cola[ident]
+
+    def correr(self):
+        """Ejecuta una tanda (lo que Tk haría en la próxima vuelta del bucle)"""
+        ident = min(self.cola)
+        self.cola.pop(ident)()
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def _pasos(hechos, reloj, n, ms):
+    def paso(i):
+        def ejecutar():
+            hechos.append(i)
+            reloj.ahora += ms / 1000
+        return ejecutar
+    return [paso(i) for i in range(n)]
+
+
+def test_tandas_respetan_el_presupuesto_y_el_orden():
+    raiz, reloj, hechos = RaizFalsa(), Reloj(), []
+    render = RenderProgresivo(raiz, presupuesto_ms=10, reloj=reloj)
+    render.programar(_pasos(hechos, reloj, 10, 4))
+    assert hechos == [] and render.pendiente
+
+    tandas = []
+    while raiz.cola:
+        raiz.correr()
+        tandas.append(len(hechos))
+    # 4 ms por paso con 10 ms de presupuesto: tres pasos por tanda
+    assert tandas == [3, 6, 9, 10]
+    assert hechos == list(range(10)) and not render.pendiente
+
+
+def test_completar_ejecuta_lo_pendiente_y_cancelar_lo_descarta():
+    raiz, reloj, hechos = RaizFalsa(), Reloj(), []
+    render = RenderProgresivo(raiz, presupuesto_ms=10, reloj=reloj)
+    render.programar(_pasos(hechos, reloj, 6, 4))
+    raiz.correr()
+    render.completar()
+    assert hechos == list(range(6)) and not raiz.cola
+
+    otros = []
+    render.programar(_pasos(otros, reloj, 6, 4))
+    raiz.correr()
+    render.cancelar()
+    assert otros == [0, 1, 2] and not raiz.cola and not render.pendiente
+
+
+def test_un_paso_que_falla_no_detiene_el_resto():
+    raiz, reloj, hechos = RaizFalsa(), Reloj(), []
+    render = RenderProgresivo(raiz, presupuesto_ms=100, reloj=reloj)
+
+    def falla():
+        raise RuntimeError("widget destruido")
+    render.programar([lambda: hechos.append("a"), falla, lambda: hechos.append("b")])
+    try:
+        raiz.correr()
+    except RuntimeError:
+        pass
+    while raiz.cola:
+        raiz.correr()
+    assert hechos == ["a", "b"]
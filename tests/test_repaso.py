@@ -0,0 +1,64 @@
+"""Cola de repaso espaciado: intervalos, vencidos y registro en disco"""
+from dominio import clave_hecho
+from ejercicios import obtener_banco_ejercicios
+from repaso import INTERVALOS_REPASO_DIAS, SEGUNDOS_POR_DIA, ColaRepaso
+
+AHORA = 1_800_000_000
+BANCO = obtener_banco_ejercicios("multiplicación", 7)
+
+
+def test_error_vence_ya_y_acierto_lo_aleja():
+    cola = ColaRepaso()
+    cola.registrar(BANCO[3], False, AHORA)
+    cola.registrar(BANCO[5], False, AHORA - 10)
+    assert cola.vencidos(None, AHORA) == [BANCO[5], BANCO[3]]
+
+    cola.registrar(BANCO[3], True, AHORA)
+    assert cola.vencidos(None, AHORA) == [BANCO[5]]
+    assert cola.vencidos(None, AHORA + INTERVALOS_REPASO_DIAS[1] * SEGUNDOS_POR_DIA) == [BANCO[5], BANCO[3]]
+
+
+def test_acertar_en_la_ultima_caja_saca_el_hecho():
+    cola = ColaRepaso()
+    cola.registrar(BANCO[2], False, AHORA)
+    for _ in INTERVALOS_REPASO_DIAS:
+        cola.registrar(BANCO[2], True, AHORA)
+    assert clave_hecho(BANCO[2]) not in cola.cajas
+    # Un acierto de un hecho que no está en la cola no lo agrega
+    cola.registrar(BANCO[4], True, AHORA)
+    assert len(cola) == 0
+
+
+def test_guardar_y_cargar(tmp_path):
+    ruta = str(tmp_path / "repaso.log")
+    cola = ColaRepaso(ruta)
+    for i, ej in enumerate(BANCO):
+        cola.registrar(ej, i % 3 == 0, AHORA + i)
+    cola.registrar(BANCO[1], True, AHORA + 100)
+    cola.guardar()
+
+    cargada = ColaRepaso(ruta)
+    cargada.cargar()
+    assert cargada.cajas == cola.cajas
+    lejos = AHORA + 100 * SEGUNDOS_POR_DIA
+    assert cargada.vencidos(None, lejos) == cola.vencidos(None, lejos)
+
+
+def test_cargar_ignora_lineas_dañadas_y_cortadas(tmp_path):
+    ruta = tmp_path / "repaso.log"
+    sano = clave_hecho(BANCO[6])
+    ruta.write_text(f"{sano[0]},{sano[1]},{sano[2]},0,{AHORA}\n"
+                    "2,7,x,0,5\n"
+                    "2,7,3,0\n"
+                    f"{sano[0]},{sano[1]},", encoding="utf-8")
+
+    cola = ColaRepaso(str(ruta))
+    cola.cargar()
+    assert cola.cajas == {sano: (0, AHORA)}
+
+    # Lo que se anexa después empieza en una línea nueva
+    cola.registrar(BANCO[8], False, AHORA)
+    cola.guardar()
+    otra = ColaRepaso(str(ruta))
+    otra.cargar()
+    assert set(otra.cajas) == {sano, clave_hecho(BANCO[8])}
@@ -0,0 +1,41 @@
+"""Buffer circular de foco y teclas, y latencias por ejercicio"""
+from tiempos_respuesta import FOCO, TECLA, BufferEventos
+
+MS = 1_000_000  # ns
+
+
+def _registrar(buffer, eventos):
+    for posicion, tipo, instante_ms in eventos:
+        buffer.registrar(posicion, tipo, int(instante_ms * MS))
+
+
+def test_latencias_suman_las_visitas_en_milisegundos():
+    buffer = BufferEventos()
+    _registrar(buffer, [
+        (0, FOCO, 0), (0, TECLA, 2), (0, TECLA, 5.5),  # 5.5 ms en el primero
+        (1, FOCO, 6),  # Foco sin teclas: no respondió
+        (2, FOCO, 10), (2, TECLA, 12.25),
+        (0, FOCO, 20), (0, TECLA, 21),  # Vuelve al primero: 1 ms más
+        (7, FOCO, 30), (7, TECLA, 31),  # Fuera de la tabla: se ignora
+    ])
+    assert buffer.latencias(4) == [6.5, None, 2.25, None]
+
+
+def test_buffer_lleno_conserva_los_eventos_mas_nuevos():
+    buffer = BufferEventos(capacidad=3)
+    _registrar(buffer, [(0, FOCO, 0), (0, TECLA, 1), (1, FOCO, 2), (1, TECLA, 5), (2, FOCO, 6), (2, TECLA, 8)])
+
+    assert buffer.cantidad == 6
+    assert [buffer.posiciones[i] for i in buffer._en_orden()] == [1, 2, 2]
+    # La tecla de 1 perdió su foco: cuenta como una visita que empieza en esa tecla
+    assert buffer.latencias(3) == [None, 0.0, 2.0]
+
+
+def test_reiniciar_vacia_sin_reasignar():
+    buffer = BufferEventos(capacidad=8)
+    arreglo = buffer.instantes
+    _registrar(buffer, [(0, FOCO, 0), (0, TECLA, 3)])
+    buffer.reiniciar()
+    _registrar(buffer, [(1, FOCO, 10), (1, TECLA, 14)])
+    assert buffer.latencias(2) == [None, 4.0]
+    assert buffer.instantes is arreglo
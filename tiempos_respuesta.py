@@ -0,0 +1,63 @@
+"""Tiempos de respuesta por ejercicio: eventos de foco y tecla en un buffer circular"""
+import time
+from array import array
+
+FOCO = 0
+TECLA = 1
+
+
+class BufferEventos:
+    """Buffer circular preasignado de eventos (posición, tipo, instante en ns)
+
+    registrar solo escribe tres celdas de arreglos ya creados, así que puede
+    llamarse desde validatecommand en cada tecla sin crear objetos. Si hay más
+    eventos que capacidad se pierden los más viejos.
+    """
+
+    def __init__(self, capacidad=4096):
+        self.capacidad = capacidad
+        self.posiciones = array("i", bytes(4 * capacidad))
+        self.tipos = array("b", bytes(capacidad))
+        self.instantes = array("q", bytes(8 * capacidad))
+        self.cantidad = 0  # Eventos registrados desde reiniciar (puede superar la capacidad)
+
+    def reiniciar(self):
+        """Vacía el buffer sin liberar memoria (nueva tabla)"""
+        self.cantidad = 0
+
+    def registrar(self, posicion, tipo, instante=None):
+        i = self.cantidad % self.capacidad
+        self.posiciones[i] = posicion
+        self.tipos[i] = tipo
+        self.instantes[i] = time.perf_counter_ns() if instante is None else instante
+        self.cantidad += 1
+
+    def _en_orden(self):
+        """Índices de los eventos guardados, del más viejo al más nuevo"""
+        inicio = max(0, self.cantidad - self.capacidad)
+        return (k % self.capacidad for k in range(inicio, self.cantidad))
+
+    def latencias(self, num_ejercicios):
+        """Milisegundos que el estudiante trabajó en cada ejercicio (None si no escribió)
+
+        Cada visita a un entry cuenta desde que recibe el foco hasta su última
+        tecla; si volvió al ejercicio, las visitas se suman.
+        """
+        totales = [None] * num_ejercicios
+        actual = -1
+        inicio = ultima = 0
+
+        def cerrar():
+            if 0 <= actual < num_ejercicios and ultima:
+                totales[actual] = (totales[actual] or 0) + (ultima - inicio) / 1e6
+
+        for i in self._en_orden():
+            posicion, instante = self.posiciones[i], self.instantes[i]
+            if self.tipos[i] == FOCO or posicion != actual:
+                # Tecla sin foco registrado (p. ej. el buffer perdió el evento): nueva visita
+                cerrar()
+                actual, inicio, ultima = posicion, instante, 0
+            if self.tipos[i] == TECLA:
+                ultima = instante
+        cerrar()
+        return totales